@@ -0,0 +1,315 @@
+"""Headless performance benchmarks for the game.
+
+Every benchmark builds its own synthetic board from a fixed seed, so two runs
+do the same work; only the wall-clock numbers differ.
+
+    python Benchmarks/bench.py                          # print results as JSON
+    python Benchmarks/bench.py --cells 16 --density 0.8 --out bench_output.txt
+    python Benchmarks/bench.py --only compose --compose-cells 64
+    python Benchmarks/bench.py --baseline Benchmarks/baseline.json
+    python Benchmarks/bench.py --update-baseline        # after an intended change
+
+With --baseline the run exits with status 1 when a metric is worse than
+the baseline by more than --threshold (default 25%).  Baselines are only
+comparable on the machine that recorded them.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import pathlib
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Dict, List
+
+import numpy as np
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "It1_interfaces"))
+
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from Game import Game
+from img import Img
+from Moves import Moves
+from PieceFactory import PieceFactory
+from Renderer import Renderer
+
+PIECES_ROOT = ROOT / "pieces"
+DEFAULT_BASELINE = pathlib.Path(__file__).resolve().parent / "baseline.json"
+PIECE_TYPES = ("PW", "PB", "RW", "RB", "NW", "NB", "BW", "BB", "QW", "QB", "KW", "KB")
+CELL_PIX = 64
+TICK_MS = 16
+
+
+@dataclass
+class BenchConfig:
+    cells: int = 8              # the board is cells x cells
+    density: float = 0.5        # share of cells holding a piece
+    move_load: float = 0.2      # commands per piece per second of game time
+    game_seconds: float = 5.0   # game time simulated by the game benchmarks
+    repeat: int = 3             # every benchmark runs this often, the best run counts
+    seed: int = 0
+    compose_cells: int = 32     # the compose benchmark's board is compose_cells x compose_cells
+
+
+def metric(value: float, unit: str, higher_is_better: bool) -> dict:
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def _board(cfg: BenchConfig) -> Board:
+    img = Img()
+    img.img = np.full((cfg.cells * CELL_PIX, cfg.cells * CELL_PIX, 3), 128, np.uint8)
+    return Board(cell_H_pix=CELL_PIX, cell_W_pix=CELL_PIX, cell_H_m=1, cell_W_m=1,
+                 W_cells=cfg.cells, H_cells=cfg.cells, img=img)
+
+
+def _placements(cfg: BenchConfig, rng: random.Random) -> List[tuple]:
+    cells = [(r, c) for r in range(cfg.cells) for c in range(cfg.cells)]
+    chosen = rng.sample(cells, int(len(cells) * cfg.density))
+    return [(rng.choice(PIECE_TYPES), cell) for cell in chosen]
+
+
+def _best(cfg: BenchConfig, run: Callable[[], Dict[str, dict]]) -> Dict[str, dict]:
+    """Run a benchmark cfg.repeat times and keep the best value of every metric."""
+    best: Dict[str, dict] = {}
+    for _ in range(cfg.repeat):
+        for name, m in run().items():
+            prev = best.get(name)
+            if prev is None or (m["value"] > prev["value"]) == m["higher_is_better"]:
+                best[name] = m
+    return best
+
+
+def bench_draw_on(cfg: BenchConfig) -> Dict[str, dict]:
+    """Img.draw_on of a translucent sprite onto the board canvas."""
+    rng = np.random.default_rng(cfg.seed)
+    sprite = Img()
+    sprite.img = rng.integers(0, 256, (CELL_PIX, CELL_PIX, 4), dtype=np.uint8)
+    canvas = _board(cfg).img.copy()
+    spots = [(int(x) * CELL_PIX, int(y) * CELL_PIX) for x, y in rng.integers(0, cfg.cells, (1000, 2))]
+
+    def run():
+        start = time.perf_counter()
+        for x, y in spots:
+            sprite.draw_on(canvas, x, y)
+        elapsed = time.perf_counter() - start
+        return {"draw_on_per_s": metric(len(spots) / elapsed, "draws/s", True)}
+    return _best(cfg, run)
+
+
+def bench_is_valid_move(cfg: BenchConfig) -> Dict[str, dict]:
+    """Moves.is_valid_move over random start / end cells."""
+    rng = random.Random(cfg.seed)
+    moves = Moves(PIECES_ROOT / "QW" / "moves.txt", (cfg.cells, cfg.cells))
+    n = cfg.cells
+    pairs = [((rng.randrange(n), rng.randrange(n)), (rng.randrange(n), rng.randrange(n))) for _ in range(20000)]
+
+    def run():
+        start = time.perf_counter()
+        for a, b in pairs:
+            moves.is_valid_move(a, b)
+        elapsed = time.perf_counter() - start
+        return {"is_valid_move_per_s": metric(len(pairs) / elapsed, "calls/s", True)}
+    return _best(cfg, run)
+
+
+def bench_startup(cfg: BenchConfig) -> Dict[str, dict]:
+    """PieceFactory: loading every piece type, then creating the board's pieces."""
+    placements = _placements(cfg, random.Random(cfg.seed))
+
+    def run():
+        board = _board(cfg)
+        start = time.perf_counter()
+        factory = PieceFactory(board, PIECES_ROOT)
+        factory.preload(sorted({t for t, _ in placements}))
+        loaded = time.perf_counter()
+        tracemalloc.start()
+        pieces = [factory.create_piece(t, cell) for t, cell in placements]
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        created = time.perf_counter()
+        per_piece = 1e6 * (created - loaded) / max(len(pieces), 1)
+        return {
+            "type_load_ms": metric(1000 * (loaded - start), "ms", False),
+            "create_piece_us": metric(per_piece, "us", False),
+            "bytes_per_piece": metric(memory / max(len(pieces), 1), "bytes", False),
+        }
+    return _best(cfg, run)
+
+
+def bench_compose(cfg: BenchConfig) -> Dict[str, dict]:
+    """Renderer redrawing every cell of a compose_cells board, serially and tiled on a thread pool."""
+    big = replace(cfg, cells=cfg.compose_cells)
+    board = _board(big)
+    factory = PieceFactory(board, PIECES_ROOT)
+    placements = _placements(big, random.Random(cfg.seed))
+    factory.preload(sorted({t for t, _ in placements}))
+    pieces = [factory.create_piece(t, cell) for t, cell in placements]
+    frames = 10
+
+    def redraw(renderer: Renderer) -> float:
+        start = time.perf_counter()
+        for _ in range(frames):
+            renderer.invalidate()
+            renderer.render(pieces, [], now_ms=0)
+        return 1000 * (time.perf_counter() - start) / frames
+
+    def run():
+        serial = Renderer(board, tiled=False)
+        tiled = Renderer(board, tiled=True)
+        try:
+            return {
+                "compose_serial_ms": metric(redraw(serial), "ms", False),
+                "compose_tiled_ms": metric(redraw(tiled), "ms", False),
+            }
+        finally:
+            serial.close()
+            tiled.close()
+    return _best(cfg, run)
+
+
+def _game(cfg: BenchConfig):
+    board = _board(cfg)
+    factory = PieceFactory(board, PIECES_ROOT)
+    placements = _placements(cfg, random.Random(cfg.seed))
+    factory.preload(sorted({t for t, _ in placements}))
+    pieces = [factory.create_piece(t, cell) for t, cell in placements]
+    return Game(pieces=pieces, board=board, clock=ManualClock(0), headless=True)
+
+
+def _command_some(game: Game, rng: random.Random, n: int):
+    """Send up to n idle pieces a move to a free cell they can reach."""
+    idle = [p for p in game.pieces.values() if p.state_name == "idle"]
+    for piece in rng.sample(idle, min(n, len(idle))):
+        free = [cell for cell in piece.moves.get_moves(*piece.cell)
+                if game.get_piece_at(*cell) is None and not game.collisions.landing(cell)]
+        if free:
+            game.issue_command(Command(piece.piece_id, "move", {"target": list(rng.choice(free))}))
+
+
+def bench_game(cfg: BenchConfig) -> Dict[str, dict]:
+    """Game.step with cfg.move_load commands per piece per second, with and without rendering."""
+    ticks = int(cfg.game_seconds * 1000 / TICK_MS)
+
+    def play(render: bool) -> float:
+        game = _game(cfg)
+        renderer = Renderer(game.board) if render else None
+        rng = random.Random(cfg.seed)
+        pending = 0.0
+        try:
+            start = time.perf_counter()
+            for tick in range(ticks):
+                now = tick * TICK_MS
+                pending += cfg.move_load * len(game.pieces) * TICK_MS / 1000
+                if pending >= 1:
+                    _command_some(game, rng, int(pending))
+                    pending -= int(pending)
+                game.clock.now_ms = now
+                game.step(now)
+                if renderer is not None:
+                    renderer.render(game.pieces.values(), [], now_ms=now)
+            return time.perf_counter() - start
+        finally:
+            if renderer is not None:
+                renderer.close()
+
+    def run():
+        sim = play(render=False)
+        full = play(render=True)
+        return {
+            "sim_ticks_per_s": metric(ticks / sim, "ticks/s", True),
+            "frames_per_s": metric(ticks / full, "frames/s", True),
+        }
+    return _best(cfg, run)
+
+
+BENCHMARKS: Dict[str, Callable[[BenchConfig], Dict[str, dict]]] = {
+    "draw_on": bench_draw_on,
+    "is_valid_move": bench_is_valid_move,
+    "startup": bench_startup,
+    "game": bench_game,
+    "compose": bench_compose,
+}
+
+
+def run_all(cfg: BenchConfig, only: List[str] = None) -> dict:
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        with contextlib.redirect_stdout(io.StringIO()):    # the game's own messages
+            results.update(bench(cfg))
+    return {
+        "config": asdict(cfg),
+        "machine": {"python": platform.python_version(), "system": platform.system(),
+                    "arch": platform.machine(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """A message for every metric more than threshold worse than its baseline."""
+    regressions = []
+    if baseline.get("config") != results.get("config"):
+        regressions.append(f"config differs from the baseline's: {baseline.get('config')}")
+        return regressions
+    for name, base in baseline["results"].items():
+        m = results["results"].get(name)
+        if m is None:
+            continue
+        if base["higher_is_better"]:
+            worse = m["value"] < base["value"] * (1 - threshold)
+        else:
+            worse = m["value"] > base["value"] * (1 + threshold)
+        if worse:
+            regressions.append(f"{name}: {m['value']:.4g} {m['unit']} vs baseline {base['value']:.4g}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    defaults = BenchConfig()
+    parser.add_argument("--cells", type=int, default=defaults.cells)
+    parser.add_argument("--density", type=float, default=defaults.density)
+    parser.add_argument("--move-load", type=float, default=defaults.move_load)
+    parser.add_argument("--game-seconds", type=float, default=defaults.game_seconds)
+    parser.add_argument("--repeat", type=int, default=defaults.repeat)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--compose-cells", type=int, default=defaults.compose_cells)
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS))
+    parser.add_argument("--out", type=pathlib.Path, help="write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", type=pathlib.Path, help="compare against this results file")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"store the results as the baseline ({DEFAULT_BASELINE.name})")
+    args = parser.parse_args(argv)
+
+    cfg = BenchConfig(args.cells, args.density, args.move_load, args.game_seconds, args.repeat, args.seed,
+                      args.compose_cells)
+    results = run_all(cfg, args.only)
+    text = json.dumps(results, indent=2)
+    if args.out:
+        args.out.write_text(text + "\n")
+    else:
+        print(text)
+
+    if args.update_baseline:
+        (args.baseline or DEFAULT_BASELINE).write_text(text + "\n")
+        return 0
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+from typing import Dict, List
+
+import numpy as np
+
+NOT_STARTED = np.iinfo(np.int64).min
+
+
+class BatchPhysics:
+    """Physics timing of many pieces kept as NumPy arrays, one row per piece.
+
+    Only pieces driven by a PieceRuntime can be batched.  A row holds just
+    what decides whether the piece is due - when its state started and how
+    long it lasts; positions stay in the runtime.  step(now_ms) applies
+    PieceRuntime's rules to every row at once and returns the rows that
+    need a real update this tick: states whose clock starts now, and states
+    that finished.  A move's duration depends on how far it goes, so
+    the row keeps the runtime's duration_ms() for the current move.
+    Every other piece is left alone, so the Python work per tick follows the
+    number of pieces that changed rather than the number on the board.
+    After updating a returned piece, or giving any piece a command, call
+    sync(piece) so its row matches the runtime again.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.pieces: List = []
+        self._rows: Dict[str, int] = {}
+        self.start_ms = np.full(capacity, NOT_STARTED, np.int64)
+        self.duration_ms = np.full(capacity, np.inf)
+
+    @staticmethod
+    def supports(piece) -> bool:
+        return hasattr(getattr(piece, "state_manager", None), "piece_type")
+
+    def __len__(self) -> int:
+        return len(self.pieces)
+
+    def __contains__(self, piece) -> bool:
+        return piece.piece_id in self._rows
+
+    def add(self, piece):
+        if not self.supports(piece):
+            raise TypeError(f"{piece.piece_id} has no PieceRuntime to batch")
+        if len(self.pieces) == len(self.start_ms):
+            self._grow()
+        self._rows[piece.piece_id] = len(self.pieces)
+        self.pieces.append(piece)
+        self.sync(piece)
+
+    def remove(self, piece):
+        """Drop a piece; the last row moves into its place."""
+        row = self._rows.pop(piece.piece_id)
+        last = len(self.pieces) - 1
+        if row != last:
+            moved = self.pieces[last]
+            self.pieces[row] = moved
+            self._rows[moved.piece_id] = row
+            for arr in (self.start_ms, self.duration_ms):
+                arr[row] = arr[last]
+        self.pieces.pop()
+
+    def sync(self, piece):
+        row = self._rows[piece.piece_id]
+        rt = piece.state_manager
+        self.start_ms[row] = NOT_STARTED if rt.state_start_ms is None else rt.state_start_ms
+        # a finished state with nowhere to go never needs another update
+        duration_ms = None if rt.finished else rt.duration_ms()
+        self.duration_ms[row] = np.inf if duration_ms is None else duration_ms
+
+    def step(self, now_ms: int) -> np.ndarray:
+        """Rows whose piece has to be updated at now_ms, in row order."""
+        n = len(self.pieces)
+        start = self.start_ms[:n]
+        new = start == NOT_STARTED
+        start[new] = now_ms
+
+        due = ((now_ms - start) >= self.duration_ms[:n]) & ~new
+        return np.flatnonzero(new | due)
+
+    def _grow(self):
+        capacity = 2 * len(self.start_ms)
+        self.start_ms = _resized(self.start_ms, capacity, NOT_STARTED)
+        self.duration_ms = _resized(self.duration_ms, capacity, np.inf)
+
+
+def _resized(arr: np.ndarray, capacity: int, fill) -> np.ndarray:
+    out = np.full((capacity,) + arr.shape[1:], fill, arr.dtype)
+    out[:len(arr)] = arr
+    return out
@@ -0,0 +1,151 @@
+from math import gcd
+from typing import Dict, Iterator, List, Tuple
+from Moves import Moves, CAPTURE, NON_CAPTURE, FIRST_ONLY
+
+# Bitboards are plain Python ints: bit (row * cols + col) is set when the cell
+# is occupied.  Ints grow as needed, so the same code serves 8x8 and 100x100.
+
+
+def cell_bit(row: int, col: int, cols: int) -> int:
+    return 1 << (row * cols + col)
+
+
+def iter_cells(bb: int, cols: int) -> Iterator[Tuple[int, int]]:
+    """Yield (row, col) for every set bit, lowest first."""
+    while bb:
+        low = bb & -bb
+        yield divmod(low.bit_length() - 1, cols)
+        bb ^= low
+
+
+class SlidingMoves:
+    """Ray tables for one piece type, compiled from its Moves.
+
+    Offsets that lie on the same line from the origin (e.g. 1,0 2,0 ... 7,0)
+    form one ray; a destination further along a ray is only reachable if
+    every cell before it is empty.  Offsets with nothing before them (the
+    knight's 2,1) are rays of length one and so still jump.
+    """
+
+    def __init__(self, moves: Moves):
+        self.rows, self.cols = moves.rows, moves.cols
+        self._rays: Dict[Tuple[int, int], Dict[int, int]] = {}
+        for dr, dc, flags in moves._offsets:
+            step = gcd(abs(dr), abs(dc))
+            self._rays.setdefault((dr // step, dc // step), {})[step] = flags
+        self._tables: Dict[Tuple[int, int], tuple] = {}
+
+    def _table(self, row: int, col: int) -> tuple:
+        table = self._tables.get((row, col))
+        if table is not None:
+            return table
+
+        rays: List[Tuple[int, bool]] = []
+        capture = quiet = first_only = 0
+        for (sr, sc), steps in self._rays.items():
+            ray = 0
+            for n in range(1, max(steps) + 1):
+                r, c = row + sr * n, col + sc * n
+                if not (0 <= r < self.rows and 0 <= c < self.cols):
+                    break
+                bit = cell_bit(r, c, self.cols)
+                ray |= bit
+                flags = steps.get(n, 0)
+                if flags & CAPTURE:
+                    capture |= bit
+                if flags & NON_CAPTURE:
+                    quiet |= bit
+                if flags & FIRST_ONLY:
+                    first_only |= bit
+            if ray:
+                rays.append((ray, sr * self.cols + sc > 0))
+
+        table = (tuple(rays), capture, quiet, first_only)
+        self._tables[(row, col)] = table
+        return table
+
+    def targets(self, row: int, col: int, occupied: int, enemy: int, is_first_move: bool = False) -> int:
+        """Bitboard of cells this piece may move to from (row, col)."""
+        rays, capture, quiet, first_only = self._table(row, col)
+        reach = 0
+        for ray, positive in rays:
+            blockers = ray & occupied
+            if blockers:
+                # keep the ray up to and including the nearest blocker
+                if positive:
+                    ray &= ((blockers & -blockers) << 1) - 1
+                else:
+                    ray &= ~((1 << (blockers.bit_length() - 1)) - 1)
+            reach |= ray
+        if not is_first_move:
+            quiet &= ~first_only
+        return (reach & enemy & capture) | (reach & ~occupied & quiet)
+
+
+class BitboardPosition:
+    """Per-player and per-piece-type occupancy bitboards."""
+
+    def __init__(self, rows: int, cols: int):
+        self.rows, self.cols = rows, cols
+        self.sides: Dict[bool, int] = {True: 0, False: 0}
+        self.types: Dict[str, int] = {}
+        self.sliding: Dict[str, SlidingMoves] = {}
+
+    @property
+    def occupied(self) -> int:
+        return self.sides[True] | self.sides[False]
+
+    def register_type(self, piece_type: str, moves: Moves):
+        if piece_type not in self.sliding:
+            self.sliding[piece_type] = SlidingMoves(moves)
+
+    def place(self, piece_type: str, player_one: bool, cell: Tuple[int, int]):
+        if not self._in_bounds(cell):
+            return
+        bit = cell_bit(cell[0], cell[1], self.cols)
+        self.sides[player_one] |= bit
+        self.types[piece_type] = self.types.get(piece_type, 0) | bit
+
+    def remove(self, piece_type: str, player_one: bool, cell: Tuple[int, int]):
+        if not self._in_bounds(cell):
+            return
+        mask = ~cell_bit(cell[0], cell[1], self.cols)
+        self.sides[player_one] &= mask
+        self.types[piece_type] = self.types.get(piece_type, 0) & mask
+
+    def move(self, piece_type: str, player_one: bool, old_cell: Tuple[int, int], new_cell: Tuple[int, int]):
+        self.remove(piece_type, player_one, old_cell)
+        self.place(piece_type, player_one, new_cell)
+
+    def legal_targets(self, piece_type: str, player_one: bool, cell: Tuple[int, int],
+                      is_first_move: bool = False) -> int:
+        sliding = self.sliding.get(piece_type)
+        if sliding is None:
+            return 0
+        return sliding.targets(cell[0], cell[1], self.occupied, self.sides[not player_one], is_first_move)
+
+    def is_legal_move(self, piece_type: str, player_one: bool, start_cell: Tuple[int, int],
+                      end_cell: Tuple[int, int], is_first_move: bool = False) -> bool:
+        if not self._in_bounds(end_cell):
+            return False
+        targets = self.legal_targets(piece_type, player_one, start_cell, is_first_move)
+        return bool(targets & cell_bit(end_cell[0], end_cell[1], self.cols))
+
+    def side_moves(self, player_one: bool, unmoved: int = 0) -> Dict[Tuple[int, int], int]:
+        """Targets bitboard for every piece of one side, keyed by its cell.
+
+        `unmoved` marks pieces that haven't moved yet and may use first-move rules.
+        """
+        occupied, enemy, own = self.occupied, self.sides[not player_one], self.sides[player_one]
+        result = {}
+        for piece_type, bb in self.types.items():
+            sliding = self.sliding.get(piece_type)
+            if sliding is None:
+                continue
+            for r, c in iter_cells(bb & own, self.cols):
+                first = bool(unmoved & cell_bit(r, c, self.cols))
+                result[(r, c)] = sliding.targets(r, c, occupied, enemy, first)
+        return result
+
+    def _in_bounds(self, cell) -> bool:
+        return 0 <= cell[0] < self.rows and 0 <= cell[1] < self.cols
@@ -0,0 +1,22 @@
+import time
+
+
+class WallClock:
+    """Real time in milliseconds."""
+
+    def __call__(self) -> int:
+        return int(time.time() * 1000)
+
+
+class ManualClock:
+    """Clock that only moves when told to - for headless games and tests."""
+
+    def __init__(self, start_ms: int = 0):
+        self.now_ms = start_ms
+
+    def __call__(self) -> int:
+        return self.now_ms
+
+    def advance(self, ms: int) -> int:
+        self.now_ms += ms
+        return self.now_ms
@@ -0,0 +1,147 @@
+import heapq
+import itertools
+from typing import Dict, List, Optional, Tuple
+
+Cell = Tuple[int, int]
+
+# kinds of contact returned by CollisionEngine.next_contact
+LAND = "land"       # a move ends; the piece now stands on its target
+ENTER = "enter"     # a moving piece enters a cell; whoever stands there meets it
+CROSS = "cross"     # two enemy moves are in the same cell at the same time
+
+
+class _Move:
+    """A move in flight and the [enter, exit) interval of every cell it crosses."""
+
+    __slots__ = ("piece", "target", "end_ms", "spans")
+
+    def __init__(self, piece, spans: Dict[Cell, Tuple[int, int]], end_ms: int):
+        self.piece = piece
+        self.spans = spans
+        self.target = next(reversed(spans))
+        self.end_ms = end_ms
+
+
+class CollisionEngine:
+    """Finds when moving pieces meet other pieces, by reserving cells in time.
+
+    A piece that starts moving reserves each cell its trajectory crosses for
+    the interval it spends there.  Reserving only compares against the other
+    reservations of those same cells, so the cost follows the cells a move
+    crosses, not the number of pieces on the board.  Every contact is
+    queued at the game time it happens and handed out by next_contact() in
+    time order:
+
+    * LAND when a move ends,
+    * ENTER when a move enters a cell past its start cell - the occupant is
+      whoever stands there at that time, so the caller looks it up then,
+    * CROSS when an enemy move already holds the cell for an overlapping
+      interval - the one that entered first is the occupant.
+
+    Contacts of a move that has been released (its piece was captured) are
+    dropped.
+    """
+
+    def __init__(self):
+        self._moves: Dict[str, _Move] = {}
+        self._cells: Dict[Cell, List[_Move]] = {}
+        self._events = []
+        self._seq = itertools.count()
+
+    @staticmethod
+    def supports(piece) -> bool:
+        return hasattr(getattr(piece, "state_manager", None), "current_move")
+
+    def __len__(self) -> int:
+        return len(self._moves)
+
+    def is_moving(self, piece) -> bool:
+        return piece.piece_id in self._moves
+
+    def landing(self, cell: Cell) -> List:
+        """Pieces in flight whose move ends on cell."""
+        cell = tuple(cell)
+        return [m.piece for m in self._cells.get(cell, ()) if m.target == cell]
+
+    def reserve(self, piece):
+        """Reserve the path of piece's current move; a piece that is not moving holds nothing."""
+        self.release(piece)
+        current = piece.state_manager.current_move()
+        if current is None:
+            return
+        (row, col), start_ms, trajectory = current
+        cells = trajectory.cells
+        spans = {}
+        for i, (d_row, d_col, enter_ms) in enumerate(cells):
+            exit_ms = cells[i + 1][2] if i + 1 < len(cells) else trajectory.duration_ms
+            spans[(row + d_row, col + d_col)] = (start_ms + enter_ms, start_ms + exit_ms)
+        move = _Move(piece, spans, start_ms + trajectory.duration_ms)
+        self._moves[piece.piece_id] = move
+
+        for i, (cell, (enter_ms, exit_ms)) in enumerate(spans.items()):
+            for other in self._cells.get(cell, ()):
+                if other.piece.player_one == piece.player_one:
+                    continue
+                other_enter, other_exit = other.spans[cell]
+                if max(enter_ms, other_enter) < min(exit_ms, other_exit):
+                    if other_enter <= enter_ms:
+                        self._push(enter_ms, CROSS, cell, move, other)
+                    else:
+                        self._push(other_enter, CROSS, cell, other, move)
+            self._cells.setdefault(cell, []).append(move)
+            if i > 0:
+                self._push(enter_ms, ENTER, cell, move, None)
+        self._push(move.end_ms, LAND, move.target, move, None)
+
+    def release(self, piece):
+        move = self._moves.pop(piece.piece_id, None)
+        if move is None:
+            return
+        for cell in move.spans:
+            crossing = self._cells[cell]
+            crossing.remove(move)
+            if not crossing:
+                del self._cells[cell]
+
+    def next_contact(self, now_ms: int) -> Optional[Tuple[int, str, Cell, object, Optional[object]]]:
+        """The earliest contact at or before now_ms as (time, kind, cell, arriving, occupant), or None."""
+        events = self._events
+        while events and events[0][0] <= now_ms:
+            time_ms, _, kind, cell, move, other = heapq.heappop(events)
+            if not self._live(move, other):
+                continue
+            if kind == LAND:
+                self.release(move.piece)
+            return time_ms, kind, cell, move.piece, None if other is None else other.piece
+        return None
+
+    def next_contact_ms(self) -> Optional[int]:
+        events = self._events
+        while events and not self._live(events[0][4], events[0][5]):
+            heapq.heappop(events)
+        return events[0][0] if events else None
+
+    def _live(self, move: _Move, other: Optional[_Move]) -> bool:
+        moves = self._moves
+        return (moves.get(move.piece.piece_id) is move
+                and (other is None or moves.get(other.piece.piece_id) is other))
+
+    def _push(self, time_ms: int, kind: str, cell: Cell, move: _Move, other: Optional[_Move]):
+        heapq.heappush(self._events, (time_ms, next(self._seq), kind, cell, move, other))
+
+
+def capture_loser(occupant, arriving):
+    """Which of two pieces meeting in a cell is captured, None if neither.
+
+    The arriving piece takes an occupant that can be captured; otherwise an
+    occupant that can capture (one that got there first, or is jumping)
+    takes the arriving piece.  Pieces of the same player never capture each
+    other.
+    """
+    if occupant.player_one == arriving.player_one:
+        return None
+    if arriving.can_capture() and occupant.can_be_captured():
+        return occupant
+    if occupant.can_capture():
+        return arriving
+    return None
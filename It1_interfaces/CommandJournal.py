@@ -0,0 +1,147 @@
+import json
+import pathlib
+import struct
+import time
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+from Command import Command
+
+# File layout:
+#   header  : MAGIC, version (u8), start_ms (i64)
+#   records : length (u32) + payload, repeated
+#   payload : timestamp_ms (i64), piece_id (u16 len + utf-8), type (u8 len + utf-8),
+#             params (compact JSON, rest of the payload)
+MAGIC = b"CTDJ"
+VERSION = 1
+_HEADER = struct.Struct("<4sBq")
+_LENGTH = struct.Struct("<I")
+_FIXED = struct.Struct("<qH")
+NO_TIMESTAMP = -(2 ** 63)
+
+PathOrFile = Union[str, pathlib.Path, BinaryIO]
+
+
+def encode_command(cmd: Command) -> bytes:
+    piece_id = str(cmd.piece_id).encode("utf-8")
+    cmd_type = cmd.type.encode("utf-8")
+    params = json.dumps(cmd.params, separators=(",", ":")).encode("utf-8")
+    ts = NO_TIMESTAMP if cmd.timestamp_ms is None else cmd.timestamp_ms
+    payload = _FIXED.pack(ts, len(piece_id)) + piece_id + bytes([len(cmd_type)]) + cmd_type + params
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def decode_command(payload: bytes) -> Command:
+    ts, id_len = _FIXED.unpack_from(payload)
+    pos = _FIXED.size
+    piece_id = payload[pos:pos + id_len].decode("utf-8")
+    pos += id_len
+    type_len = payload[pos]
+    cmd_type = payload[pos + 1:pos + 1 + type_len].decode("utf-8")
+    params = json.loads(payload[pos + 1 + type_len:])
+    return Command(piece_id, cmd_type, params, None if ts == NO_TIMESTAMP else ts)
+
+
+class CommandJournal:
+    """Append-only binary log of every command a game issues."""
+
+    def __init__(self, target: PathOrFile, start_ms: int):
+        if isinstance(target, (str, pathlib.Path)):
+            self._file = open(target, "wb")
+            self._owns_file = True
+        else:
+            self._file = target
+            self._owns_file = False
+        self.start_ms = start_ms
+        self.count = 0
+        self._file.write(_HEADER.pack(MAGIC, VERSION, start_ms))
+
+    def append(self, cmd: Command):
+        self._file.write(encode_command(cmd))
+        self.count += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_journal(source: PathOrFile) -> Tuple[int, List[Command]]:
+    """Return (start_ms, commands) from a journal written by CommandJournal."""
+    if isinstance(source, (str, pathlib.Path)):
+        data = pathlib.Path(source).read_bytes()
+    else:
+        data = source.read()
+    return _parse(data)
+
+
+def _parse(data: bytes) -> Tuple[int, List[Command]]:
+    if len(data) < _HEADER.size:
+        raise ValueError("Journal is too short to hold a header")
+    magic, version, start_ms = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a command journal")
+    if version != VERSION:
+        raise ValueError(f"Unsupported journal version: {version}")
+    return start_ms, list(_iter_records(data, _HEADER.size))
+
+
+def _iter_records(data: bytes, pos: int) -> Iterator[Command]:
+    while pos < len(data):
+        if pos + _LENGTH.size > len(data):
+            raise ValueError(f"Truncated journal record at byte {pos}")
+        (length,) = _LENGTH.unpack_from(data, pos)
+        pos += _LENGTH.size
+        if pos + length > len(data):
+            raise ValueError(f"Truncated journal record at byte {pos}")
+        yield decode_command(data[pos:pos + length])
+        pos += length
+
+
+class CommandReplayer:
+    """Feeds a recorded journal back into a headless game.
+
+    The game's ManualClock is moved in fixed ticks up to each command's
+    timestamp, so a given journal always produces the same game.  With
+    speed=None the replay runs as fast as possible; speed=N also sleeps so
+    it plays out N times faster than it was recorded.
+    """
+
+    def __init__(self, start_ms: int, commands: List[Command]):
+        self.start_ms = start_ms
+        self.commands = commands
+
+    @classmethod
+    def from_file(cls, source: PathOrFile) -> "CommandReplayer":
+        return cls(*read_journal(source))
+
+    def run(self, game, speed: Optional[float] = None, until_ms: Optional[int] = None,
+            tick_ms: int = 16, sleep: Callable[[float], None] = time.sleep):
+        if not hasattr(game.clock, "advance"):
+            raise TypeError("Replay needs a headless game with a ManualClock")
+        game.clock.now_ms = self.start_ms
+
+        for cmd in self.commands:
+            self._advance_to(game, cmd.timestamp_ms, speed, tick_ms, sleep)
+            game.issue_command(Command(cmd.piece_id, cmd.type, cmd.params, cmd.timestamp_ms))
+
+        if until_ms is not None:
+            self._advance_to(game, until_ms, speed, tick_ms, sleep)
+
+    @staticmethod
+    def _advance_to(game, target_ms, speed, tick_ms, sleep):
+        if target_ms is None:
+            return
+        delta = target_ms - game.game_time_ms()
+        if delta <= 0:
+            return
+        if speed:
+            sleep(delta / 1000.0 / speed)
+        game.advance(delta, tick_ms=tick_ms)
@@ -0,0 +1,175 @@
+import csv
+import json
+import pathlib
+import threading
+import time
+from collections import Counter
+from contextlib import nullcontext
+from typing import Callable, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+# phases of one Game.run iteration, in the order they happen
+PHASES = ("input", "update", "render.dirty", "render.pieces", "render.cursors",
+          "show", "waitkey", "sleep")
+# upper edges (ms) of the frame time histogram buckets; the last one catches the rest
+HISTOGRAM_EDGES_MS = (2.0, 4.0, 8.0, 12.0, 16.7, 20.0, 33.3, 50.0, 100.0, float("inf"))
+
+_DISABLED = nullcontext()
+
+
+class _Phase:
+    __slots__ = ("profiler", "column", "start")
+
+    def __init__(self, profiler: "FrameProfiler", column: int):
+        self.profiler = profiler
+        self.column = column
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+
+    def __exit__(self, *exc):
+        elapsed_ms = (self.profiler.clock() - self.start) / 1e6
+        with self.profiler._lock:
+            self.profiler._current[self.column] += elapsed_ms
+
+
+class FrameProfiler:
+    """Per-phase timings of the game loop, kept for the last `history` frames.
+
+    Wrap each phase in `with profiler.phase(name):` and call end_frame()
+    once per loop iteration.  Frame rows live in a fixed-size NumPy ring
+    buffer, so memory does not grow however long the game runs; summary()
+    and the histogram are computed from it on demand.  count() keeps
+    per-piece-type update and draw counts.  While disabled phase() hands out
+    one shared no-op context and every other call returns at once, so the
+    instrumentation can stay in the loop.  Phases may be timed on different
+    threads as long as each one is always timed on the same thread: the
+    running totals and the counts are only touched under a lock, and a
+    frame counts every phase that ended since the previous end_frame(),
+    whichever thread ran it.
+    """
+
+    def __init__(self, enabled: bool = False, history: int = 600,
+                 dump_path: Optional[pathlib.Path] = None, dump_every_frames: int = 600,
+                 clock: Callable[[], int] = time.perf_counter_ns):
+        self.enabled = enabled
+        self.overlay = False
+        self.clock = clock
+        self.dump_path = pathlib.Path(dump_path) if dump_path else None
+        self.dump_every_frames = dump_every_frames
+        self._columns = {name: i for i, name in enumerate(PHASES)}
+        self._phases = [_Phase(self, i) for i in range(len(PHASES))]
+        # one row per frame: every phase, then the whole frame (ms)
+        self._rows = np.zeros((history, len(PHASES) + 1))
+        self._current = np.zeros(len(PHASES))
+        self._frame_start = None
+        self._lock = threading.Lock()
+        self.frames = 0
+        self.counts: Dict[str, Counter] = {"update": Counter(), "draw": Counter()}
+
+    def toggle_overlay(self):
+        """Show / hide the overlay; showing it also starts measuring."""
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.enabled = True
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return _DISABLED
+        if self._frame_start is None:
+            with self._lock:
+                if self._frame_start is None:
+                    self._frame_start = self.clock()
+        return self._phases[self._columns[name]]
+
+    def count(self, kind: str, piece_types: Iterable[str]):
+        if self.enabled:
+            with self._lock:
+                self.counts[kind].update(piece_types)
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._frame_start is None:
+                return
+            row = self._rows[self.frames % len(self._rows)]
+            row[:-1] = self._current
+            row[-1] = (self.clock() - self._frame_start) / 1e6
+            self._current[:] = 0
+            self._frame_start = None
+            self.frames += 1
+        if self.dump_path is not None and self.frames % self.dump_every_frames == 0:
+            self.dump(self.dump_path)
+
+    def recent(self) -> np.ndarray:
+        """Rows of the frames still in the ring buffer, oldest first."""
+        n = len(self._rows)
+        if self.frames <= n:
+            return self._rows[:self.frames]
+        start = self.frames % n
+        return np.concatenate((self._rows[start:], self._rows[:start]))
+
+    def histogram(self) -> Dict[str, int]:
+        """Frame count per bucket of HISTOGRAM_EDGES_MS, labelled by the bucket's upper edge."""
+        return _histogram(self.recent()[:, -1])
+
+    def summary(self) -> dict:
+        # counts are updated on the simulation thread, rows by end_frame on the render thread
+        with self._lock:
+            rows = self.recent().copy()
+            frames = self.frames
+            counts = {kind: dict(counter) for kind, counter in self.counts.items()}
+        phases = {}
+        for name, column in list(self._columns.items()) + [("frame", len(PHASES))]:
+            values = rows[:, column]
+            phases[name] = _stats(values) if len(values) else {}
+        return {
+            "frames": frames,
+            "window": len(rows),
+            "phases_ms": phases,
+            "histogram": _histogram(rows[:, -1]),
+            "counts": counts,
+        }
+
+    def dump(self, path: pathlib.Path):
+        """summary() as JSON, or the per-frame rows as CSV when path ends in .csv."""
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix.lower() == ".csv":
+            first = self.frames - len(self.recent())
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(("frame",) + PHASES + ("frame_ms",))
+                for i, row in enumerate(self.recent()):
+                    writer.writerow([first + i] + [f"{v:.4f}" for v in row])
+        else:
+            with open(path, "w") as f:
+                json.dump(self.summary(), f, indent=2)
+
+    def overlay_lines(self) -> Sequence[str]:
+        rows = self.recent()
+        if not len(rows):
+            return ()
+        frame = _stats(rows[:, -1])
+        fps = 1000.0 / frame["mean"] if frame["mean"] else 0.0
+        lines = [f"{fps:5.1f} fps  frame p50 {frame['p50']:.1f} p95 {frame['p95']:.1f} max {frame['max']:.1f} ms"]
+        means = rows[:, :-1].mean(axis=0)
+        lines += [f"{name:<15}{mean:6.2f} ms" for name, mean in zip(PHASES, means)]
+        return lines
+
+    def draw_overlay(self, img, x: int = 8, y: int = 16, line_px: int = 14):
+        for i, line in enumerate(self.overlay_lines()):
+            img.put_text(line, x, y + i * line_px, 0.4, (0, 255, 255, 255), 1)
+
+
+def _stats(values: np.ndarray) -> Dict[str, float]:
+    p50, p95 = np.percentile(values, (50, 95))
+    return {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95), "max": float(values.max())}
+
+
+def _histogram(totals: np.ndarray) -> Dict[str, int]:
+    buckets = np.searchsorted(HISTOGRAM_EDGES_MS, totals, side="left")
+    counts = np.bincount(buckets, minlength=len(HISTOGRAM_EDGES_MS))
+    return {f"<={edge:g}ms": int(n) for edge, n in zip(HISTOGRAM_EDGES_MS, counts)}
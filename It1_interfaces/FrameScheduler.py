@@ -0,0 +1,100 @@
+import time
+from typing import Callable, List
+
+
+class FrameScheduler:
+    """Fixed-timestep simulation ticks and a separate render cadence.
+
+    Ticks are due every 1000 / tick_hz ms of clock time and each one is
+    reported with its own scheduled timestamp, so the simulation advances in
+    equal steps however long a frame took.  When the loop falls more than
+    max_ticks_per_frame behind, the remaining ticks are dropped and counted
+    in missed_ticks rather than spiralling.  Between iterations wait() sleeps
+    until the nearest deadline instead of for a constant.
+    """
+
+    def __init__(self, clock: Callable[[], int], tick_hz: float = 60.0, render_hz: float = 60.0,
+                 max_ticks_per_frame: int = 5, sleep: Callable[[float], None] = time.sleep):
+        if tick_hz <= 0 or render_hz <= 0:
+            raise ValueError("tick_hz and render_hz must be positive")
+        self.clock = clock
+        self.tick_ms = 1000.0 / tick_hz
+        self.render_ms = 1000.0 / render_hz
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self._sleep = sleep
+        self.ticks = 0
+        self.frames = 0
+        self.missed_ticks = 0
+        self.missed_frames = 0
+        self._next_tick_ms = None
+        self._next_render_ms = None
+
+    def start(self, now_ms: int = None):
+        if now_ms is None:
+            now_ms = self.clock()
+        self._next_tick_ms = float(now_ms)
+        self._next_render_ms = float(now_ms)
+
+    def due_ticks(self) -> List[int]:
+        """Timestamps of every simulation tick that is due, oldest first."""
+        now = self.clock()
+        if self._next_tick_ms is None:
+            self.start(now)
+        due = []
+        while now >= self._next_tick_ms and len(due) < self.max_ticks_per_frame:
+            due.append(int(self._next_tick_ms))
+            self._next_tick_ms += self.tick_ms
+        if now >= self._next_tick_ms:
+            behind = int((now - self._next_tick_ms) // self.tick_ms) + 1
+            self.missed_ticks += behind
+            self._next_tick_ms += behind * self.tick_ms
+        self.ticks += len(due)
+        return due
+
+    def render_due(self) -> bool:
+        now = self.clock()
+        if self._next_render_ms is None:
+            self.start(now)
+        if now < self._next_render_ms:
+            return False
+        self._next_render_ms += self.render_ms
+        if now >= self._next_render_ms:
+            behind = int((now - self._next_render_ms) // self.render_ms) + 1
+            self.missed_frames += behind
+            self._next_render_ms += behind * self.render_ms
+        self.frames += 1
+        return True
+
+    def restart_ticks(self, now_ms: int = None):
+        """Tick from now on after a wait in which no tick was needed, rather than catching up."""
+        self._next_tick_ms = float(self.clock() if now_ms is None else now_ms)
+
+    def restart_renders(self, now_ms: int = None):
+        """Render from now on after a wait in which no frame was needed, rather than counting misses."""
+        self._next_render_ms = float(self.clock() if now_ms is None else now_ms)
+
+    def next_deadline_ms(self) -> float:
+        if self._next_tick_ms is None:
+            self.start()
+        return min(self._next_tick_ms, self._next_render_ms)
+
+    def wait(self):
+        """Sleep until the next tick or render is due."""
+        self._sleep_until(self.next_deadline_ms())
+
+    def wait_tick(self):
+        """Sleep until the next tick is due (a simulation thread of its own)."""
+        if self._next_tick_ms is None:
+            self.start()
+        self._sleep_until(self._next_tick_ms)
+
+    def wait_render(self):
+        """Sleep until the next render is due (a render thread of its own)."""
+        if self._next_render_ms is None:
+            self.start()
+        self._sleep_until(self._next_render_ms)
+
+    def _sleep_until(self, deadline_ms: float):
+        delay_ms = deadline_ms - self.clock()
+        if delay_ms > 0:
+            self._sleep(delay_ms / 1000.0)
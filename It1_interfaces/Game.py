@@ -1,93 +1,405 @@
 import queue
-import time
+import threading
 import cv2
-from typing import List, Dict, Optional 
+from typing import Callable, List, Dict, Optional 
 from Board import Board
 from Piece import Piece
 from img import Img
 from Command import Command
 from PlayerInputState import PlayerInputState
-from pynput import keyboard
-from pynput.keyboard import Key, KeyCode
+from Renderer import Renderer
+from OccupancyGrid import OccupancyGrid
+from Clock import ManualClock, WallClock
+from FrameScheduler import FrameScheduler
+from BatchPhysics import BatchPhysics
+from TransitionTimers import TransitionTimers
+from CollisionEngine import CollisionEngine, ENTER, LAND, capture_loser
+from FrameProfiler import FrameProfiler
+from Snapshot import CursorSnapshot, GameSnapshot, PieceSnapshot, SnapshotBuffer
+try:
+    from pynput import keyboard
+    from pynput.keyboard import Key, KeyCode
+except ImportError:  # אין מסך (CI / שרת) - משחק headless בלבד
+    keyboard = Key = KeyCode = None
+
+DEFAULT_TICK_MS = 16
+# מקש שמציג / מסתיר את נתוני הביצועים על המסך
+PROFILER_OVERLAY_KEY = 'p'
+PLAYER1_COLOR = (0, 255, 0)
+PLAYER2_COLOR = (0, 0, 255)
+# הכי הרבה שהלולאות ישנות כשאין מה לעשות - כדי לשים לב ל-esc ולסגירה
+MAX_IDLE_WAIT_MS = 100
 
 class Game:
-    def __init__(self, pieces: List[Piece], board: Board):
+    def __init__(self, pieces: List[Piece], board: Board,
+                 clock: Optional[Callable[[], int]] = None, headless: bool = False,
+                 tick_hz: float = 60.0, render_hz: float = 60.0, journal=None,
+                 batch_physics: bool = False, profiler: Optional[FrameProfiler] = None):
         self.pieces: Dict[str, Piece] = {p.piece_id: p for p in pieces}
         self.board = board
+        self.headless = headless
+        self.clock = clock if clock is not None else (ManualClock() if headless else WallClock())
         self.user_input_queue = queue.Queue()
         self._user_input_thread = None
         self.player1 = PlayerInputState(is_player_one=True)
         self.player2 = PlayerInputState(is_player_one=False)
         self.player1.cursor = [4, 6]
         self.player2.cursor = [4, 1]
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.renderer = None if headless else Renderer(board, self.profiler)
+        self.journal = journal
+        self.scheduler = FrameScheduler(self.game_time_ms, tick_hz=tick_hz, render_hz=render_hz)
+        self.occupancy = OccupancyGrid(board.H_cells, board.W_cells)
+        for p in self.pieces.values():
+            self.occupancy.add(p)
+        # pieces with a PieceRuntime are only updated when one of their
+        # deadlines passes (TransitionTimers), or - with batch_physics - when
+        # the NumPy pass over all of them says so; other pieces every tick
+        self.batch = BatchPhysics(max(len(self.pieces), 1)) if batch_physics else None
+        self.timers = None if batch_physics else TransitionTimers()
+        self._polled = []
+        for p in self.pieces.values():
+            if self.batch is not None and BatchPhysics.supports(p):
+                self.batch.add(p)
+            elif self.timers is not None and TransitionTimers.supports(p):
+                self.timers.schedule(p)
+            else:
+                self._polled.append(p)
+        self.collisions = CollisionEngine()
+        self.snapshots = SnapshotBuffer()
+        self._stop = threading.Event()
+        self._sim_error = None
 
     def game_time_ms(self) -> int:
-        return int(time.time() * 1000)
+        return int(self.clock())
+
+    def step(self, now_ms: Optional[int] = None):
+        """One simulation tick: every piece is updated to now_ms."""
+        if now_ms is None:
+            now_ms = self.game_time_ms()
+        self._resolve_collisions(now_ms)
+        for p in self._polled:
+            p.update(now_ms)
+        if self.batch is not None:
+            updated = [self.batch.pieces[row] for row in self.batch.step(now_ms)]
+            for piece in updated:
+                piece.update(now_ms)
+                self.batch.sync(piece)
+        else:
+            updated = self.timers.pop_due(now_ms)
+            for piece in updated:
+                piece.update(now_ms)
+                self.timers.schedule(piece)
+        if self.profiler.enabled:
+            self.profiler.count("update", (p.piece_type for p in self._polled))
+            self.profiler.count("update", (p.piece_type for p in updated))
+
+    def advance(self, ms: int, tick_ms: int = DEFAULT_TICK_MS):
+        """Move the clock forward by ms, stepping every tick_ms on the way.
+
+        Only for clocks that can be advanced (ManualClock); the simulation
+        runs as fast as the CPU allows.
+        """
+        if not hasattr(self.clock, "advance"):
+            raise TypeError("advance() needs a clock that can be advanced, e.g. ManualClock")
+        target_ms = self.game_time_ms() + ms
+        while self.game_time_ms() < target_ms:
+            self.clock.advance(min(tick_ms, target_ms - self.game_time_ms()))
+            self.step()
+
+    def issue_command(self, cmd: Command):
+        """Send a command to its piece, stamping it with game time if needed."""
+        if cmd.timestamp_ms is None:
+            cmd.timestamp_ms = self.game_time_ms()
+        if self.journal is not None:
+            self.journal.append(cmd)
+        self._process_input(cmd)
+
+    def _process_input(self, cmd: Command):
+        piece = self.pieces.get(cmd.piece_id)
+        if piece is None:
+            print(f"Warning: command for unknown piece_id '{cmd.piece_id}' ignored")
+            return
+        piece.on_command(cmd)
+        self._resync(piece)
+        if CollisionEngine.supports(piece):
+            self.collisions.reserve(piece)
+
+    def _resync(self, piece):
+        """Tell the batch / timers that piece changed outside step()."""
+        if self.batch is not None and piece in self.batch:
+            self.batch.sync(piece)
+        elif self.timers is not None and TransitionTimers.supports(piece):
+            self.timers.schedule(piece)
+
+    def _resolve_collisions(self, now_ms: int):
+        """Apply every contact between pieces up to now_ms, in the order they happened.
+
+        The pieces involved are first brought to the time of the contact, so
+        captures follow the state each piece was in at that moment.
+        """
+        while True:
+            contact = self.collisions.next_contact(now_ms)
+            if contact is None:
+                return
+            time_ms, kind, cell, arriving, occupant = contact
+            if kind == LAND:
+                arriving.update(time_ms)
+                self._resync(arriving)
+                continue
+            if kind == ENTER:
+                occupant = self.get_piece_at(*cell)
+                # a piece in flight is met by CROSS contacts, not where it took off
+                if occupant is None or occupant is arriving or self.collisions.is_moving(occupant):
+                    continue
+            for p in (occupant, arriving):
+                p.update(time_ms)
+                self._resync(p)
+            loser = capture_loser(occupant, arriving)
+            if loser is not None:
+                winner = arriving if loser is occupant else occupant
+                self._capture(loser, winner)
+
+    def _capture(self, loser: Piece, winner: Piece):
+        print(f"'{winner.piece_id}' captured '{loser.piece_id}'")
+        del self.pieces[loser.piece_id]
+        self.occupancy.remove(loser)
+        self.collisions.release(loser)
+        if self.batch is not None and loser in self.batch:
+            self.batch.remove(loser)
+        elif self.timers is not None:
+            self.timers.cancel(loser)
+        if loser in self._polled:
+            self._polled.remove(loser)
 
     def start_user_input_thread(self):
         def on_press(key):
-            self.user_input_queue.put(key)
+            # זמן הלחיצה נרשם כבר ב-listener ולא כשהלולאה מגיעה למקש
+            self.user_input_queue.put((key, self.game_time_ms()))
         listener = keyboard.Listener(on_press=on_press)
         listener.start()
         self._user_input_thread = listener
 
+    def snapshot(self, now_ms: int, previous: Optional[GameSnapshot] = None) -> GameSnapshot:
+        """An immutable copy of everything drawn at now_ms, safe to render from another thread.
+
+        With the previous snapshot every piece also records where it was
+        drawn then, so the display can interpolate between the two.
+        """
+        before = {s.piece_id: s for s in previous.pieces} if previous is not None else {}
+        pieces = []
+        for p in self.pieces.values():
+            sprite, x, y = p.get_draw_info(now_ms)
+            prev = before.get(p.piece_id)
+            pieces.append(PieceSnapshot(p.piece_id, p.piece_type, p.state_name, sprite, x, y,
+                                        prev.x if prev is not None else x, prev.y if prev is not None else y))
+        cursors = tuple((CursorSnapshot(tuple(player.cursor), player.has_selected_piece, player.is_player_one), color)
+                        for player, color in ((self.player1, PLAYER1_COLOR), (self.player2, PLAYER2_COLOR)))
+        return GameSnapshot(now_ms, tuple(pieces), cursors,
+                            previous.time_ms if previous is not None else None)
+
+    def render_snapshot(self, snapshot: GameSnapshot, alpha: float = 1.0):
+        """Draw a snapshot with every piece `alpha` of the way from its previous to its current position."""
+        return self.renderer.render(snapshot.interpolated(alpha), snapshot.cursors, now_ms=snapshot.time_ms)
+
     def run(self):
+        """Play until esc.
+
+        The simulation - input and ticks - runs on a thread of its own and
+        publishes a GameSnapshot after every batch of ticks; this thread
+        (OpenCV windows belong to the main thread) renders the newest one at
+        render_hz.  A slow imshow never holds up a tick, and when the display
+        falls behind it skips snapshots instead of queueing them.  Between
+        snapshots the display interpolates piece positions, so tick_hz can be
+        well below render_hz (20 Hz ticks, 60 Hz frames) without stutter.
+
+        Nothing is ticked, composed or shown while nothing on the board can
+        change: the simulation then blocks on the input queue until the next
+        sprite frame or state deadline, publishes only snapshots that look
+        different, and the display waits for the next one.
+        """
+        if self.headless:
+            raise RuntimeError("Headless games are driven with step() / advance()")
+        if keyboard is None:
+            raise RuntimeError("pynput is required unless headless=True")
         self.start_user_input_thread()
+        self.scheduler.start()
+        self._stop.clear()
+        self._sim_error = None
+        simulation = threading.Thread(target=self._simulate, name="simulation", daemon=True)
+        simulation.start()
+        try:
+            self._present()
+        finally:
+            self._stop.set()
+            simulation.join()
+            if self.profiler.enabled and self.profiler.dump_path is not None:
+                self.profiler.dump(self.profiler.dump_path)
+            if self._user_input_thread is not None:
+                self._user_input_thread.stop()
+            self.renderer.close()
+            cv2.destroyAllWindows()
+        if self._sim_error is not None:
+            raise self._sim_error
 
-        while True:
-            board_clone = self.board.clone()
-            frame = board_clone.img.copy()
+    def _simulate(self):
+        """Simulation thread: input, fixed ticks and a snapshot per batch of ticks, until stopped."""
+        prof = self.profiler
+        previous = published = None
+        idle_s = 0.0
+        try:
+            while not self._stop.is_set():
+                with prof.phase("input"):
+                    running = self._drain_input(block_s=idle_s)
+                if not running:
+                    break
+                if idle_s:
+                    self.scheduler.restart_ticks()
+                with prof.phase("update"):
+                    ticks = self.scheduler.due_ticks()
+                    for tick_ms in ticks:
+                        self.step(tick_ms)
+                if ticks:
+                    if idle_s and previous is not None:
+                        # the picture stood still while we waited, so it stood there a tick ago too
+                        previous = previous._replace(time_ms=int(ticks[0] - self.scheduler.tick_ms))
+                    previous = self.snapshot(ticks[-1], previous)
+                    if published is None or not previous.looks_like(published):
+                        self.snapshots.publish(previous)
+                        published = previous
+                idle_s = self._idle_wait_s()
+                if not idle_s:
+                    self.scheduler.wait_tick()
+        except BaseException as e:    # re-raised by run() on the main thread
+            self._sim_error = e
+        finally:
+            self._stop.set()
 
-            now_ms = self.game_time_ms()
-            for p in self.pieces.values():
-                p.update(now_ms)
+    def _present(self):
+        """Render thread: show the newest snapshot at the render cadence until stopped.
+
+        Once a snapshot is on screen at its final positions (and no overlay
+        is updating) the window already shows the right picture, so the loop
+        waits for the next snapshot instead of composing the same frame again.
+        """
+        prof = self.profiler
+        snapshot = None
+        settled = False
+        while not self._stop.is_set():
+            idle = settled and not prof.overlay
+            if idle:
+                with prof.phase("sleep"):
+                    latest = self.snapshots.take(timeout=MAX_IDLE_WAIT_MS / 1000.0)
+                if latest is not None:
+                    self.scheduler.restart_renders()
+            else:
+                latest = self.snapshots.take()
+            if latest is not None:
+                snapshot, settled, idle = latest, False, False
 
-            for p in self.pieces.values():
-                p.draw_on_board(frame)
+            if not idle and snapshot is not None and self.scheduler.render_due():
+                alpha = snapshot.alpha(self.game_time_ms())
+                frame = self.render_snapshot(snapshot, alpha)
+                with prof.phase("show"):
+                    if prof.overlay:
+                        # על עותק - הפריים של ה-Renderer נשמר נקי לציור החלקי הבא
+                        frame = frame.copy()
+                        prof.draw_overlay(frame)
+                    cv2.imshow("Game", frame.img)
+                settled = alpha >= 1.0
 
-            self._draw_cursor(frame, self.player1, color=(0, 255, 0))
-            self._draw_cursor(frame, self.player2, color=(0, 0, 255))
+            with prof.phase("waitkey"):
+                key = cv2.waitKey(1)
+            if key & 0xFF == 27:
+                break
 
-            cv2.imshow("Game", frame.img)
+            if not idle:
+                with prof.phase("sleep"):
+                    self.scheduler.wait_render()
+            prof.end_frame()
 
-            key = None
-            try:
-                key = self.user_input_queue.get_nowait()
-            except queue.Empty:
-                pass
+    def _idle_until_ms(self, now_ms: int) -> Optional[float]:
+        """Game time of the next change on the board if nothing changes before it, None while it has to tick.
 
-            if key is not None:
-                if key == keyboard.Key.esc:
-                    break
-                self._handle_input(key)
+        That is the earliest state deadline, contact or sprite frame change;
+        infinity when only input can change anything.  Polled and batched
+        pieces have no such deadlines and keep the game ticking.
+        """
+        if self._polled or self.batch is not None:
+            return None
+        wake = [self.timers.next_deadline_ms(), self.collisions.next_contact_ms()]
+        for p in self.pieces.values():
+            change = p.state_manager.next_change_ms(now_ms)
+            if change is not None and change <= now_ms:
+                return None
+            wake.append(change)
+        return min((w for w in wake if w is not None), default=float("inf"))
 
-            if cv2.waitKey(1) & 0xFF == 27:
-                break
+    def _idle_wait_s(self) -> float:
+        """How long the simulation may block on input before anything changes by itself (0: tick on)."""
+        now_ms = self.game_time_ms()
+        until_ms = self._idle_until_ms(now_ms)
+        if until_ms is None or until_ms <= now_ms:
+            return 0.0
+        return min(until_ms - now_ms, MAX_IDLE_WAIT_MS) / 1000.0
 
-            time.sleep(0.016)
+    def _drain_input(self, coalesce: bool = True, block_s: float = 0.0) -> bool:
+        """Handle every pending key press. Returns False once esc was pressed.
 
-        if self._user_input_thread is not None:
-            self._user_input_thread.stop()
-        cv2.destroyAllWindows()
+        With coalesce, a run of the same cursor key is applied as one move of
+        n cells - the clamped result is identical to n single steps.  With
+        block_s it first waits up to that long for a key press.
+        """
+        events = []
+        try:
+            if block_s > 0:
+                events.append(self.user_input_queue.get(timeout=block_s))
+            while True:
+                events.append(self.user_input_queue.get_nowait())
+        except queue.Empty:
+            pass
 
-    def _handle_input(self, key):
-        if key == Key.left: self.player1.cursor[0] = max(0, self.player1.cursor[0] - 1)
-        elif key == Key.up: self.player1.cursor[1] = max(0, self.player1.cursor[1] - 1)
-        elif key == Key.right: self.player1.cursor[0] = min(self.board.W_cells - 1, self.player1.cursor[0] + 1)
-        elif key == Key.down: self.player1.cursor[1] = min(self.board.H_cells - 1, self.player1.cursor[1] + 1)
+        i = 0
+        while i < len(events):
+            key, timestamp_ms = events[i]
+            if key == Key.esc:
+                return False
+            repeat = 1
+            if coalesce and self._cursor_move(key) is not None:
+                while i + repeat < len(events) and events[i + repeat][0] == key:
+                    repeat += 1
+            self._handle_input(key, timestamp_ms, repeat)
+            i += repeat
+        return True
+
+    def _cursor_move(self, key):
+        """(player, dx, dy) if key moves a cursor, else None."""
+        if key == Key.left: return self.player1, -1, 0
+        elif key == Key.up: return self.player1, 0, -1
+        elif key == Key.right: return self.player1, 1, 0
+        elif key == Key.down: return self.player1, 0, 1
         elif isinstance(key, KeyCode):
             char = key.char.lower() if key.char else ''
-            if char == 'a': self.player2.cursor[0] = max(0, self.player2.cursor[0] - 1)
-            elif char == 'w': self.player2.cursor[1] = max(0, self.player2.cursor[1] - 1)
-            elif char == 'd': self.player2.cursor[0] = min(self.board.W_cells - 1, self.player2.cursor[0] + 1)
-            elif char == 's': self.player2.cursor[1] = min(self.board.H_cells - 1, self.player2.cursor[1] + 1)
+            if char == 'a': return self.player2, -1, 0
+            elif char == 'w': return self.player2, 0, -1
+            elif char == 'd': return self.player2, 1, 0
+            elif char == 's': return self.player2, 0, 1
+        return None
 
-        if key == Key.enter:
-            self._handle_select_or_move(self.player1)
+    def _handle_input(self, key, timestamp_ms: Optional[int] = None, repeat: int = 1):
+        move = self._cursor_move(key)
+        if move is not None:
+            player, dx, dy = move
+            player.cursor[0] = min(max(player.cursor[0] + dx * repeat, 0), self.board.W_cells - 1)
+            player.cursor[1] = min(max(player.cursor[1] + dy * repeat, 0), self.board.H_cells - 1)
+        elif key == Key.enter:
+            self._handle_select_or_move(self.player1, timestamp_ms)
         elif key == Key.space:
-            self._handle_select_or_move(self.player2)
+            self._handle_select_or_move(self.player2, timestamp_ms)
+        elif isinstance(key, KeyCode) and key.char and key.char.lower() == PROFILER_OVERLAY_KEY:
+            self.profiler.toggle_overlay()
             
-    def _handle_select_or_move(self, player: PlayerInputState):
+    def _handle_select_or_move(self, player: PlayerInputState, timestamp_ms: Optional[int] = None):
         cursor_pos = (player.cursor[1], player.cursor[0]) # (row, col)
 
         if not player.has_selected_piece:
@@ -103,14 +415,18 @@ class Game:
             if not selected_piece:
                 player.reset_selection()
                 return
-            is_valid = selected_piece.moves.is_valid_move(
+            # חוקיות לפי הבורד כולו - כלים חוסמים תנועה לאורך קרן, ותפיסה רק של יריב
+            is_valid = self.occupancy.position.is_legal_move(
+                piece_type=selected_piece.piece_type,
+                player_one=selected_piece.player_one,
                 start_cell=selected_piece.cell,
-                end_cell=cursor_pos
+                end_cell=cursor_pos,
+                is_first_move=selected_piece.move_count == 0
             )
 
-            target_piece = self.get_piece_at(cursor_pos[0], cursor_pos[1])
-            if target_piece is not None:
-                is_valid = False 
+            # משבצת שכלי שלך כבר בדרך אליה תפוסה
+            if any(p.player_one == selected_piece.player_one for p in self.collisions.landing(cursor_pos)):
+                is_valid = False
 
             if is_valid:
                 print(f"Commanding '{player.selected_piece_id}' to move to {cursor_pos}")
@@ -118,24 +434,13 @@ class Game:
                     piece_id=player.selected_piece_id,
                     type="move",
                     params={"target": list(cursor_pos)},
-                    timestamp_ms=self.game_time_ms()
+                    timestamp_ms=timestamp_ms if timestamp_ms is not None else self.game_time_ms()
                 )
-                selected_piece.on_command(cmd)
+                self.issue_command(cmd)
             else:
                 print(f"Invalid move for {player.selected_piece_id} to {cursor_pos}")
             selected_piece.selected = False
             player.reset_selection()
 
-    def _draw_cursor(self, frame: Img, player: PlayerInputState, color=(0, 255, 0)):
-        x = player.cursor[0] * self.board.cell_W_pix
-        y = player.cursor[1] * self.board.cell_H_pix
-        cv2.rectangle(frame.img, (x, y), (x + self.board.cell_W_pix, y + self.board.cell_H_pix), color, 2)
-        if player.has_selected_piece:
-             cv2.rectangle(frame.img, (x+3, y+3), (x + self.board.cell_W_pix-3, y + self.board.cell_H_pix-3), color, 2)
-
-
     def get_piece_at(self, row: int, col: int) -> Optional[Piece]:
-        for p in self.pieces.values():
-            if p.cell == (row, col):
-                return p
-        return None
\ No newline at end of file
+        return self.occupancy.get(row, col)
\ No newline at end of file
@@ -1,69 +1,108 @@
 import pathlib
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from img import Img
 from Board import Board
 
+def load_frames(sprites_folder: pathlib.Path, board: Board, sprite_cache=None) -> List[Img]:
+    """Every png in the folder, in name order, sized to one board cell."""
+    size = (board.cell_W_pix, board.cell_H_pix)
+    frames = []
+    for p in sorted(sprites_folder.glob("*.png")):
+        if sprite_cache is not None:
+            img = sprite_cache.read(p, size=size)
+        else:
+            img = Img()
+            img.read(str(p), size=size)
+        frames.append(img)
+    return frames
+
+def frame_time_ms(fps: float) -> float:
+    return int(1000 / fps) if fps > 0 else float('inf')
+
+def frame_index(elapsed_ms: float, frame_ms: float, n_frames: int, loop: bool) -> int:
+    """Which frame shows elapsed_ms after the animation started."""
+    index = int(elapsed_ms // frame_ms)
+    if index < n_frames:
+        return index
+    return index % n_frames if loop else n_frames - 1
+
+def next_frame_ms(elapsed_ms: float, frame_ms: float, n_frames: int, loop: bool) -> Optional[float]:
+    """Elapsed time at which the next frame after elapsed_ms shows, None if the picture stays."""
+    if n_frames < 2 or frame_ms == float('inf'):
+        return None
+    index = int(elapsed_ms // frame_ms)
+    if not loop and index >= n_frames - 1:
+        return None
+    return (index + 1) * frame_ms
+
 class Graphics:
+    """A state's animation.
+
+    The frame showing at any time is worked out from when the animation
+    started (frame_index), so update() has nothing to advance tick by tick
+    and a piece nobody draws costs nothing.
+    """
     def __init__(self,
-                 sprites_folder: pathlib.Path,
+                 sprites_folder: Optional[pathlib.Path],
                  board: Board,
                  loop: bool = True,
-                 fps: float = 6.0):
-        
-        png_files = sorted(list(sprites_folder.glob("*.png")))
-        
-        cell_w = board.cell_W_pix
-        cell_h = board.cell_H_pix
-
-        self.frames: List[Img] = []
-        for p in png_files:
-            img = Img()
-            img.read(str(p), size=(cell_w, cell_h))
-            self.frames.append(img)
-       
+                 fps: float = 6.0,
+                 sprite_cache=None,
+                 frames: Optional[Sequence[Img]] = None):
+        # frames already loaded for this state are shared, not read again
+        if frames is None:
+            frames = load_frames(sprites_folder, board, sprite_cache)
+        self.frames: Sequence[Img] = frames
 
-        self.frame_time_ms = int(1000 / fps) if fps > 0 else float('inf')
+        self.frame_time_ms = frame_time_ms(fps)
         self.loop = loop
         self.board = board
-        self.current_frame = 0
-        self.last_update_ms = None
-        self.finished = not self.frames
+        self.start_ms = None
+
     def copy(self):
         new_gfx = Graphics.__new__(Graphics)
         new_gfx.__dict__.update(self.__dict__)
         new_gfx.reset()
         return new_gfx
 
-    def reset(self):
-        self.current_frame = 0
-        self.last_update_ms = None
-        self.finished = not self.frames
+    def reset(self, command=None):
+        # האנימציה מתחילה יחד עם המצב - בזמן הפקודה אם יש לה זמן
+        ts = getattr(command, "timestamp_ms", None)
+        self.start_ms = ts if isinstance(ts, (int, float)) else None
 
-    def is_finished(self) -> bool:
-        return self.finished
-        
     def update(self, now_ms: int):
-        if self.finished or not self.frames:
-            return
-
-        if self.last_update_ms is None:
-            self.last_update_ms = now_ms
-            return
-
-        elapsed = now_ms - self.last_update_ms
-        if elapsed >= self.frame_time_ms:
-            frames_to_advance = elapsed // self.frame_time_ms
-            self.current_frame += frames_to_advance
-            self.last_update_ms += frames_to_advance * self.frame_time_ms
-
-            if self.current_frame >= len(self.frames):
-                if self.loop:
-                    self.current_frame %= len(self.frames)
-                else:
-                    self.current_frame = len(self.frames) - 1
-                    self.finished = True
-
-    def draw_on(self, canvas: Img, x: int, y: int):
-        if self.frames and self.current_frame < len(self.frames):
-            self.frames[self.current_frame].draw_on(canvas, int(x), int(y))
+        # רק מצב שהתחיל בלי זמן צריך את העדכון הראשון - הפריים מחושב לפי הזמן
+        if self.start_ms is None:
+            self.start_ms = now_ms
+
+    def current_frame(self, now_ms: Optional[int]) -> int:
+        """Index of the frame showing at now_ms; the first one before the animation started."""
+        if self.start_ms is None or now_ms is None or not self.frames:
+            return 0
+        return frame_index(max(now_ms - self.start_ms, 0), self.frame_time_ms, len(self.frames), self.loop)
+
+    def is_finished(self, now_ms: Optional[int] = None) -> bool:
+        """A non-looping animation is finished once its last frame has had its time."""
+        if not self.frames:
+            return True
+        if self.loop or self.start_ms is None or now_ms is None:
+            return False
+        return now_ms - self.start_ms >= len(self.frames) * self.frame_time_ms
+
+    def next_change_ms(self, now_ms: int) -> Optional[float]:
+        """When get_img next shows another frame after now_ms, None if it never will."""
+        if self.start_ms is None:
+            return None
+        elapsed = next_frame_ms(max(now_ms - self.start_ms, 0), self.frame_time_ms, len(self.frames), self.loop)
+        return None if elapsed is None else self.start_ms + elapsed
+
+    def get_img(self, now_ms: Optional[int] = None) -> Optional[Img]:
+        if not self.frames:
+            return None
+        return self.frames[self.current_frame(now_ms)]
+
+    def draw_on(self, canvas: Img, x: int, y: int, now_ms: Optional[int] = None):
+        img = self.get_img(now_ms)
+        if img is not None:
+            img.draw_on(canvas, int(x), int(y))
 
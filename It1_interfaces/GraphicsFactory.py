@@ -1,17 +1,23 @@
 from Board import Board
 import pathlib
-from Graphics import Graphics
+from Graphics import Graphics, load_frames
 
 class GraphicsFactory:
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, sprite_cache=None):
         self.board = board
+        self.sprite_cache = sprite_cache
 
-    def create(self, sprites_folder: pathlib.Path, cfg: dict) -> Graphics:
+    def create(self, sprites_folder: pathlib.Path, cfg: dict, frames=None) -> Graphics:
         fps = cfg.get("frames_per_sec", 6.0)
         loop = cfg.get("is_loop", True)
         return Graphics(
             sprites_folder=sprites_folder,
             board=self.board,
             loop=loop,
-            fps=fps
-        )
\ No newline at end of file
+            fps=fps,
+            sprite_cache=self.sprite_cache,
+            frames=frames
+        )
+
+    def load_frames(self, sprites_folder: pathlib.Path):
+        return load_frames(sprites_folder, self.board, self.sprite_cache)
\ No newline at end of file
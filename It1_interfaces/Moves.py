@@ -1,5 +1,30 @@
 import pathlib
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+import numpy as np
+
+# move-type flags, one bitmask per (dr, dc) offset
+CAPTURE = 1        # may land on an enemy piece
+NON_CAPTURE = 2    # may land on an empty cell
+FIRST_ONLY = 4     # the NON_CAPTURE move only as the piece's first move
+
+_TAG_FLAGS = {
+    "": CAPTURE | NON_CAPTURE,
+    "capture": CAPTURE,
+    "non_capture": NON_CAPTURE,
+    "1st": NON_CAPTURE | FIRST_ONLY,
+}
+
+
+def _merge_flags(a: int, b: int) -> int:
+    """Flags of an offset listed twice.
+
+    CAPTURE and NON_CAPTURE add up; FIRST_ONLY restricts the quiet move only,
+    so it stays only if every rule that allows the quiet move has it.
+    """
+    merged = (a | b) & ~FIRST_ONLY
+    if all(f & FIRST_ONLY for f in (a, b) if f & NON_CAPTURE):
+        merged |= (a | b) & FIRST_ONLY
+    return merged
 
 
 class Moves:
@@ -7,6 +32,7 @@ class Moves:
         """Initialize moves with rules from a text file and board dimensions."""
         self.rules: List[Tuple[int, int]] = []
         self.rows, self.cols = dims
+        offset_flags: Dict[Tuple[int, int], int] = {}
 
         # Load move rules from file
         with open(txt_path, "r") as f:
@@ -20,23 +46,70 @@ class Moves:
                         move_part, move_type = line.split(":", 1)
                         dr, dc = map(int, move_part.split(","))
                     else:
+                        move_type = ""
                         dr, dc = map(int, line.split(","))
-                    self.rules.append((dr, dc))
-                except ValueError:
+                    flags = _TAG_FLAGS[move_type.strip()]
+                except (ValueError, KeyError):
                     raise ValueError(f"Invalid line in moves file: {line}")
+                self.rules.append((dr, dc))
+                prev = offset_flags.get((dr, dc))
+                offset_flags[(dr, dc)] = flags if prev is None else _merge_flags(prev, flags)
+
+        self._compile(offset_flags)
+
+    def _compile(self, offset_flags: Dict[Tuple[int, int], int]):
+        """Build the lookup tables used by is_valid_move and get_moves.
 
-    def get_moves(self, r: int, c: int) -> List[Tuple[int, int]]:
+        `_flags[dr + rows - 1, dc + cols - 1]` holds the move-type bits for an
+        offset, so validating a move is one bounds check and one array read.
+        Destinations per origin cell are built on first use and kept as
+        tuples, so repeated enumeration does not allocate.
+        """
+        self._flags = np.zeros((2 * self.rows - 1, 2 * self.cols - 1), dtype=np.uint8)
+        self._offsets: List[Tuple[int, int, int]] = []
+        for (dr, dc), flags in offset_flags.items():
+            if abs(dr) < self.rows and abs(dc) < self.cols:
+                self._flags[dr + self.rows - 1, dc + self.cols - 1] = flags
+                self._offsets.append((dr, dc, flags))
+        self._destinations: Dict[Tuple[int, int], Tuple[Tuple[int, int, int], ...]] = {}
+        self._cells: Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]] = {}
+
+    def offsets(self) -> Tuple[Tuple[int, int, int], ...]:
+        """Every (d_row, d_col, flags) this piece can move by, wherever it stands."""
+        return tuple(self._offsets)
+
+    def get_destinations(self, r: int, c: int) -> Tuple[Tuple[int, int, int], ...]:
+        """All (row, col, flags) reachable from (r, c), ignoring other pieces."""
+        dests = self._destinations.get((r, c))
+        if dests is None:
+            dests = tuple((r + dr, c + dc, flags) for dr, dc, flags in self._offsets
+                          if 0 <= r + dr < self.rows and 0 <= c + dc < self.cols)
+            self._destinations[(r, c)] = dests
+            self._cells[(r, c)] = tuple((nr, nc) for nr, nc, _ in dests)
+        return dests
+
+    def get_moves(self, r: int, c: int) -> Tuple[Tuple[int, int], ...]:
         """Get all possible moves from a given position (r, c)."""
-        moves = []
-        for dr, dc in self.rules:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < self.rows and 0 <= nc < self.cols:
-                moves.append((nr, nc))
-        return moves
-
-    def is_valid_move(self, start_cell: Tuple[int, int], end_cell: Tuple[int, int]) -> bool:
-        """Check if a move from start_cell to end_cell is valid."""
+        cells = self._cells.get((r, c))
+        if cells is None:
+            self.get_destinations(r, c)
+            cells = self._cells[(r, c)]
+        return cells
+
+    def get_move_flags(self, start_cell: Tuple[int, int], end_cell: Tuple[int, int]) -> int:
+        """Move-type flags for start_cell -> end_cell, 0 if it is not a move."""
         r1, c1 = start_cell
         r2, c2 = end_cell
-        dr, dc = r2 - r1, c2 - c1
-        return (dr, dc) in self.rules
\ No newline at end of file
+        if not (0 <= r1 < self.rows and 0 <= c1 < self.cols):
+            return 0
+        if not (0 <= r2 < self.rows and 0 <= c2 < self.cols):
+            return 0
+        return int(self._flags[r2 - r1 + self.rows - 1, c2 - c1 + self.cols - 1])
+
+    def is_valid_move(self, start_cell: Tuple[int, int], end_cell: Tuple[int, int],
+                      is_capture: bool = False, is_first_move: bool = False) -> bool:
+        """Check if a move from start_cell to end_cell is valid."""
+        flags = self.get_move_flags(start_cell, end_cell)
+        if not flags & (CAPTURE if is_capture else NON_CAPTURE):
+            return False
+        return is_capture or is_first_move or not flags & FIRST_ONLY
\ No newline at end of file
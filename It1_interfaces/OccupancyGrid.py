@@ -0,0 +1,100 @@
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from Bitboard import BitboardPosition
+
+EMPTY = -1
+
+
+class OccupancyGrid:
+    """Cell -> piece index kept up to date by the pieces themselves.
+
+    `grid` holds a slot number per board cell (EMPTY when free); the slot
+    points into `_slots`.  Pieces are also bucketed by player and by state
+    name so those queries don't have to scan the board, and `position`
+    mirrors the board as bitboards for blocking-aware move generation.
+    """
+
+    def __init__(self, H_cells: int, W_cells: int):
+        self.grid = np.full((H_cells, W_cells), EMPTY, dtype=np.int32)
+        self._slots: List[Optional[object]] = []
+        self._free: List[int] = []
+        self._slot_of: Dict[str, int] = {}
+        self._by_player: Dict[bool, Set[str]] = {True: set(), False: set()}
+        self._by_state: Dict[Optional[str], Set[str]] = {}
+        self._pieces: Dict[str, object] = {}
+        self.position = BitboardPosition(H_cells, W_cells)
+
+    def __len__(self):
+        return len(self._pieces)
+
+    def add(self, piece):
+        if piece.piece_id in self._pieces:
+            self.remove(piece)
+        slot = self._free.pop() if self._free else len(self._slots)
+        if slot == len(self._slots):
+            self._slots.append(piece)
+        else:
+            self._slots[slot] = piece
+        self._slot_of[piece.piece_id] = slot
+        self._pieces[piece.piece_id] = piece
+        self._by_player[piece.player_one].add(piece.piece_id)
+        self._by_state.setdefault(piece.state_name, set()).add(piece.piece_id)
+        self._place(slot, piece.cell)
+        if piece.moves is not None:
+            self.position.register_type(piece.piece_type, piece.moves)
+        self.position.place(piece.piece_type, piece.player_one, piece.cell)
+        piece.occupancy = self
+
+    def remove(self, piece):
+        slot = self._slot_of.pop(piece.piece_id, None)
+        if slot is None:
+            return
+        self._clear(slot, piece.cell)
+        self.position.remove(piece.piece_type, piece.player_one, piece.cell)
+        self._slots[slot] = None
+        self._free.append(slot)
+        del self._pieces[piece.piece_id]
+        self._by_player[piece.player_one].discard(piece.piece_id)
+        self._by_state.get(piece.state_name, set()).discard(piece.piece_id)
+        if piece.occupancy is self:
+            piece.occupancy = None
+
+    def move(self, piece, old_cell: Tuple[int, int], new_cell: Tuple[int, int]):
+        slot = self._slot_of.get(piece.piece_id)
+        if slot is None:
+            return
+        self._clear(slot, old_cell)
+        self._place(slot, new_cell)
+        self.position.move(piece.piece_type, piece.player_one, old_cell, new_cell)
+
+    def set_state(self, piece, old_state: Optional[str], new_state: Optional[str]):
+        if piece.piece_id not in self._pieces:
+            return
+        self._by_state.get(old_state, set()).discard(piece.piece_id)
+        self._by_state.setdefault(new_state, set()).add(piece.piece_id)
+
+    def get(self, row: int, col: int):
+        """The piece standing on (row, col), or None."""
+        if not self._in_bounds((row, col)):
+            return None
+        slot = self.grid[row, col]
+        return None if slot == EMPTY else self._slots[slot]
+
+    def pieces_of_player(self, player_one: bool) -> List:
+        return [self._pieces[pid] for pid in self._by_player[player_one]]
+
+    def pieces_in_state(self, state_name: str) -> List:
+        return [self._pieces[pid] for pid in self._by_state.get(state_name, ())]
+
+    def _place(self, slot: int, cell):
+        if cell is not None and self._in_bounds(cell):
+            self.grid[cell[0], cell[1]] = slot
+
+    def _clear(self, slot: int, cell):
+        # only clear the cell if it still belongs to this piece - another
+        # piece may have landed on it in the meantime
+        if cell is not None and self._in_bounds(cell) and self.grid[cell[0], cell[1]] == slot:
+            self.grid[cell[0], cell[1]] = EMPTY
+
+    def _in_bounds(self, cell) -> bool:
+        return 0 <= cell[0] < self.grid.shape[0] and 0 <= cell[1] < self.grid.shape[1]
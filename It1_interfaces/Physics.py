@@ -1,9 +1,15 @@
 from abc import ABC, abstractmethod
 from Command import Command
-import time
+from Trajectory import trajectories_for
 
 class Physics(ABC):
     """מחלקת בסיס לפיזיקה"""
+
+    # כמה זמן המצב נמשך עד שהפיזיקה מסיימת (None - לא מסתיים לבד)
+    DURATION_MS = None
+    # חוקי תפיסה של המצב
+    CAN_CAPTURE = False
+    CAN_BE_CAPTURED = True
     
     def __init__(self, initial_pos: tuple, board, speed_m_s: float = 1.0):
         self.initial_pos = initial_pos
@@ -13,7 +19,10 @@ class Physics(ABC):
         self.finished = False
         self.command = None
         self.start_time_ms = None
+        self.finished_ms = None
+        self.last_update_ms = None
         self.next_state_when_finished = "idle"
+        self._auto_command = None
     
     @abstractmethod
     def reset(self, command: Command):
@@ -32,15 +41,35 @@ class Physics(ABC):
     def set_pos(self, pos: tuple):
         """הגדרת מיקום חדש"""
         self.current_pos = pos
+
+    def get_pos_pix(self) -> tuple:
+        """המיקום הנוכחי בפיקסלים (x, y) - המיקום הלוגי הוא (שורה, עמודה)"""
+        row, col = self.current_pos
+        return col * self.board.cell_W_pix, row * self.board.cell_H_pix
     
     def is_finished(self) -> bool:
         """בדיקה האם הפיזיקה סיימה"""
         return self.finished
     
+    def _finish(self, end_ms: int):
+        """סימון סיום - נשמר גם זמן הסיום המדויק (זמן משחק)"""
+        self.finished = True
+        self.finished_ms = end_ms
+
+    @staticmethod
+    def _start_time(command: Command):
+        """המצב מתחיל בזמן הפקודה; בלי זמן - בעדכון הראשון"""
+        ts = getattr(command, "timestamp_ms", None)
+        return ts if isinstance(ts, (int, float)) else None
+
     def get_command(self) -> Command:
-        """החזרת פקודה למעבר מצב אם הפיזיקה סיימה"""
+        """החזרת פקודה למעבר מצב אם הפיזיקה סיימה - אותה פקודה בכל קריאה"""
         if self.finished and self.next_state_when_finished:
-            return Command("auto", self.next_state_when_finished, {}, timestamp_ms=time.time_ns() // 1000000)
+            cmd = self._auto_command
+            if cmd is None or cmd.type != self.next_state_when_finished or cmd.timestamp_ms != self.finished_ms:
+                cmd = Command("auto", self.next_state_when_finished, {}, timestamp_ms=self.finished_ms)
+                self._auto_command = cmd
+            return cmd
         return None
     
     def copy(self) -> 'Physics':
@@ -53,11 +82,11 @@ class Physics(ABC):
     
     def can_be_captured(self) -> bool:
         """האם הpiece יכול להיתפס במצב זה"""
-        return True
+        return self.CAN_BE_CAPTURED
     
     def can_capture(self) -> bool:
         """האם הpiece יכול לתפוס במצב זה"""
-        return False
+        return self.CAN_CAPTURE
 
 class IdlePhysics(Physics):
     """פיזיקה למצב idle - לא זז"""
@@ -65,21 +94,20 @@ class IdlePhysics(Physics):
     def reset(self, command: Command):
         self.command = command
         self.finished = False
-        self.start_time_ms = None
+        self.start_time_ms = self._start_time(command)
     
     def update(self, now_ms: int):
         # במצב idle הpiece לא זז ולא עושה כלום
         # הוא מוכן לקבל פקודות חדשות
         pass
-    
-    def can_be_captured(self) -> bool:
-        return True
-    
-    def can_capture(self) -> bool:
-        return False
 
 class MovePhysics(Physics):
     """פיזיקה למצב move - תנועה בין משבצות"""
+
+    # משך התנועה נגזר מהמרחק ומהמהירות; זה רק למצב בלי מהירות מוגדרת
+    DURATION_MS = 1000
+    CAN_CAPTURE = True
+    CAN_BE_CAPTURED = False
     
     def __init__(self, initial_pos: tuple, board, speed_m_s: float = 1.0):
         super().__init__(initial_pos, board, speed_m_s)
@@ -89,38 +117,54 @@ class MovePhysics(Physics):
     def reset(self, command: Command):
         self.command = command
         self.finished = False
-        self.start_time_ms = None
+        self.start_time_ms = self._start_time(command)
         # נניח שהפקודה מכילה את המיקום היעד
         if "target" in command.params:
             self.target_pos = command.params["target"]
         else:
             self.target_pos = self.current_pos
     
+    def trajectory(self):
+        """המסלול המדוגם של התנועה הנוכחית (None - אין לאן לזוז)"""
+        if self.target_pos is None or tuple(self.target_pos) == tuple(self.current_pos):
+            return None
+        d_row = self.target_pos[0] - self.current_pos[0]
+        d_col = self.target_pos[1] - self.current_pos[1]
+        return trajectories_for(self.board, self.speed, self.DURATION_MS).move(d_row, d_col)
+
     def update(self, now_ms: int):
+        self.last_update_ms = now_ms
+        if self.finished:
+            return
         if self.start_time_ms is None:
             self.start_time_ms = now_ms
-            return
         
-        if self.target_pos is None or self.current_pos == self.target_pos:
-            self.finished = True
+        trajectory = self.trajectory()
+        if trajectory is None:
+            self._finish(self.start_time_ms)
             return
         
-        # חישוב המרחק והזמן הנדרש
-        elapsed_time_s = (now_ms - self.start_time_ms) / 1000.0
-        
-        # תנועה פשוטה - נניח שזה תמיד לוקח שנייה אחת לעבור משבצת
-        if elapsed_time_s >= 1.0:
+        end_ms = self.start_time_ms + trajectory.duration_ms
+        if now_ms >= end_ms:
             self.current_pos = self.target_pos
-            self.finished = True
-    
-    def can_be_captured(self) -> bool:
-        return False
-    
-    def can_capture(self) -> bool:
-        return True
+            self._finish(end_ms)
+
+    def get_pos_pix(self) -> tuple:
+        """באמצע תנועה - המיקום על המסלול בזמן העדכון האחרון"""
+        x, y = super().get_pos_pix()
+        trajectory = None if self.finished or self.start_time_ms is None else self.trajectory()
+        if trajectory is not None and self.last_update_ms is not None:
+            dx, dy = trajectory.offset_at(self.last_update_ms - self.start_time_ms)
+            x, y = x + dx, y + dy
+        return x, y
 
 class JumpPhysics(Physics):
     """פיזיקה למצב jump - קפיצה באותה משבצת"""
+
+    # קפיצה לוקחת חצי שנייה
+    DURATION_MS = 500
+    CAN_CAPTURE = True
+    CAN_BE_CAPTURED = False
     
     def __init__(self, initial_pos: tuple, board, speed_m_s: float = 1.0):
         super().__init__(initial_pos, board, speed_m_s)
@@ -129,76 +173,74 @@ class JumpPhysics(Physics):
     def reset(self, command: Command):
         self.command = command
         self.finished = False
-        self.start_time_ms = None
+        self.start_time_ms = self._start_time(command)
     
     def update(self, now_ms: int):
+        self.last_update_ms = now_ms
+        if self.finished:
+            return
         if self.start_time_ms is None:
             self.start_time_ms = now_ms
-            return
         
-        # קפיצה לוקחת חצי שנייה
-        elapsed_time_s = (now_ms - self.start_time_ms) / 1000.0
-        if elapsed_time_s >= 0.5:
-            self.finished = True
-    
-    def can_be_captured(self) -> bool:
-        return False
-    
-    def can_capture(self) -> bool:
-        return True
+        end_ms = self.start_time_ms + self.DURATION_MS
+        if now_ms >= end_ms:
+            self._finish(end_ms)
+
+    def get_pos_pix(self) -> tuple:
+        """באמצע קפיצה - הגובה על הקשת בזמן העדכון האחרון"""
+        x, y = super().get_pos_pix()
+        if not self.finished and self.start_time_ms is not None and self.last_update_ms is not None:
+            arc = trajectories_for(self.board, self.speed, self.DURATION_MS).jump(self.DURATION_MS)
+            dx, dy = arc.offset_at(self.last_update_ms - self.start_time_ms)
+            x, y = x + dx, y + dy
+        return x, y
 
 class ShortRestPhysics(Physics):
     """פיזיקה למצב short_rest - מנוחה קצרה אחרי קפיצה"""
+
+    DURATION_MS = 1000  # שנייה אחת של מנוחה
     
     def __init__(self, initial_pos: tuple, board, speed_m_s: float = 1.0):
         super().__init__(initial_pos, board, speed_m_s)
-        self.rest_duration_s = 1.0  # שנייה אחת של מנוחה
+        self.rest_duration_s = self.DURATION_MS / 1000.0
         self.next_state_when_finished = "idle"
     
     def reset(self, command: Command):
         self.command = command
         self.finished = False
-        self.start_time_ms = None
+        self.start_time_ms = self._start_time(command)
     
     def update(self, now_ms: int):
+        if self.finished:
+            return
         if self.start_time_ms is None:
             self.start_time_ms = now_ms
-            return
         
-        elapsed_time_s = (now_ms - self.start_time_ms) / 1000.0
-        if elapsed_time_s >= self.rest_duration_s:
-            self.finished = True
-    
-    def can_be_captured(self) -> bool:
-        return True
-    
-    def can_capture(self) -> bool:
-        return False
+        end_ms = self.start_time_ms + int(self.rest_duration_s * 1000)
+        if now_ms >= end_ms:
+            self._finish(end_ms)
 
 class LongRestPhysics(Physics):
     """פיזיקה למצב long_rest - מנוחה ארוכה אחרי תנועה"""
+
+    DURATION_MS = 2000  # שתי שניות של מנוחה
     
     def __init__(self, initial_pos: tuple, board, speed_m_s: float = 1.0):
         super().__init__(initial_pos, board, speed_m_s)
-        self.rest_duration_s = 2.0  # שתי שניות של מנוחה
+        self.rest_duration_s = self.DURATION_MS / 1000.0
         self.next_state_when_finished = "idle"
     
     def reset(self, command: Command):
         self.command = command
         self.finished = False
-        self.start_time_ms = None
+        self.start_time_ms = self._start_time(command)
     
     def update(self, now_ms: int):
+        if self.finished:
+            return
         if self.start_time_ms is None:
             self.start_time_ms = now_ms
-            return
         
-        elapsed_time_s = (now_ms - self.start_time_ms) / 1000.0
-        if elapsed_time_s >= self.rest_duration_s:
-            self.finished = True
-    
-    def can_be_captured(self) -> bool:
-        return True
-    
-    def can_capture(self) -> bool:
-        return False
\ No newline at end of file
+        end_ms = self.start_time_ms + int(self.rest_duration_s * 1000)
+        if now_ms >= end_ms:
+            self._finish(end_ms)
\ No newline at end of file
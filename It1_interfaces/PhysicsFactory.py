@@ -2,6 +2,18 @@ from Physics import Physics, IdlePhysics, MovePhysics, JumpPhysics, ShortRestPhy
 from Command import Command
 from Board import Board
 
+# סוג הפיזיקה לפי שם המצב
+PHYSICS_BY_STATE = {
+    "idle": IdlePhysics,
+    "move": MovePhysics,
+    "jump": JumpPhysics,
+    "short_rest": ShortRestPhysics,
+    "long_rest": LongRestPhysics,
+}
+
+def physics_class_for(state_name: str) -> type:
+    return PHYSICS_BY_STATE.get(state_name, IdlePhysics)
+
 class PhysicsFactory:
     """מפעל ליצירת אובייקטי Physics לפי סוג המצב"""
     
@@ -14,20 +26,8 @@ class PhysicsFactory:
         speed_m_s = config.get("speed_m_per_sec", 1.0)
         physics_type = command.type
         
-        # יצירת הפיזיקה המתאימה לפי סוג המצב
-        if physics_type == "idle":
-            physics = IdlePhysics(initial_pos, self.board, speed_m_s)
-        elif physics_type == "move":
-            physics = MovePhysics(initial_pos, self.board, speed_m_s)
-        elif physics_type == "jump":
-            physics = JumpPhysics(initial_pos, self.board, speed_m_s)
-        elif physics_type == "short_rest":
-            physics = ShortRestPhysics(initial_pos, self.board, speed_m_s)
-        elif physics_type == "long_rest":
-            physics = LongRestPhysics(initial_pos, self.board, speed_m_s)
-        else:
-            # ברירת מחדל - idle physics
-            physics = IdlePhysics(initial_pos, self.board, speed_m_s)
+        # יצירת הפיזיקה המתאימה לפי סוג המצב (ברירת מחדל - idle physics)
+        physics = physics_class_for(physics_type)(initial_pos, self.board, speed_m_s)
         
         # הגדרת המצב הבא מתוך ההגדרות
         if "next_state_when_finished" in config:
@@ -1,33 +1,67 @@
-from typing import Tuple
+from typing import Optional, Tuple
 from img import Img
 from Command import Command
 from State import StateManager
 import copy
 from Moves import Moves
 class Piece:
+    __slots__ = ("piece_id", "piece_type", "player_one", "state_manager", "moves",
+                 "cell", "state_name", "selected", "move_count", "occupancy")
+
+    # state_manager הוא PieceRuntime, או StateManager שהורכב ידנית מאובייקטי State - לשניהם אותו ממשק
     def __init__(self, piece_id: str, player_one: bool, state_manager: StateManager, moves: Moves):
         self.piece_id = piece_id
+        self.piece_type = piece_id.split("_")[0]
         self.player_one = player_one
         self.state_manager = state_manager
         self.moves = moves        
-        self.cell: Tuple[int, int] = self.state_manager.current_state._physics.get_pos()
+        self.cell: Tuple[int, int] = tuple(self.state_manager.get_position())
+        self.state_name: Optional[str] = self.state_manager.state_name
         self.selected = False
         self.move_count = 0
+        self.occupancy = None
 
     def clone(self):
         new_sm = self.state_manager.copy()
-        return Piece(self.piece_id, self.player_one, new_sm)
+        return Piece(self.piece_id, self.player_one, new_sm, self.moves)
 
     def draw_on_board(self, canvas: Img):
-        current_physics = self.state_manager.current_state._physics
-        current_graphics = self.state_manager.current_state._graphics
-        
-        pos_pix = current_physics.get_pos_pix()
-        current_graphics.draw_on(canvas, pos_pix[0], pos_pix[1])
+        sprite, x, y = self.get_draw_info()
+        if sprite is not None:
+            sprite.draw_on(canvas, x, y)
+
+    def get_draw_info(self, now_ms: Optional[int] = None) -> Tuple[Optional[Img], int, int]:
+        """The sprite frame this piece shows at now_ms (default: its last update) and its pixel position."""
+        return self.state_manager.get_draw_info(now_ms)
 
     def on_command(self, cmd: Command):
+        was_moving = self.state_name == "move"
         self.state_manager.process_command(cmd)
+        # רק פקודת move שהכלי באמת התחיל לבצע נספרת (בקפיצה או במנוחה היא נדחית)
+        if cmd.type == "move" and not was_moving and self.state_manager.state_name == "move":
+            self.move_count += 1
+        self._sync()
 
     def update(self, now_ms: int):
         self.state_manager.update(now_ms)
-        self.cell = self.state_manager.current_state._physics.get_pos()
\ No newline at end of file
+        self._sync()
+
+    def can_capture(self) -> bool:
+        return self.state_manager.can_capture()
+
+    def can_be_captured(self) -> bool:
+        return self.state_manager.can_be_captured()
+
+    def _sync(self):
+        """עדכון התא והמצב השמורים (וה-occupancy) לפי מכונת המצבים"""
+        new_cell = tuple(self.state_manager.get_position())
+        if new_cell != self.cell:
+            old_cell, self.cell = self.cell, new_cell
+            if self.occupancy is not None:
+                self.occupancy.move(self, old_cell, new_cell)
+
+        state_name = self.state_manager.state_name
+        if state_name != self.state_name:
+            old_state, self.state_name = self.state_name, state_name
+            if self.occupancy is not None:
+                self.occupancy.set_state(self, old_state, self.state_name)
\ No newline at end of file
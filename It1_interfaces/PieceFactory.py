@@ -1,52 +1,59 @@
-from typing import Tuple, Dict
+from typing import Iterable, Optional, Tuple, Dict
 from Piece import Piece
 import pathlib
-import numpy as np
-from State import StateManager
 from PhysicsFactory import PhysicsFactory
 from GraphicsFactory import GraphicsFactory
 from Board import Board
 from Moves import Moves
+from SpriteLoader import SpriteLoader
+from PieceType import PieceType, load_piece_type
+from PieceRuntime import PieceRuntime
 
 class PieceFactory:
-    def __init__(self, board: Board, pieces_root: pathlib.Path):
+    def __init__(self, board: Board, pieces_root: pathlib.Path, sprite_cache=None):
         self.board = board
         self.pieces_root = pieces_root
         self.physics_factory = PhysicsFactory(self.board)
-        self.graphics_factory = GraphicsFactory(self.board)
-        self.state_manager_templates: Dict[str, StateManager] = {}
+        self.graphics_factory = GraphicsFactory(self.board, sprite_cache)
         self.moves_templates: Dict[str, Moves] = {}
+        self.piece_types: Dict[str, PieceType] = {}
 
-    def create_piece(self, piece_id: str, start_cell: Tuple[int, int]) -> Piece:
-        unique_piece_id = f"{piece_id}_{start_cell[0]}_{start_cell[1]}"
-        print(f"Creating piece with id {unique_piece_id} and type {piece_id}")
-        piece_type = piece_id.split("_")[0]
-        piece_type_folder = self.pieces_root / piece_type
+    def preload(self, piece_types: Iterable[str], max_workers: Optional[int] = None,
+                background: bool = False) -> SpriteLoader:
+        """Load the sprites of every given piece type on a thread pool.
 
+        All frames of all types and states are queued before any template is
+        built, so the pool stays busy across types.  With background=True this
+        returns as soon as the templates exist: their frames fill in while the
+        game is already running, a frame draws nothing until it arrives, and
+        a frame that fails to load is reported on stdout.  Call wait() on the
+        returned loader to block until everything is in.
 
-        # Check if the piece type already exists in the templates dictionary
-        if piece_type not in self.state_manager_templates:
-            print(f"Loading state manager template for piece type {piece_type}")
-            sm_template = StateManager.from_config(
-                piece_folder=piece_type_folder,
-                board=self.board,
-                physics_factory=self.physics_factory,
-                graphics_factory=self.graphics_factory
-            )
-            self.state_manager_templates[piece_type] = sm_template
+        The loader only serves this call: the graphics factory gets its own
+        sprite cache back once the templates are built, and the loader's
+        threads exit as soon as the queued frames are loaded.
+        """
+        piece_types = list(dict.fromkeys(piece_types))
+        sprite_cache = self.graphics_factory.sprite_cache
+        loader = SpriteLoader(max_workers, sprite_cache=sprite_cache, streaming=background)
+        size = (self.board.cell_W_pix, self.board.cell_H_pix)
+        for piece_type in piece_types:
+            for png in sorted((self.pieces_root / piece_type / "states").glob("*/sprites/*.png")):
+                loader.submit(png, size=size)
 
+        self.graphics_factory.sprite_cache = loader
+        try:
+            for piece_type in piece_types:
+                self._load_type(piece_type)
+        finally:
+            self.graphics_factory.sprite_cache = sprite_cache
+            loader.shutdown(wait=not background)
+        if not background:
+            loader.wait()
+        return loader
 
-
-        # תמיד יוצרים עותק חדש של ה־StateManager (עמוק!)
-        new_sm = self.state_manager_templates[piece_type].copy()
-
-        # קביעת המיקום ההתחלתי במצב ההתחלתי
-        initial_state = new_sm.states[new_sm.current_state.name]
-        initial_state._physics.cell = start_cell
-        initial_state._physics.current_pos_pix = np.array(
-            [start_cell[1] * self.board.cell_W_pix, start_cell[0] * self.board.cell_H_pix],
-            dtype=float
-        )
+    def _load_type(self, piece_type: str) -> Moves:
+        piece_type_folder = self.pieces_root / piece_type
 
         # טעינת Moves מה-cached או יצירה חדשה
         if piece_type not in self.moves_templates:
@@ -54,6 +61,21 @@ class PieceFactory:
             self.moves_templates[piece_type] = Moves(moves_config_path, (self.board.H_cells, self.board.W_cells))
 
         moves = self.moves_templates[piece_type]
-        is_player_one = "W" in piece_id
 
-        return Piece(piece_id, is_player_one, new_sm, moves)
+        # Check if the piece type already exists in the types dictionary
+        if piece_type not in self.piece_types:
+            print(f"Loading piece type {piece_type}")
+            self.piece_types[piece_type] = load_piece_type(piece_type_folder, moves, self.graphics_factory)
+        return moves
+
+    def create_piece(self, piece_id: str, start_cell: Tuple[int, int]) -> Piece:
+        unique_piece_id = f"{piece_id}_{start_cell[0]}_{start_cell[1]}"
+        piece_type = piece_id.split("_")[0]
+        moves = self._load_type(piece_type)
+
+        # לכל כלי רק רשומת ריצה קטנה - המצבים, הפריימים והמעברים משותפים לכל הסוג
+        runtime = PieceRuntime(self.piece_types[piece_type], self.board, start_cell)
+
+        is_player_one = "W" in piece_type
+
+        return Piece(unique_piece_id, is_player_one, runtime, moves)
\ No newline at end of file
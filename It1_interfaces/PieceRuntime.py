@@ -0,0 +1,169 @@
+from typing import Optional, Tuple
+
+from Command import Command
+from Graphics import frame_index, next_frame_ms
+from img import Img
+from Physics import MovePhysics
+from PieceType import PieceType
+from Trajectory import Trajectory
+
+Cell = Tuple[int, int]
+
+
+class PieceRuntime:
+    """The per-piece half of a state machine: which state, since when, and where.
+
+    This is the state machine of every piece built from a PieceType -
+    PieceFactory creates one per piece and StateManager.from_type returns
+    one - so new piece behaviour belongs here.  Transitions, timings and
+    sprite frames are all read from the shared PieceType, so a piece costs a
+    few fields however many states its type has.  A state starts at its
+    command's timestamp, or exactly when the state before it ended, and
+    update(now_ms) runs every transition due by now_ms, so timing does not
+    depend on how often update is called.  Moves and jumps are drawn along
+    their type's precomputed trajectories.
+    """
+
+    __slots__ = ("piece_type", "board", "state", "position", "target",
+                 "state_start_ms", "last_update_ms", "finished")
+
+    def __init__(self, piece_type: PieceType, board, position: Cell, state_name: Optional[str] = None):
+        self.piece_type = piece_type
+        self.board = board
+        self.state = piece_type.states[state_name or piece_type.initial_state]
+        self.position = tuple(position)
+        self.target: Optional[Cell] = None
+        self.state_start_ms: Optional[int] = None
+        self.last_update_ms: Optional[int] = None
+        self.finished = False
+
+    @property
+    def state_name(self) -> str:
+        return self.state.name
+
+    def process_command(self, command: Command):
+        next_state = self.state.transitions.get(command.type)
+        if next_state is not None:
+            self._enter(next_state, command, command.timestamp_ms)
+
+    def update(self, now_ms: int):
+        self.last_update_ms = now_ms
+        if self.state_start_ms is None:
+            self.state_start_ms = now_ms    # command without a timestamp
+        # a chain of zero-length states longer than the type itself is a loop
+        for _ in range(len(self.piece_type.states) + 1):
+            end_ms = self.end_time_ms()
+            if end_ms is None or end_ms > now_ms:
+                return
+            if self.target is not None:
+                self.position = self.target
+            next_state = self.state.next_state_when_finished
+            if next_state not in self.state.transitions:
+                self.finished = True
+                return
+            self._enter(next_state, None, end_ms)
+
+    def end_time_ms(self) -> Optional[int]:
+        """When the current state finishes, None if it does not finish by itself."""
+        if self.finished or self.state_start_ms is None:
+            return None
+        duration_ms = self.duration_ms()
+        if duration_ms is None:
+            return None
+        return self.state_start_ms + duration_ms
+
+    def duration_ms(self) -> Optional[int]:
+        """How long the current state lasts, None if it does not end by itself."""
+        if issubclass(self.state.physics_class, MovePhysics):
+            trajectory = self._trajectory()
+            return 0 if trajectory is None else trajectory.duration_ms    # nowhere to go
+        return self.state.duration_ms
+
+    def current_move(self) -> Optional[Tuple[Cell, int, Trajectory]]:
+        """(start cell, start time, trajectory) of the move in progress, None when not moving."""
+        if self.finished or self.state_start_ms is None or not issubclass(self.state.physics_class, MovePhysics):
+            return None
+        trajectory = self._trajectory()
+        if trajectory is None:
+            return None
+        return self.position, self.state_start_ms, trajectory
+
+    def can_capture(self) -> bool:
+        return self.state.can_capture
+
+    def can_be_captured(self) -> bool:
+        return self.state.can_be_captured
+
+    def _trajectory(self) -> Optional[Trajectory]:
+        """The sampled path of the current move or jump, None when standing still."""
+        trajectories = self.state.trajectories
+        if trajectories is None:
+            return None
+        if issubclass(self.state.physics_class, MovePhysics):
+            if self.target is None or self.target == self.position:
+                return None
+            return trajectories.move(self.target[0] - self.position[0], self.target[1] - self.position[1])
+        return trajectories.jump(self.state.duration_ms)
+
+    def next_deadline_ms(self) -> Optional[float]:
+        """Earliest game time at which update() can change anything, None if never."""
+        if self.state_start_ms is None:
+            return float("-inf")    # the clock starts at the next update
+        return self.end_time_ms()
+
+    def next_change_ms(self, now_ms: int) -> Optional[float]:
+        """When get_draw_info next shows something else after now_ms, None if not before a command.
+
+        While the piece is in motion that is now_ms itself; otherwise the next
+        sprite frame.  State transitions are next_deadline_ms's business.
+        """
+        if self.state_start_ms is None:
+            return None
+        elapsed_ms = max(now_ms - self.state_start_ms, 0)
+        trajectory = None if self.finished else self._trajectory()
+        if trajectory is not None and elapsed_ms < trajectory.duration_ms:
+            return now_ms
+        elapsed = next_frame_ms(elapsed_ms, self.state.frame_ms, len(self.state.frames), self.state.loop)
+        return None if elapsed is None else self.state_start_ms + elapsed
+
+    def _enter(self, state_name: str, command: Optional[Command], start_ms: Optional[int]):
+        self.state = self.piece_type.states[state_name]
+        if command is not None and "target" in command.params and issubclass(self.state.physics_class, MovePhysics):
+            self.target = tuple(command.params["target"])
+        else:
+            self.target = None
+        self.state_start_ms = start_ms
+        self.finished = False
+
+    def get_position(self) -> Cell:
+        return self.position
+
+    def set_position(self, pos: Cell):
+        self.position = tuple(pos)
+
+    def get_draw_info(self, now_ms: Optional[int] = None) -> Tuple[Optional[Img], int, int]:
+        """The sprite frame showing at now_ms (default: the last update) and its pixel position."""
+        row, col = self.position
+        x, y = col * self.board.cell_W_pix, row * self.board.cell_H_pix
+        if now_ms is None:
+            now_ms = self.last_update_ms
+        if self.state_start_ms is None or now_ms is None:
+            frames = self.state.frames
+            return (frames[0] if frames else None), x, y
+
+        elapsed_ms = max(now_ms - self.state_start_ms, 0)
+        trajectory = None if self.finished else self._trajectory()
+        if trajectory is not None:
+            dx, dy = trajectory.offset_at(elapsed_ms)
+            x, y = x + dx, y + dy
+        frames = self.state.frames
+        if not frames:
+            return None, x, y
+        index = frame_index(elapsed_ms, self.state.frame_ms, len(frames), self.state.loop)
+        return frames[index], x, y
+
+    def copy(self) -> "PieceRuntime":
+        new = PieceRuntime.__new__(PieceRuntime)
+        for name in PieceRuntime.__slots__:
+            setattr(new, name, getattr(self, name))
+        return new
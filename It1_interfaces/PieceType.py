@@ -0,0 +1,137 @@
+import json
+import pathlib
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from img import Img
+from Graphics import frame_time_ms
+from Moves import Moves
+from Physics import JumpPhysics, MovePhysics
+from PhysicsFactory import physics_class_for
+from Trajectory import Trajectories, trajectories_for
+
+# הגדרות ברירת מחדל לכלי שאין לו config.json משלו
+DEFAULT_PIECE_CONFIG = {
+    "initial_state": "idle",
+    "states": {
+        "idle": {"transitions": {"move": "move", "jump": "jump"}},
+        "move": {},
+        "jump": {},
+        "long_rest": {},
+        "short_rest": {},
+    },
+}
+
+# הגדרות ברירת מחדל למצב שאין לו config.json
+DEFAULT_STATE_CONFIG = {
+    "physics": {"speed_m_per_sec": 0.0, "next_state_when_finished": "idle"},
+    "graphics": {"frames_per_sec": 6, "is_loop": True},
+}
+
+
+@dataclass(frozen=True)
+class StateDef:
+    """One state of a piece type, shared by every piece of that type."""
+    name: str
+    physics: Mapping[str, object]
+    graphics: Mapping[str, object]
+    frames: Tuple[Img, ...]
+    # command type -> next state name, including the automatic transition
+    # (Physics.get_command() issues a command named after the next state)
+    transitions: Mapping[str, str]
+    next_state_when_finished: Optional[str]
+    # behaviour of the state, taken from the Physics class it maps to and
+    # the graphics config
+    physics_class: type
+    duration_ms: Optional[float]
+    can_capture: bool
+    can_be_captured: bool
+    frame_ms: float
+    loop: bool
+    # sampled positions of move / jump states, None for states that stay put
+    trajectories: Optional[Trajectories] = None
+
+
+@dataclass(frozen=True)
+class PieceType:
+    """Everything a piece type's config folder says, parsed and checked once."""
+    name: str
+    initial_state: str
+    states: Mapping[str, StateDef]
+    moves: Moves
+
+
+def load_piece_type(piece_folder: pathlib.Path, moves: Moves, graphics_factory) -> PieceType:
+    """Read a piece folder's configs and sprites into a PieceType.
+
+    Each config.json is read exactly once, and the trajectory of every move
+    the type's moves allow is built here rather than while drawing.  Raises
+    ValueError listing every problem found: a state without a folder, an
+    unknown initial state, or a transition to a state that does not exist.
+    """
+    piece_folder = pathlib.Path(piece_folder)
+    config_path = piece_folder / "config.json"
+    piece_config = _read_json(config_path) if config_path.exists() else DEFAULT_PIECE_CONFIG
+
+    states_folder = piece_folder / "states"
+    if not states_folder.exists():
+        raise FileNotFoundError(f"States folder not found: {states_folder}")
+
+    initial_state = piece_config["initial_state"]
+    states_config = piece_config["states"]
+    problems = []
+    if initial_state not in states_config:
+        problems.append(f"initial state '{initial_state}' is not defined")
+
+    states = {}
+    for state_name, state_config in states_config.items():
+        state_folder = states_folder / state_name
+        if not state_folder.exists():
+            problems.append(f"state '{state_name}' has no folder {state_folder}")
+            continue
+        state_config_path = state_folder / "config.json"
+        specific = _read_json(state_config_path) if state_config_path.exists() else DEFAULT_STATE_CONFIG
+
+        transitions = dict(state_config.get("transitions", {}))
+        next_state = specific["physics"].get("next_state_when_finished")
+        if next_state:
+            transitions[next_state] = next_state
+        for command_type, target in transitions.items():
+            if target not in states_config:
+                problems.append(f"state '{state_name}' goes to unknown state '{target}' on '{command_type}'")
+
+        physics_class = physics_class_for(state_name)
+        trajectories = None
+        if issubclass(physics_class, (MovePhysics, JumpPhysics)):
+            speed = specific["physics"].get("speed_m_per_sec", 1.0)
+            trajectories = trajectories_for(graphics_factory.board, speed, physics_class.DURATION_MS)
+            if issubclass(physics_class, MovePhysics) and moves is not None:
+                for d_row, d_col, _ in moves.offsets():
+                    trajectories.move(d_row, d_col)
+            elif issubclass(physics_class, JumpPhysics):
+                trajectories.jump(physics_class.DURATION_MS)
+        states[state_name] = StateDef(
+            name=state_name,
+            physics=MappingProxyType(dict(specific["physics"])),
+            graphics=MappingProxyType(dict(specific["graphics"])),
+            frames=tuple(graphics_factory.load_frames(state_folder / "sprites")),
+            transitions=MappingProxyType(transitions),
+            next_state_when_finished=next_state or None,
+            physics_class=physics_class,
+            duration_ms=physics_class.DURATION_MS,
+            can_capture=physics_class.CAN_CAPTURE,
+            can_be_captured=physics_class.CAN_BE_CAPTURED,
+            frame_ms=frame_time_ms(specific["graphics"].get("frames_per_sec", 6.0)),
+            loop=specific["graphics"].get("is_loop", True),
+            trajectories=trajectories,
+        )
+
+    if problems:
+        raise ValueError(f"Invalid piece type {piece_folder.name}: " + "; ".join(problems))
+    return PieceType(piece_folder.name, initial_state, MappingProxyType(states), moves)
+
+
+def _read_json(path: pathlib.Path) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
@@ -0,0 +1,156 @@
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import cv2
+from Board import Board
+from img import Img
+from FrameProfiler import FrameProfiler
+from PlayerInputState import PlayerInputState
+from TiledCompositor import TiledCompositor
+
+Cell = Tuple[int, int]
+Rect = Tuple[int, int, int, int]
+
+# boards at least this many cells big are composed tile by tile on a thread pool
+TILED_MIN_CELLS = 16 * 16
+
+
+class Renderer:
+    """Keeps one persistent frame and redraws only the cells that changed.
+
+    Every render compares what each piece and cursor would draw (sprite frame
+    and pixel position) with what was drawn last time.  Cells under anything
+    that changed are restored from the clean board background, and everything
+    overlapping those cells is drawn again in the usual order, so the result is
+    the same as redrawing the whole board.  On large boards with more than
+    one core (or with tiled=True) restoring and drawing are split across a
+    TiledCompositor; the frame comes out byte for byte the same.
+    """
+
+    CURSOR_THICKNESS = 2
+
+    def __init__(self, board: Board, profiler: Optional[FrameProfiler] = None, tiled: Optional[bool] = None):
+        self.board = board
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        if tiled is None:
+            # with one core the tiles would only add overhead
+            tiled = board.W_cells * board.H_cells >= TILED_MIN_CELLS and (os.cpu_count() or 1) > 1
+        self.compositor = TiledCompositor(board) if tiled else None
+        self.background = board.img
+        self.frame = board.img.copy()
+        self._drawn: Dict[object, Tuple[object, Optional[Rect]]] = {}
+        self._full_redraw = True
+        self.dirty_cells: Set[Cell] = set()
+
+    def close(self):
+        """Stop the compositor's worker threads, if it has any."""
+        if self.compositor is not None:
+            self.compositor.shutdown()
+
+    def invalidate(self):
+        """Force the next render to redraw the whole board."""
+        self._full_redraw = True
+
+    def render(self, pieces: Iterable, cursors: Sequence[Tuple[PlayerInputState, tuple]],
+               now_ms: Optional[int] = None) -> Img:
+        prof = self.profiler
+        with prof.phase("render.dirty"):
+            pieces = list(pieces)
+            items = self._items(pieces, cursors, now_ms)
+            dirty = self._collect_dirty(items)
+            todo = [i for i in range(len(pieces)) if items[i][2] is not None and self._cells(items[i][2]) & dirty]
+
+            if self.compositor is None:
+                cw, ch = self.board.cell_W_pix, self.board.cell_H_pix
+                frame, bg = self.frame.img, self.background.img
+                for r, c in dirty:
+                    frame[r * ch:(r + 1) * ch, c * cw:(c + 1) * cw] = bg[r * ch:(r + 1) * ch, c * cw:(c + 1) * cw]
+
+        # pieces come before cursors in items, so drawing them in two passes
+        # keeps the usual order
+        with prof.phase("render.pieces"):
+            if self.compositor is None:
+                for i in todo:
+                    _, sig, _, sprite = items[i]
+                    sprite.draw_on(self.frame, sig[1], sig[2])
+            else:
+                # the tiles restore their dirty cells too
+                self.compositor.compose(self.frame, self.background, dirty, [items[i][1] for i in todo])
+        drawn = [pieces[i].piece_type for i in todo] if prof.enabled else None
+        if drawn:
+            prof.count("draw", drawn)
+        with prof.phase("render.cursors"):
+            for _, _, rect, (player, color) in items[len(pieces):]:
+                if self._cells(rect) & dirty:
+                    self._draw_cursor(player, color)
+
+        self._drawn = {key: (sig, rect) for key, sig, rect, _ in items}
+        self._full_redraw = False
+        self.dirty_cells = dirty
+        return self.frame
+
+    def _items(self, pieces: List, cursors: Sequence[Tuple[PlayerInputState, tuple]],
+               now_ms: Optional[int]) -> List[tuple]:
+        """(key, signature, rect, payload) of everything drawn this frame, pieces first."""
+        items = []
+        for p in pieces:
+            sprite, x, y = p.get_draw_info(now_ms)
+            rect = None
+            if sprite is not None and sprite.img is not None:
+                h, w = sprite.img.shape[:2]
+                rect = (x, y, w, h)
+            items.append((p.piece_id, (sprite, x, y), rect, sprite))
+
+        pad = self.CURSOR_THICKNESS // 2
+        for player, color in cursors:
+            x = player.cursor[0] * self.board.cell_W_pix
+            y = player.cursor[1] * self.board.cell_H_pix
+            sig = (x, y, player.has_selected_piece, tuple(color))
+            rect = (x - pad, y - pad, self.board.cell_W_pix + 2 * pad + 1, self.board.cell_H_pix + 2 * pad + 1)
+            items.append((("cursor", player.is_player_one), sig, rect, (player, color)))
+        return items
+
+    def _collect_dirty(self, items: List[tuple]) -> Set[Cell]:
+        dirty: Set[Cell] = set()
+        if self._full_redraw:
+            dirty = {(r, c) for r in range(self.board.H_cells) for c in range(self.board.W_cells)}
+
+        seen = set()
+        for key, sig, rect, _ in items:
+            seen.add(key)
+            prev = self._drawn.get(key)
+            if prev is None:
+                dirty |= self._cells(rect)
+            elif prev != (sig, rect):    # rect changes when a streamed sprite arrives
+                dirty |= self._cells(prev[1]) | self._cells(rect)
+        for key, (_, rect) in self._drawn.items():
+            if key not in seen:
+                dirty |= self._cells(rect)
+
+        # anything partially covering a dirty cell gets redrawn whole, so its
+        # other cells have to be restored too
+        grown = True
+        while grown:
+            grown = False
+            for _, _, rect, _ in items:
+                cells = self._cells(rect)
+                if cells & dirty and not cells <= dirty:
+                    dirty |= cells
+                    grown = True
+        return dirty
+
+    def _cells(self, rect: Optional[Rect]) -> Set[Cell]:
+        if rect is None:
+            return set()
+        x, y, w, h = rect
+        cw, ch = self.board.cell_W_pix, self.board.cell_H_pix
+        c0, c1 = max(0, x // cw), min(self.board.W_cells - 1, (x + w - 1) // cw)
+        r0, r1 = max(0, y // ch), min(self.board.H_cells - 1, (y + h - 1) // ch)
+        return {(r, c) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)}
+
+    def _draw_cursor(self, player: PlayerInputState, color=(0, 255, 0)):
+        x = player.cursor[0] * self.board.cell_W_pix
+        y = player.cursor[1] * self.board.cell_H_pix
+        t = self.CURSOR_THICKNESS
+        cv2.rectangle(self.frame.img, (x, y), (x + self.board.cell_W_pix, y + self.board.cell_H_pix), color, t)
+        if player.has_selected_piece:
+            cv2.rectangle(self.frame.img, (x + 3, y + 3), (x + self.board.cell_W_pix - 3, y + self.board.cell_H_pix - 3), color, t)
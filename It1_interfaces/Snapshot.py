@@ -0,0 +1,93 @@
+import threading
+from typing import NamedTuple, Optional, Tuple
+
+from img import Img
+
+
+class PieceSnapshot(NamedTuple):
+    """What the renderer needs of one piece at one moment."""
+    piece_id: str
+    piece_type: str
+    state_name: Optional[str]
+    sprite: Optional[Img]       # the animation frame showing; sprite frames are shared and never modified
+    x: int
+    y: int
+    prev_x: Optional[int] = None    # where the previous snapshot drew it; None for a new piece
+    prev_y: Optional[int] = None
+
+    def get_draw_info(self, now_ms: Optional[int] = None) -> Tuple[Optional[Img], int, int]:
+        return self.sprite, self.x, self.y
+
+    def at(self, alpha: float) -> "PieceSnapshot":
+        """This piece drawn `alpha` of the way from its previous position (0) to its current one (1)."""
+        if self.prev_x is None or alpha >= 1.0 or (self.prev_x, self.prev_y) == (self.x, self.y):
+            return self
+        x = int(round(self.prev_x + (self.x - self.prev_x) * alpha))
+        y = int(round(self.prev_y + (self.y - self.prev_y) * alpha))
+        return self._replace(x=x, y=y)
+
+
+class CursorSnapshot(NamedTuple):
+    """A player's cursor, answering the same attributes as PlayerInputState."""
+    cursor: Tuple[int, int]
+    has_selected_piece: bool
+    is_player_one: bool
+
+
+class GameSnapshot(NamedTuple):
+    time_ms: int
+    pieces: Tuple[PieceSnapshot, ...]
+    cursors: Tuple[Tuple[CursorSnapshot, tuple], ...]    # (cursor, colour) like Renderer.render takes
+    prev_time_ms: Optional[int] = None                   # time of the snapshot the prev_ positions come from
+
+    def alpha(self, now_ms: float) -> float:
+        """Interpolation factor for drawing at now_ms, clamped to [0, 1].
+
+        The display runs one snapshot interval behind the simulation: at
+        time_ms it shows the previous positions, and it reaches the current
+        ones an interval later, when the next snapshot is due.
+        """
+        if self.prev_time_ms is None or self.time_ms <= self.prev_time_ms:
+            return 1.0
+        return min(1.0, max(0.0, (now_ms - self.time_ms) / (self.time_ms - self.prev_time_ms)))
+
+    def interpolated(self, alpha: float) -> Tuple[PieceSnapshot, ...]:
+        return tuple(p.at(alpha) for p in self.pieces)
+
+    def looks_like(self, other: "GameSnapshot") -> bool:
+        """True when both draw the same picture: the same sprites in the same places and the same cursors."""
+        if self.cursors != other.cursors or len(self.pieces) != len(other.pieces):
+            return False
+        return all(a.piece_id == b.piece_id and a.sprite is b.sprite and a.x == b.x and a.y == b.y
+                   for a, b in zip(self.pieces, other.pieces))
+
+
+class SnapshotBuffer:
+    """Hands the newest GameSnapshot from the simulation thread to the render thread.
+
+    Snapshots are immutable, so the classic triple buffer - one slot being
+    written, one ready, one being read - reduces to swapping a reference
+    under a lock: publish() never waits for the reader, take() always gets
+    the newest complete snapshot, and snapshots published while the reader
+    was busy are skipped and counted in `dropped`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Condition()
+        self._ready: Optional[GameSnapshot] = None
+        self.dropped = 0
+
+    def publish(self, snapshot: GameSnapshot):
+        with self._lock:
+            if self._ready is not None:
+                self.dropped += 1
+            self._ready = snapshot
+            self._lock.notify_all()
+
+    def take(self, timeout: Optional[float] = 0.0) -> Optional[GameSnapshot]:
+        """The newest snapshot not taken yet, waiting up to timeout seconds for one; None if none came."""
+        with self._lock:
+            if self._ready is None and timeout != 0.0:
+                self._lock.wait_for(lambda: self._ready is not None, timeout)
+            snapshot, self._ready = self._ready, None
+            return snapshot
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import os
+import pathlib
+import struct
+import threading
+from typing import Dict, Tuple
+
+import cv2
+import numpy as np
+
+from img import Img
+
+# File layout: header (MAGIC, version, index length), JSON index, zero padding
+# up to ALIGN bytes, then the raw pixel data of every cached frame.  The index
+# maps a key to (offset into the data, shape, dtype).
+MAGIC = b"CTDS"
+VERSION = 1
+ALIGN = 64
+_HEADER = struct.Struct("<4sB3xQ")
+
+
+class SpriteCache:
+    """Decoded and resized images kept on disk in one memory-mapped file.
+
+    A cache key covers the source path, its mtime and size, the target size
+    and the interpolation, so an edited PNG or a different cell size simply
+    misses.  Hits are views into the mapped file: no PNG decode, no resize.
+    Misses are read normally and written out on save().  read() is safe to
+    call from several loader threads at once.  A file that is not a complete
+    cache (foreign, older version, truncated) is ignored and rewritten.
+
+    Only the resized pixels are stored, not Img's blend buffers: those depend
+    on the channels of the canvas a sprite is drawn on, which is not known
+    when it is loaded, and building them is a couple of cv2 calls on a
+    cell-sized image the first time each frame is drawn.
+    """
+
+    def __init__(self, path: str | pathlib.Path):
+        self.path = pathlib.Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._index: Dict[str, Tuple[int, list, str]] = {}
+        self._data = None
+        self._new: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "rb") as f:
+                magic, version, index_len = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != MAGIC or version != VERSION:
+                    return
+                index = json.loads(f.read(index_len))
+        except (OSError, ValueError, struct.error):
+            return    # unreadable cache - start over
+        data_start = _aligned(_HEADER.size + index_len)
+        mapped = np.memmap(self.path, dtype=np.uint8, mode="r")
+        data = mapped[data_start:]
+        try:
+            # a truncated file would only fail later, in the middle of read()
+            if any(offset + _nbytes(shape, dtype) > len(data) for offset, shape, dtype in index.values()):
+                return
+        except (TypeError, ValueError):
+            return
+        self._data = data
+        self._index = index
+
+    @staticmethod
+    def key(path: pathlib.Path, size, keep_aspect: bool, interpolation: int) -> str:
+        st = path.stat()
+        size_txt = "orig" if size is None else f"{size[0]}x{size[1]}"
+        return f"{path.resolve()}|{st.st_mtime_ns}|{st.st_size}|{size_txt}|{int(keep_aspect)}|{interpolation}"
+
+    def read(self, path: str | pathlib.Path,
+             size: tuple[int, int] | None = None,
+             keep_aspect: bool = False,
+             interpolation: int = cv2.INTER_AREA) -> Img:
+        """Same as Img().read(...), served from the cache when possible."""
+        path = pathlib.Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Cannot load image: {path}")
+        key = self.key(path, size, keep_aspect, interpolation)
+
+        img = Img()
+        with self._lock:
+            pixels = self._new.get(key)
+            if pixels is None and key in self._index:
+                offset, shape, dtype = self._index[key]
+                pixels = self._data[offset:offset + _nbytes(shape, dtype)].view(dtype).reshape(shape)
+            if pixels is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if pixels is not None:
+            img.img = pixels
+            return img
+
+        img.read(path, size=size, keep_aspect=keep_aspect, interpolation=interpolation)
+        with self._lock:
+            self._new[key] = img.img
+        return img
+
+    def save(self):
+        """Write every known frame back to disk if anything new was read."""
+        with self._lock:
+            self._save()
+
+    def _save(self):
+        if not self._new:
+            return
+        arrays: Dict[str, np.ndarray] = {}
+        for key, (offset, shape, dtype) in self._index.items():
+            arrays[key] = self._data[offset:offset + _nbytes(shape, dtype)].view(dtype).reshape(shape)
+        arrays.update(self._new)
+
+        index, offset = {}, 0
+        for key, arr in arrays.items():
+            index[key] = (offset, list(arr.shape), arr.dtype.str)
+            offset = _aligned(offset + arr.nbytes)
+        index_bytes = json.dumps(index).encode("utf-8")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+            f.write(index_bytes)
+            f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+            data_start = f.tell()
+            for key, arr in arrays.items():
+                f.seek(data_start + index[key][0])
+                f.write(np.ascontiguousarray(arr).tobytes())
+        try:
+            os.replace(tmp, self.path)
+        except OSError as e:
+            # Windows refuses to replace a file that is still mapped
+            print(f"Warning: could not update sprite cache {self.path}: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+        self._new.clear()
+        self._load()
+
+
+def _nbytes(shape, dtype) -> int:
+    return int(np.prod(shape)) * np.dtype(dtype).itemsize
+
+
+def _aligned(n: int) -> int:
+    return (n + ALIGN - 1) // ALIGN * ALIGN
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import pathlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, Tuple
+
+import cv2
+
+from img import Img
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class SpriteLoader:
+    """Decodes and resizes images on a bounded thread pool.
+
+    cv2 releases the GIL while decoding and resizing, so frames really load
+    in parallel.  submit() returns the frame's Img at once and the worker
+    fills in its pixels later; read() has the same signature as Img.read /
+    SpriteCache.read and waits for the pixels unless the loader is
+    streaming, in which case the caller gets the placeholder and draws
+    nothing for it until it arrives.  Nobody waits on a streamed frame, so
+    one that fails to load is reported on stdout when it fails.
+    """
+
+    def __init__(self, max_workers: int | None = None, sprite_cache=None, streaming: bool = False):
+        if max_workers is None:
+            max_workers = min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sprite-loader")
+        self.sprite_cache = sprite_cache
+        self.streaming = streaming
+        self._images: Dict[Tuple, Img] = {}
+        self._futures: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, path: str | pathlib.Path,
+               size: tuple[int, int] | None = None,
+               keep_aspect: bool = False,
+               interpolation: int = cv2.INTER_AREA) -> Img:
+        key = self._key(path, size, keep_aspect, interpolation)
+        with self._lock:
+            img = self._images.get(key)
+            if img is None:
+                img = Img()
+                self._images[key] = img
+                future = self._executor.submit(
+                    self._load, img, pathlib.Path(path), size, keep_aspect, interpolation)
+                if self.streaming:
+                    future.add_done_callback(lambda f, path=path: _report_failure(path, f))
+                self._futures[key] = future
+        return img
+
+    def read(self, path: str | pathlib.Path,
+             size: tuple[int, int] | None = None,
+             keep_aspect: bool = False,
+             interpolation: int = cv2.INTER_AREA) -> Img:
+        img = self.submit(path, size, keep_aspect, interpolation)
+        if not self.streaming:
+            self._futures[self._key(path, size, keep_aspect, interpolation)].result()
+        return img
+
+    def _load(self, img: Img, path: pathlib.Path, size, keep_aspect, interpolation):
+        if self.sprite_cache is not None:
+            loaded = self.sprite_cache.read(path, size=size, keep_aspect=keep_aspect, interpolation=interpolation)
+        else:
+            loaded = Img().read(path, size=size, keep_aspect=keep_aspect, interpolation=interpolation)
+        img.img = loaded.img
+
+    def pending(self) -> int:
+        with self._lock:
+            return sum(not f.done() for f in self._futures.values())
+
+    def wait(self, timeout: float | None = None):
+        """Block until every submitted frame is loaded; re-raises load errors."""
+        with self._lock:
+            futures = list(self._futures.values())
+        wait(futures, timeout=timeout)
+        for f in futures:
+            if f.done():
+                f.result()
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker threads once the submitted frames are loaded.
+
+        Already submitted frames still load; with wait=False this returns at
+        once and the threads exit when they are done.
+        """
+        self._executor.shutdown(wait=wait)
+
+    @staticmethod
+    def _key(path, size, keep_aspect, interpolation) -> Tuple:
+        return (str(pathlib.Path(path)), None if size is None else tuple(size), keep_aspect, interpolation)
+
+
+def _report_failure(path, future: Future):
+    if not future.cancelled() and future.exception() is not None:
+        print(f"Warning: could not load sprite '{path}': {future.exception()}")
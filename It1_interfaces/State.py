@@ -1,15 +1,20 @@
-import json
 import pathlib
 from typing import Dict, Optional
 from Command import Command
 from Graphics import Graphics
-from Physics import Physics, IdlePhysics, MovePhysics, JumpPhysics, ShortRestPhysics, LongRestPhysics
+from Physics import Physics, MovePhysics
 from GraphicsFactory import GraphicsFactory
 from PhysicsFactory import PhysicsFactory
 from Moves import Moves
+from PieceType import PieceType, load_piece_type
+from PieceRuntime import PieceRuntime
+
+# הגנה מלולאה של מצבים באורך אפס
+MAX_CHAINED_TRANSITIONS = 16
 
 class State:
-    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics):
+    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics, name: Optional[str] = None):
+        self.name = name
         self._moves = moves
         self._graphics = graphics
         self._physics = physics
@@ -28,26 +33,34 @@ class State:
             self._physics.reset(command)
     
     def update(self, now_ms: int) -> 'State':
-        """עדכון המצב - מחזיר את המצב הבא אם יש מעבר"""
-        self._graphics.update(now_ms)
-        self._physics.update(now_ms)
-        
-        # בדיקה אם Physics סיים והזמן הגיע לעבור למצב הבא
-        next_command = self._physics.get_command()
-        if next_command and next_command.type in self._transitions:
-            next_state = self._transitions[next_command.type]
-            next_state.reset(next_command)
-            return next_state
-        
-        return self
+        """עדכון המצב - מבצע את כל המעברים שהיו צריכים לקרות עד now_ms.
+
+        פקודת המעבר של Physics נושאת את זמן הסיום המדויק, כך שכל מצב מתחיל
+        בדיוק כשהקודם נגמר - בלי תלות בקצב העדכונים.
+        """
+        state = self
+        for _ in range(MAX_CHAINED_TRANSITIONS):
+            state._graphics.update(now_ms)
+            state._physics.update(now_ms)
+
+            # בדיקה אם Physics סיים והזמן הגיע לעבור למצב הבא
+            next_command = state._physics.get_command()
+            if not (next_command and next_command.type in state._transitions):
+                break
+            state = state._enter(state._transitions[next_command.type], next_command)
+        return state
     
     def process_command(self, command: Command) -> 'State':
         """עיבוד פקודה חדשה ומעבר למצב מתאים"""
         if command.type in self._transitions:
-            next_state = self._transitions[command.type]
-            next_state.reset(command)
-            return next_state
+            return self._enter(self._transitions[command.type], command)
         return self
+
+    def _enter(self, next_state: 'State', command: Command) -> 'State':
+        """מעבר למצב הבא - המיקום עובר איתו"""
+        next_state.set_position(self.get_position())
+        next_state.reset(command)
+        return next_state
     
     def is_command_possible(self, command: Command) -> bool:
         """בדיקה האם הפקודה אפשרית במצב הנוכחי"""
@@ -61,9 +74,9 @@ class State:
         """החזרת הפקודה הנוכחית"""
         return self._command
     
-    def draw(self, board):
-        """ציור המצב הנוכחי"""
-        img = self._graphics.get_img()
+    def draw(self, board, now_ms: Optional[int] = None):
+        """ציור המצב הנוכחי - הפריים שמוצג ב-now_ms"""
+        img = self._graphics.get_img(now_ms)
         if img:
             pos = self._physics.get_pos()
             # המרה מקואורדינטות לוגיות לפיקסלים
@@ -81,93 +94,87 @@ class State:
     
     def copy(self) -> 'State':
         """יצירת עותק של המצב"""
-        new_state = State(self._moves, self._graphics.copy(), self._physics.copy())
+        new_state = State(self._moves, self._graphics.copy(), self._physics.copy(), self.name)
         new_state._transitions = self._transitions.copy()
         return new_state
 
 class StateManager:
-    """מנהל מצבים שיוצר ומנהל את מכונת המצבים לכל piece"""
+    """מכונת מצבים שמורכבת ידנית מאובייקטי State.
+
+    כלים שנבנים מסוג כלי (PieceType) רצים תמיד על PieceRuntime - גם
+    from_type / from_config מחזירים PieceRuntime - כך שיש מימוש אחד של
+    מכונת המצבים של הכלים, והתנהגות חדשה נכתבת שם.
+    """
+
+    def __init__(self, states: Dict[str, State], initial_state_name: str):
+        if initial_state_name not in states:
+            raise ValueError(f"Initial state '{initial_state_name}' not found in states")
+        self.states = states
+        self.current_state = states[initial_state_name]
+        self.last_update_ms = None
+
+    def process_command(self, command: Command) -> State:
+        """העברת פקודה למצב הנוכחי"""
+        self.current_state = self.current_state.process_command(command)
+        return self.current_state
+
+    def update(self, now_ms: int) -> State:
+        """עדכון המצב הנוכחי ומעבר אוטומטי אם הפיזיקה סיימה"""
+        self.last_update_ms = now_ms
+        self.current_state = self.current_state.update(now_ms)
+        return self.current_state
+
+    def set_position(self, pos: tuple):
+        """הגדרת מיקום הכלי במצב הנוכחי"""
+        self.current_state.set_position(pos)
+
+    def get_position(self) -> tuple:
+        """מיקום הכלי במצב הנוכחי"""
+        return self.current_state.get_position()
+
+    @property
+    def state_name(self) -> Optional[str]:
+        return self.current_state.name
+
+    def current_move(self):
+        """(משבצת התחלה, זמן התחלה, מסלול) של התנועה הנוכחית, None אם הכלי לא בתנועה"""
+        physics = self.current_state._physics
+        if not isinstance(physics, MovePhysics) or physics.finished or physics.start_time_ms is None:
+            return None
+        trajectory = physics.trajectory()
+        if trajectory is None:
+            return None
+        return tuple(physics.current_pos), physics.start_time_ms, trajectory
+
+    def can_capture(self) -> bool:
+        return self.current_state._physics.can_capture()
+
+    def can_be_captured(self) -> bool:
+        return self.current_state._physics.can_be_captured()
+
+    def get_draw_info(self, now_ms: Optional[int] = None) -> tuple:
+        """הפריים שמוצג ב-now_ms (ברירת מחדל: העדכון האחרון) והמיקום בפיקסלים לפי העדכון האחרון"""
+        img = self.current_state._graphics.get_img(now_ms if now_ms is not None else self.last_update_ms)
+        x, y = self.current_state._physics.get_pos_pix()
+        return img, int(x), int(y)
+
+    def copy(self) -> 'StateManager':
+        """עותק של כל מכונת המצבים - המעברים מצביעים על המצבים החדשים"""
+        new_states = {name: state.copy() for name, state in self.states.items()}
+        for state in new_states.values():
+            state._transitions = {cmd: new_states[target.name] for cmd, target in state._transitions.items()}
+        return StateManager(new_states, self.current_state.name)
     
     @staticmethod
     def from_config(piece_folder: pathlib.Path, moves: Moves, 
-                   graphics_factory: GraphicsFactory, physics_factory: PhysicsFactory) -> State:
-        """יצירת StateManager מקובץ הגדרות"""
-        
-        # קריאת הגדרות כלליות של הpiece
-        config_path = piece_folder / "config.json"
-        with open(config_path, 'r') as f:
-            piece_config = json.load(f)
-        
-        initial_state_name = piece_config["initial_state"]
-        states_config = piece_config["states"]
-        
-        # יצירת מילון המצבים
-        states = {}
-        
-        # תיקיית המצבים - זה המבנה החדש שלך
-        states_folder = piece_folder / "states"
-        
-        if not states_folder.exists():
-            raise FileNotFoundError(f"States folder not found: {states_folder}")
-        
-        # עבור כל מצב ביצירת State אובייקט
-        for state_name in states_config.keys():
-            state_folder = states_folder / state_name
-            
-            if not state_folder.exists():
-                print(f"Warning: State folder {state_folder} not found, skipping")
-                continue
-            
-            # קריאת הגדרות המצב הספציפי
-            state_config_path = state_folder / "config.json"
-            if state_config_path.exists():
-                with open(state_config_path, 'r') as f:
-                    state_specific_config = json.load(f)
-            else:
-                # הגדרות ברירת מחדל אם אין קובץ config
-                state_specific_config = {
-                    "physics": {"speed_m_per_sec": 0.0, "next_state_when_finished": "idle"},
-                    "graphics": {"frames_per_sec": 6, "is_loop": True}
-                }
-            
-            # יצירת Graphics עבור המצב
-            sprites_folder = state_folder / "sprites"
-            graphics = graphics_factory.create(sprites_folder, state_specific_config["graphics"])
-            
-            # יצירת Physics עבור המצב
-            physics_config = state_specific_config["physics"]
-            # יצירת Command זמני עבור הפיזיקה
-            temp_command = Command("temp", state_name, {}, timestamp_ms=0)
-            physics = physics_factory.create((0, 0), temp_command, physics_config)
-            
-            # יצירת State
-            state = State(moves, graphics, physics)
-            states[state_name] = state
-        
-        # הגדרת מעברי המצבים
-        for state_name, state_config in states_config.items():
-            if state_name in states:
-                current_state = states[state_name]
-                
-                # הוספת מעברי מצבים מההגדרות
-                if "transitions" in state_config:
-                    for command_type, next_state_name in state_config["transitions"].items():
-                        if next_state_name in states:
-                            current_state.set_transition(command_type, states[next_state_name])
-                
-                # הוספת מעבר אוטומטי מ-Physics
-                state_folder = piece_folder / "states" / state_name
-                state_config_path = state_folder / "config.json"
-                if state_config_path.exists():
-                    with open(state_config_path, 'r') as f:
-                        state_specific_config = json.load(f)
-                        next_state_when_finished = state_specific_config["physics"].get("next_state_when_finished")
-                        if next_state_when_finished and next_state_when_finished in states:
-                            # הוספת מעבר אוטומטי כאשר הפיזיקה מסיימת
-                            current_state.set_transition("auto_finish", states[next_state_when_finished])
-        
-        # החזרת המצב ההתחלתי
-        if initial_state_name not in states:
-            raise ValueError(f"Initial state '{initial_state_name}' not found in states")
-        
-        return states[initial_state_name]
\ No newline at end of file
+                   graphics_factory: GraphicsFactory, physics_factory: PhysicsFactory) -> PieceRuntime:
+        """מכונת המצבים של כלי מקובץ הגדרות"""
+        piece_type = load_piece_type(piece_folder, moves, graphics_factory)
+        return StateManager.from_type(piece_type, graphics_factory, physics_factory)
+
+    @staticmethod
+    def from_type(piece_type: PieceType, graphics_factory: GraphicsFactory,
+                  physics_factory: PhysicsFactory) -> PieceRuntime:
+        """מכונת המצבים של סוג כלי - PieceRuntime על המצבים, הפריימים והמעברים המשותפים של הסוג.
+        המיקום מתחיל ב-(0, 0) - set_position כמו קודם"""
+        return PieceRuntime(piece_type, physics_factory.board, (0, 0))
\ No newline at end of file
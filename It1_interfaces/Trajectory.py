@@ -0,0 +1,141 @@
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# trajectories are sampled once every SAMPLE_MS of game time
+SAMPLE_MS = 4
+# peak of a jump, in cells above the piece's own cell
+JUMP_HEIGHT_CELLS = 0.5
+
+
+def move_duration_ms(d_row: int, d_col: int, board, speed_m_s: float, fallback_ms: float) -> int:
+    """How long a move of (d_row, d_col) cells takes at speed_m_s.
+
+    The distance is the straight line between the two cells in metres
+    (board.cell_H_m / cell_W_m).  A state without a speed keeps fallback_ms.
+    """
+    if not speed_m_s or speed_m_s <= 0:
+        return int(fallback_ms)
+    distance_m = math.hypot(d_row * board.cell_H_m, d_col * board.cell_W_m)
+    return int(round(distance_m / speed_m_s * 1000))
+
+
+def ease_in_out(t: np.ndarray) -> np.ndarray:
+    """Smoothstep: starts and lands at zero speed."""
+    return t * t * (3.0 - 2.0 * t)
+
+
+class Trajectory:
+    """Pixel offsets from a piece's start cell, one sample per SAMPLE_MS.
+
+    `cells` lists the cells the piece passes through as (d_row, d_col,
+    enter_ms) relative to the start cell and the start time, beginning with
+    the start cell itself.  A piece is in a cell from its enter_ms to the
+    next cell's; it is in the last one from there to duration_ms.
+    """
+
+    __slots__ = ("duration_ms", "offsets", "cells")
+
+    def __init__(self, duration_ms: int, offsets: List[Tuple[int, int]],
+                 cells: Tuple[Tuple[int, int, int], ...] = ((0, 0, 0),)):
+        self.duration_ms = duration_ms
+        self.offsets = offsets
+        self.cells = cells
+
+    def offset_at(self, elapsed_ms: float) -> Tuple[int, int]:
+        index = int(elapsed_ms) // SAMPLE_MS
+        if index <= 0:
+            return self.offsets[0]
+        if index >= len(self.offsets):
+            return self.offsets[-1]
+        return self.offsets[index]
+
+
+def _progress(duration_ms: int) -> np.ndarray:
+    """0..1 at every sample of a duration_ms long trajectory (last sample is 1)."""
+    n = duration_ms // SAMPLE_MS + 1
+    t = np.arange(n, dtype=np.float64) * SAMPLE_MS / max(duration_ms, 1)
+    t[-1] = 1.0
+    return np.minimum(t, 1.0)
+
+
+def _as_offsets(dx: np.ndarray, dy: np.ndarray) -> List[Tuple[int, int]]:
+    return list(zip(np.rint(dx).astype(int).tolist(), np.rint(dy).astype(int).tolist()))
+
+
+def _path_cells(d_row: int, d_col: int, s: np.ndarray, duration_ms: int) -> Tuple[Tuple[int, int, int], ...]:
+    """Cells crossed by a move along progress s, entered when its centre crosses half way.
+
+    Straight and diagonal moves cross every cell on the line; any other
+    move (a knight's) goes straight from the start cell to the target.
+    """
+    if d_row == 0 or d_col == 0 or abs(d_row) == abs(d_col):
+        steps = max(abs(d_row), abs(d_col))
+    else:
+        steps = 1
+    if steps == 0:
+        return ((0, 0, 0),)
+    thresholds = (np.arange(1, steps + 1) - 0.5) / steps
+    enter = np.minimum(np.searchsorted(s, thresholds) * SAMPLE_MS, duration_ms).tolist()
+    cells = [(0, 0, 0)]
+    for k in range(1, steps + 1):
+        cells.append((d_row * k // steps, d_col * k // steps, enter[k - 1]))
+    return tuple(cells)
+
+
+def build_move(d_row: int, d_col: int, cell_w_pix: int, cell_h_pix: int, duration_ms: int) -> Trajectory:
+    s = ease_in_out(_progress(duration_ms))
+    return Trajectory(duration_ms, _as_offsets(s * d_col * cell_w_pix, s * d_row * cell_h_pix),
+                      _path_cells(d_row, d_col, s, duration_ms))
+
+
+def build_jump(cell_h_pix: int, duration_ms: int) -> Trajectory:
+    t = _progress(duration_ms)
+    height = JUMP_HEIGHT_CELLS * cell_h_pix * 4.0 * t * (1.0 - t)    # parabola, peak at the middle
+    return Trajectory(duration_ms, _as_offsets(np.zeros_like(t), -height))
+
+
+class Trajectories:
+    """The trajectories of every move and jump at one speed on one board.
+
+    Tables are built the first time a (d_row, d_col) is asked for, so a
+    frame only looks samples up.  PieceType builds the ones its moves allow
+    up front; trajectories_for() shares one cache between all piece types
+    and Physics objects with the same board geometry and speed.
+    """
+
+    def __init__(self, board, speed_m_s: float, fallback_ms: float):
+        self.board = board
+        self.speed_m_s = speed_m_s
+        self.fallback_ms = fallback_ms
+        self._moves: Dict[Tuple[int, int], Trajectory] = {}
+        self._jumps: Dict[int, Trajectory] = {}
+
+    def move(self, d_row: int, d_col: int) -> Trajectory:
+        key = (d_row, d_col)
+        trajectory = self._moves.get(key)
+        if trajectory is None:
+            board = self.board
+            duration = move_duration_ms(d_row, d_col, board, self.speed_m_s, self.fallback_ms)
+            trajectory = build_move(d_row, d_col, board.cell_W_pix, board.cell_H_pix, duration)
+            self._moves[key] = trajectory
+        return trajectory
+
+    def jump(self, duration_ms: int) -> Trajectory:
+        trajectory = self._jumps.get(duration_ms)
+        if trajectory is None:
+            trajectory = build_jump(self.board.cell_H_pix, duration_ms)
+            self._jumps[duration_ms] = trajectory
+        return trajectory
+
+
+_shared: Dict[tuple, Trajectories] = {}
+
+
+def trajectories_for(board, speed_m_s: float, fallback_ms: float) -> Trajectories:
+    key = (board.cell_W_pix, board.cell_H_pix, board.cell_W_m, board.cell_H_m, speed_m_s, fallback_ms)
+    trajectories = _shared.get(key)
+    if trajectories is None:
+        trajectories = _shared[key] = Trajectories(board, speed_m_s, fallback_ms)
+    return trajectories
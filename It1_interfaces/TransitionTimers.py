@@ -0,0 +1,62 @@
+import heapq
+import itertools
+from typing import Dict, List, Optional
+
+# deadline of a piece whose state clock starts at the next update
+ASAP = float("-inf")
+
+
+class TransitionTimers:
+    """Min-heap of the game time at which each piece next needs an update.
+
+    A piece is scheduled at its runtime's next_deadline_ms(); pieces that no
+    deadline can change (idle) are not in the heap at all.  Rescheduling a
+    piece leaves its old entry in the heap as a stale one that is skipped
+    when popped, so both operations stay O(log n).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._live: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+    @staticmethod
+    def supports(piece) -> bool:
+        return hasattr(getattr(piece, "state_manager", None), "next_deadline_ms")
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def schedule(self, piece):
+        """(Re)schedule piece at its next deadline, or drop it if it has none."""
+        deadline = piece.state_manager.next_deadline_ms()
+        if deadline is None:
+            self._live.pop(piece.piece_id, None)
+            return
+        seq = next(self._seq)
+        self._live[piece.piece_id] = seq
+        heapq.heappush(self._heap, (deadline, seq, piece))
+
+    def cancel(self, piece):
+        self._live.pop(piece.piece_id, None)
+
+    def pop_due(self, now_ms: int) -> List:
+        """Every piece whose deadline is at or before now_ms, earliest first.
+
+        The pieces are taken out of the heap; schedule them again after
+        updating them.
+        """
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now_ms:
+            _, seq, piece = heapq.heappop(heap)
+            if self._live.get(piece.piece_id) == seq:
+                del self._live[piece.piece_id]
+                due.append(piece)
+        return due
+
+    def next_deadline_ms(self) -> Optional[float]:
+        heap = self._heap
+        while heap and self._live.get(heap[0][2].piece_id) != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
@@ -7,6 +7,8 @@ import numpy as np
 class Img:
     def __init__(self):
         self.img = None
+        self._blend_src = None
+        self._blend_cache = {}
 
     def read(self, path: str | pathlib.Path,
              size: tuple[int, int] | None = None,
@@ -31,31 +33,86 @@ class Img:
 
         return self
 
-    def draw_on(self, other_img, x, y):
+    def draw_on(self, other_img, x, y, clip=None):
+        """Blend this image onto other_img at (x, y).
+
+        clip = (x0, y0, x1, y1) limits drawing to that region of other_img;
+        blending is per pixel, so drawing a sprite region by region gives
+        exactly the pixels of drawing it in one go.  A sprite reaching past
+        the top or left edge (a jump from the first row) is clipped there.
+        """
         if self.img is None or other_img.img is None:
             raise ValueError("Both images must be loaded before drawing.")
 
-        if self.img.shape[2] != other_img.img.shape[2]:
-            if self.img.shape[2] == 3 and other_img.img.shape[2] == 4:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2BGRA)
-            elif self.img.shape[2] == 4 and other_img.img.shape[2] == 3:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGRA2BGR)
+        color, inv_alpha = self._blend_for(other_img.img.shape[2])
 
-        h, w = self.img.shape[:2]
+        h, w = color.shape[:2]
         H, W = other_img.img.shape[:2]
 
         if y + h > H or x + w > W:
             raise ValueError("Logo does not fit at the specified position.")
 
-        roi = other_img.img[y:y + h, x:x + w]
+        if clip is None and (x < 0 or y < 0):
+            clip = (0, 0, W, H)
+        if clip is not None:
+            x0, y0 = max(x, clip[0]), max(y, clip[1])
+            x1, y1 = min(x + w, clip[2]), min(y + h, clip[3])
+            if x0 >= x1 or y0 >= y1:
+                return
+            color = color[y0 - y:y1 - y, x0 - x:x1 - x]
+            if inv_alpha is not None:
+                inv_alpha = inv_alpha[y0 - y:y1 - y, x0 - x:x1 - x]
+            roi = other_img.img[y0:y1, x0:x1]
+        else:
+            roi = other_img.img[y:y + h, x:x + w]
 
-        if self.img.shape[2] == 4:
-            b, g, r, a = cv2.split(self.img)
-            mask = a / 255.0
-            for c in range(3):
-                roi[..., c] = (1 - mask) * roi[..., c] + mask * self.img[..., c]
+        if inv_alpha is None:
+            roi[...] = color
         else:
-            other_img.img[y:y + h, x:x + w] = self.img
+            # roi = roi * (255 - a) / 255 + premultiplied colour, in place on uint8
+            cv2.multiply(roi, inv_alpha, dst=roi, scale=1 / 255)
+            cv2.add(roi, color, dst=roi)
+
+    def prepare_blend(self, channels: int):
+        """Build the blend buffers for a `channels` canvas now, before several threads draw this image."""
+        self._blend_for(channels)
+
+    def _blend_for(self, channels: int):
+        """Blend buffers for drawing onto a canvas with `channels` channels.
+
+        Returns (color, inv_alpha): color is premultiplied by alpha and laid
+        out like the canvas; inv_alpha is 255 - alpha, or None if the sprite
+        is fully opaque and can simply be copied.  Built once per image and
+        canvas layout, so drawing never converts or allocates.
+        """
+        if self._blend_src is not self.img:
+            self._blend_src = self.img
+            self._blend_cache = {}
+
+        cached = self._blend_cache.get(channels)
+        if cached is None:
+            cached = self._build_blend(channels)
+            self._blend_cache[channels] = cached
+        return cached
+
+    def _build_blend(self, channels: int):
+        src = self.img
+        if src.ndim == 2:
+            src = cv2.cvtColor(src, cv2.COLOR_GRAY2BGR)
+
+        if src.shape[2] == 4 and src[..., 3].min() < 255:
+            alpha = src[..., 3]
+            color = cv2.multiply(src[..., :3], cv2.merge([alpha] * 3), scale=1 / 255)
+            inv_alpha = 255 - alpha
+            if channels == 4:
+                color = cv2.merge([*cv2.split(color), alpha])
+            return color, cv2.merge([inv_alpha] * channels)
+
+        if channels == 4 and src.shape[2] == 3:
+            src = cv2.cvtColor(src, cv2.COLOR_BGR2BGRA)
+        elif channels == 3 and src.shape[2] == 4:
+            src = cv2.cvtColor(src, cv2.COLOR_BGRA2BGR)
+        return np.ascontiguousarray(src), None
 
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
         if self.img is None:
@@ -76,12 +133,3 @@ class Img:
         if self.img is not None:
             new_img.img = self.img.copy()
         return new_img
-
-
-
-
-
-
-
-
-
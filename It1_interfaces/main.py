@@ -1,7 +1,10 @@
+import os
 import pathlib
 from Board import Board
 from PieceFactory import PieceFactory
 from Game import Game
+from SpriteCache import SpriteCache
+from FrameProfiler import FrameProfiler
 
 def read_board_config(path: pathlib.Path):
     pieces_info = []
@@ -17,13 +20,16 @@ def read_board_config(path: pathlib.Path):
             pieces_info.append((piece_id, (r, c)))
     return pieces_info
 
-def create_board(h=8, w=8) -> Board:
+def create_board(h=8, w=8, sprite_cache=None) -> Board:
     from img import Img
     base_dir = pathlib.Path(__file__).parent
     board_img_path = base_dir.parent / "board.png"
 
-    img = Img()
-    img.read(str(board_img_path), size=(w * 64, h * 64))  
+    if sprite_cache is not None:
+        img = sprite_cache.read(board_img_path, size=(w * 64, h * 64))
+    else:
+        img = Img()
+        img.read(str(board_img_path), size=(w * 64, h * 64))  
 
     return Board(
         cell_H_pix=64,
@@ -40,20 +46,26 @@ def main():
     pieces_root = base_dir.parent / "pieces"
     board_txt = base_dir / "board.txt"
 
-    board = create_board()
-    piece_factory = PieceFactory(board, pieces_root)
+    sprite_cache = SpriteCache(base_dir.parent / ".cache" / "sprites.bin")
+    board = create_board(sprite_cache=sprite_cache)
+    piece_factory = PieceFactory(board, pieces_root, sprite_cache)
 
-    # Create a piece for each cell on the board
+    # Create the pieces listed in board.txt, loading their sprites in parallel first
+    pieces_info = read_board_config(board_txt)
+    piece_factory.preload(piece_id.split("_")[0] for piece_id, _ in pieces_info)
     game_pieces = []
-    for row in range(board.H_cells):
-        for col in range(board.W_cells):
-            piece_id = f"Piece_{row}_{col}_template"
-            start_cell = (row, col)
-            piece = piece_factory.create_piece(piece_id, start_cell)
-            if piece is not None:
-                game_pieces.append(piece)
-
-    game = Game(game_pieces, board)
+    for piece_id, start_cell in pieces_info:
+        piece = piece_factory.create_piece(piece_id, start_cell)
+        if piece is not None:
+            game_pieces.append(piece)
+    sprite_cache.save()
+
+    # CTD_PROFILE=<file.json|file.csv> - מדידת ביצועים ושמירה תקופתית לקובץ
+    profile_path = os.environ.get("CTD_PROFILE")
+    profiler = FrameProfiler(enabled=bool(profile_path), dump_path=profile_path)
+    # CTD_TICK_HZ - קצב הסימולציה; התצוגה מחליקה בין הטיקים ונשארת ב-60
+    tick_hz = float(os.environ.get("CTD_TICK_HZ", 60))
+    game = Game(game_pieces, board, tick_hz=tick_hz, profiler=profiler)
     game.run()
 
 if __name__ == "__main__":
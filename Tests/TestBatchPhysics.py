@@ -0,0 +1,69 @@
+import sys
+import os
+import pathlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+from Board import Board
+from BatchPhysics import BatchPhysics
+from Clock import ManualClock
+from Command import Command
+from Game import Game
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+START = [("PW", (6, 0)), ("PW", (6, 1)), ("PB", (1, 2)), ("NW", (7, 1)), ("KB", (0, 4))]
+
+
+def _game(batch):
+    board = Board(cell_H_pix=8, cell_W_pix=8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+    factory = PieceFactory(board, PIECES_ROOT)
+    pieces = [factory.create_piece(t, cell) for t, cell in START]
+    return Game(pieces=pieces, board=board, clock=ManualClock(0), headless=True, batch_physics=batch)
+
+
+def test_batched_game_matches_per_piece_updates():
+    script = {
+        40: Command("PW_6_0", "move", {"target": [4, 0]}),
+        120: Command("PB_1_2", "jump", {}),
+        700: Command("NW_7_1", "move", {"target": [5, 2]}),
+        1500: Command("KB_0_4", "move", {"target": [0, 4]}),
+    }
+    games = [_game(False), _game(True)]
+    for now in range(0, 5000, 20):
+        for game in games:
+            if now in script:
+                c = script[now]
+                game.issue_command(Command(c.piece_id, c.type, dict(c.params)))
+            game.clock.now_ms = now
+            game.step(now)
+        plain, batched = (sorted((p.piece_id, p.cell, p.state_name) for p in g.pieces.values()) for g in games)
+        assert plain == batched, now
+
+    knight = games[1].pieces["NW_7_1"]
+    assert knight.cell == (5, 2)
+    assert knight.state_name == "idle"
+
+
+def test_idle_board_needs_no_updates():
+    game = _game(True)
+    game.step(0)    # כל שעון מתחיל פעם אחת
+
+    assert len(game.batch.step(16)) == 0
+    game.issue_command(Command("PB_1_2", "jump", {}, 0))
+    assert len(game.batch.step(32)) == 0    # הקפיצה מתחילה בזמן הפקודה
+    assert [game.batch.pieces[r].piece_id for r in game.batch.step(500)] == ["PB_1_2"]
+
+
+def test_remove_keeps_rows_consistent():
+    game = _game(True)
+    batch = game.batch
+    moved = batch.pieces[-1]
+    timing = (batch.start_ms[len(batch) - 1], batch.duration_ms[len(batch) - 1])
+
+    batch.remove(batch.pieces[0])
+
+    assert len(batch) == len(START) - 1
+    assert batch.pieces[0] is moved
+    assert moved in batch
+    assert (batch.start_ms[0], batch.duration_ms[0]) == timing
@@ -0,0 +1,39 @@
+import sys
+import os
+import copy
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'Benchmarks')))
+
+import bench
+
+
+def _tiny():
+    return bench.BenchConfig(cells=4, density=0.5, move_load=1.0, game_seconds=0.2, repeat=1, compose_cells=8)
+
+
+def test_suite_runs_headless_and_reports_every_metric():
+    results = bench.run_all(_tiny())
+
+    assert set(results["results"]) == {"draw_on_per_s", "is_valid_move_per_s", "type_load_ms",
+                                       "create_piece_us", "bytes_per_piece", "sim_ticks_per_s", "frames_per_s",
+                                       "compose_serial_ms", "compose_tiled_ms"}
+    assert all(m["value"] > 0 for m in results["results"].values())
+    assert bench.compare(results, results, 0.25) == []
+
+
+def test_compare_flags_regressions_in_both_directions():
+    results = bench.run_all(_tiny(), only=["is_valid_move", "startup"])
+    baseline = copy.deepcopy(results)
+    baseline["results"]["is_valid_move_per_s"]["value"] *= 2      # היה פי 2 מהיר יותר
+    baseline["results"]["bytes_per_piece"]["value"] /= 2          # היה צריך חצי זיכרון
+
+    regressions = bench.compare(results, baseline, 0.25)
+
+    assert [r.split(":")[0] for r in regressions] == ["is_valid_move_per_s", "bytes_per_piece"]
+
+
+def test_baseline_from_another_config_is_not_compared():
+    results = bench.run_all(_tiny(), only=["is_valid_move"])
+    other = copy.deepcopy(results)
+    other["config"]["cells"] = 8
+
+    assert "config differs" in bench.compare(results, other, 0.25)[0]
@@ -0,0 +1,92 @@
+import sys
+import os
+import pathlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+from Moves import Moves
+from Bitboard import BitboardPosition, SlidingMoves, cell_bit, iter_cells
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parents[1] / "pieces"
+BOARD_TXT = pathlib.Path(__file__).resolve().parents[1] / "It1_interfaces" / "board.txt"
+
+
+def _position(placements, dims=(8, 8)):
+    pos = BitboardPosition(*dims)
+    for piece_type, cell in placements:
+        pos.register_type(piece_type, Moves(PIECES_ROOT / piece_type / "moves.txt", dims))
+        pos.place(piece_type, "W" in piece_type, cell)
+    return pos
+
+
+def _cells(bb, cols=8):
+    return set(iter_cells(bb, cols))
+
+
+def test_iter_cells_roundtrip():
+    bb = cell_bit(0, 0, 8) | cell_bit(3, 5, 8) | cell_bit(7, 7, 8)
+    assert list(iter_cells(bb, 8)) == [(0, 0), (3, 5), (7, 7)]
+
+
+def test_rook_stops_at_blockers():
+    pos = _position([("RW", (7, 0)), ("PW", (5, 0)), ("PB", (7, 3))])
+
+    targets = _cells(pos.legal_targets("RW", True, (7, 0)))
+
+    assert targets == {(6, 0), (7, 1), (7, 2), (7, 3)}   # (7,3) היא תפיסה
+
+
+def test_knight_jumps_over_pieces():
+    pos = _position([("NW", (7, 1)), ("PW", (6, 0)), ("PW", (6, 1)), ("PW", (6, 2)), ("PW", (6, 3))])
+
+    assert _cells(pos.legal_targets("NW", True, (7, 1))) == {(5, 0), (5, 2)}
+
+
+def test_pawn_double_step_needs_first_move_and_clear_path():
+    pos = _position([("PW", (6, 4)), ("PB", (5, 3))])
+
+    assert pos.is_legal_move("PW", True, (6, 4), (4, 4), is_first_move=True)
+    assert not pos.is_legal_move("PW", True, (6, 4), (4, 4))
+    assert pos.is_legal_move("PW", True, (6, 4), (5, 3))          # capture
+    assert not pos.is_legal_move("PW", True, (6, 4), (5, 5))      # אין מה לתפוס
+
+    pos.place("PB", False, (5, 4))
+    assert not pos.is_legal_move("PW", True, (6, 4), (4, 4), is_first_move=True)
+
+
+def test_first_move_rule_does_not_limit_a_capture(tmp_path):
+    rules = tmp_path / "moves.txt"
+    rules.write_text("-2,0:capture\n-2,0:1st\n")
+    table = SlidingMoves(Moves(rules, (8, 8)))
+    target = cell_bit(4, 3, 8)
+
+    assert table.targets(6, 3, occupied=0, enemy=0) == 0
+    assert table.targets(6, 3, occupied=0, enemy=0, is_first_move=True) == target
+    assert table.targets(6, 3, occupied=target, enemy=target) == target
+
+
+def test_move_updates_boards():
+    pos = _position([("QW", (7, 3))])
+    pos.move("QW", True, (7, 3), (4, 4))
+
+    assert pos.sides[True] == cell_bit(4, 4, 8)
+    assert pos.types["QW"] == cell_bit(4, 4, 8)
+
+
+def test_opening_position_has_twenty_moves_per_side():
+    placements = []
+    for line in BOARD_TXT.read_text(encoding="utf-8").splitlines():
+        parts = line.split()
+        if len(parts) == 3:
+            placements.append((parts[0], (int(parts[1]), int(parts[2]))))
+    pos = _position(placements)
+
+    for player_one in (True, False):
+        moves = pos.side_moves(player_one, unmoved=pos.sides[player_one])
+        assert sum(bin(bb).count("1") for bb in moves.values()) == 20
+
+
+def test_wide_board():
+    pos = _position([("RW", (0, 0)), ("PB", (0, 5))], dims=(32, 32))
+
+    assert _cells(pos.legal_targets("RW", True, (0, 0)), cols=32) == \
+        {(0, c) for c in range(1, 6)} | {(r, 0) for r in range(1, 8)}
@@ -0,0 +1,18 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import time
+from Clock import ManualClock, WallClock
+
+
+def test_manual_clock_only_moves_when_advanced():
+    clock = ManualClock(100)
+    assert clock() == 100
+    assert clock.advance(16) == 116
+    assert clock() == 116
+
+
+def test_wall_clock_tracks_real_time():
+    before = int(time.time() * 1000)
+    assert abs(WallClock()() - before) < 1000
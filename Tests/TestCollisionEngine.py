@@ -0,0 +1,115 @@
+import sys
+import os
+import pathlib
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+from Board import Board
+from Clock import ManualClock
+from CollisionEngine import capture_loser
+from Command import Command
+from Game import Game
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+def _game(start, batch=False):
+    board = Board(cell_H_pix=8, cell_W_pix=8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+    factory = PieceFactory(board, PIECES_ROOT)
+    pieces = [factory.create_piece(t, cell) for t, cell in start]
+    return Game(pieces=pieces, board=board, clock=ManualClock(0), headless=True, batch_physics=batch)
+
+
+def _move(game, piece_id, target):
+    game.issue_command(Command(piece_id, "move", {"target": list(target)}))
+
+
+def test_move_onto_idle_enemy_captures_it():
+    for batch in (False, True):
+        game = _game([("RW", (7, 0)), ("PB", (3, 0))], batch)
+        _move(game, "RW_7_0", (3, 0))
+
+        game.advance(3000)
+
+        assert "PB_3_0" not in game.pieces
+        rook = game.pieces["RW_7_0"]
+        assert rook.cell == (3, 0)
+        assert game.get_piece_at(3, 0) is rook
+
+
+def test_jumping_piece_captures_the_piece_landing_on_it():
+    game = _game([("RW", (7, 0)), ("PB", (3, 0))])
+    _move(game, "RW_7_0", (3, 0))
+    enter_ms = game.pieces["RW_7_0"].state_manager.current_move()[2].cells[-1][2]
+
+    game.advance(enter_ms - 100)
+    game.issue_command(Command("PB_3_0", "jump", {}))
+    game.advance(3000)
+
+    assert "RW_7_0" not in game.pieces
+    assert game.get_piece_at(3, 0).piece_id == "PB_3_0"
+    assert game.get_piece_at(7, 0) is None
+
+
+def test_first_piece_into_a_cell_wins_head_on():
+    game = _game([("RW", (7, 0)), ("RB", (1, 0))])
+    _move(game, "RW_7_0", (3, 0))
+    game.advance(300)
+    _move(game, "RB_1_0", (5, 0))
+
+    game.advance(4000)
+
+    assert list(game.pieces) == ["RW_7_0"]
+    assert game.pieces["RW_7_0"].cell == (3, 0)
+
+
+def test_friends_pass_each_other():
+    game = _game([("RW", (7, 0)), ("QW", (3, 0))])
+    _move(game, "RW_7_0", (4, 0))
+    _move(game, "QW_3_0", (5, 0))
+
+    game.advance(4000)
+
+    assert game.pieces["RW_7_0"].cell == (4, 0)
+    assert game.pieces["QW_3_0"].cell == (5, 0)
+
+
+def test_only_traversed_cells_are_reserved():
+    game = _game([("RW", (7, 0)), ("PB", (1, 7)), ("PW", (6, 7))])
+    _move(game, "RW_7_0", (4, 0))
+
+    assert set(game.collisions._cells) == {(7, 0), (6, 0), (5, 0), (4, 0)}
+    assert [p.piece_id for p in game.collisions.landing((4, 0))] == ["RW_7_0"]
+
+    game.advance(3000)
+    assert len(game.collisions) == 0
+    assert game.collisions._cells == {}
+
+
+def _flags(player_one, capture, captured):
+    return SimpleNamespace(player_one=player_one, can_capture=lambda: capture, can_be_captured=lambda: captured)
+
+
+def test_capture_loser_rules():
+    mover = _flags(True, True, False)
+    assert capture_loser(_flags(False, False, True), mover).player_one is False    # עומד - נתפס
+    assert capture_loser(_flags(False, True, False), mover) is mover               # קופץ / הגיע קודם
+    assert capture_loser(_flags(True, False, True), mover) is None                 # אותו שחקן
+
+
+def _select_and_move(game, player, cell, target):
+    player.cursor = [cell[1], cell[0]]
+    game._handle_select_or_move(player)
+    player.cursor = [target[1], target[0]]
+    game._handle_select_or_move(player)
+
+
+def test_player_may_move_onto_enemy_but_not_onto_a_friends_landing():
+    game = _game([("RW", (7, 0)), ("QW", (3, 3)), ("PB", (3, 0))])
+
+    _select_and_move(game, game.player1, (7, 0), (3, 0))
+    assert game.pieces["RW_7_0"].state_name == "move"
+
+    _select_and_move(game, game.player1, (3, 3), (3, 0))    # הצריח כבר בדרך לשם
+    assert game.pieces["QW_3_3"].state_name == "idle"
@@ -0,0 +1,88 @@
+import sys
+import os
+import io
+import pathlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import pytest
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from CommandJournal import CommandJournal, CommandReplayer, read_journal
+from Game import Game
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parents[1] / "pieces"
+
+
+def _board():
+    return Board(cell_H_pix=8, cell_W_pix=8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+
+
+def test_roundtrip_preserves_commands(tmp_path):
+    path = tmp_path / "game.ctdj"
+    cmds = [
+        Command("PW_6_0", "move", {"target": [4, 0]}, timestamp_ms=1500),
+        Command("NB_0_1", "jump", {}, timestamp_ms=2000),
+        Command("KW_7_4", "idle", {}),
+    ]
+    with CommandJournal(path, start_ms=1000) as journal:
+        for cmd in cmds:
+            journal.append(cmd)
+
+    start_ms, loaded = read_journal(path)
+
+    assert start_ms == 1000
+    assert [repr(c) for c in loaded] == [repr(c) for c in cmds]
+
+
+def test_truncated_journal_raises():
+    buf = io.BytesIO()
+    journal = CommandJournal(buf, start_ms=0)
+    journal.append(Command("p", "move", {"target": [1, 1]}, timestamp_ms=5))
+    data = buf.getvalue()
+
+    with pytest.raises(ValueError):
+        read_journal(io.BytesIO(data[:-3]))
+    with pytest.raises(ValueError):
+        read_journal(io.BytesIO(b"XXXX" + data[4:]))
+
+
+def _recorded_game():
+    board = _board()
+    factory = PieceFactory(board, PIECES_ROOT)
+    pieces = [factory.create_piece("PW", (6, 0)), factory.create_piece("NW", (7, 1))]
+    return Game(pieces, board, clock=ManualClock(10_000), headless=True)
+
+
+def test_game_journals_issued_commands_and_replay_is_deterministic():
+    game = _recorded_game()
+    buf = io.BytesIO()
+    game.journal = CommandJournal(buf, start_ms=game.game_time_ms())
+    game.advance(100)
+    game.issue_command(Command("PW_6_0", "move", {"target": [4, 0]}))
+    game.advance(250)
+    game.issue_command(Command("NW_7_1", "move", {"target": [5, 2]}))
+    game.advance(1200)
+    recorded = {pid: (p.cell, p.state_name) for pid, p in game.pieces.items()}
+    assert game.journal.count == 2
+
+    replayer = CommandReplayer.from_file(io.BytesIO(buf.getvalue()))
+    results = []
+    for _ in range(2):
+        replay = _recorded_game()
+        replayer.run(replay, until_ms=game.game_time_ms())
+        results.append({pid: (p.cell, p.state_name) for pid, p in replay.pieces.items()})
+
+    assert results[0] == results[1] == recorded
+
+
+def test_replay_at_speed_sleeps_scaled_time():
+    slept = []
+    game = _recorded_game()
+    replayer = CommandReplayer(10_000, [Command("PW_6_0", "move", {"target": [5, 0]}, timestamp_ms=12_000)])
+
+    replayer.run(game, speed=4, sleep=slept.append)
+
+    assert slept == [0.5]
+    assert game.game_time_ms() == 12_000
@@ -0,0 +1,184 @@
+import sys
+import os
+import csv
+import enum
+import json
+import pathlib
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import Game as game_module
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from FrameProfiler import FrameProfiler, PHASES
+from Game import Game
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+class FakeClock:
+    """perf_counter_ns מזויף - כל קריאה מתקדמת ב-step_ms"""
+    def __init__(self, step_ms):
+        self.ns = 0
+        self.step_ns = int(step_ms * 1e6)
+
+    def __call__(self):
+        self.ns += self.step_ns
+        return self.ns
+
+
+def _run_frames(profiler, n):
+    for _ in range(n):
+        with profiler.phase("update"):
+            pass
+        with profiler.phase("show"):
+            pass
+        profiler.end_frame()
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = FrameProfiler(clock=FakeClock(1))
+
+    assert profiler.phase("update") is profiler.phase("show")
+    _run_frames(profiler, 5)
+    profiler.count("update", ["PW"])
+
+    assert profiler.frames == 0
+    assert profiler.summary()["counts"]["update"] == {}
+
+
+def test_phases_and_frames_are_timed():
+    profiler = FrameProfiler(enabled=True, clock=FakeClock(2))
+    _run_frames(profiler, 3)
+
+    phases = profiler.summary()["phases_ms"]
+    assert phases["update"]["mean"] == 2.0
+    assert phases["show"]["mean"] == 2.0
+    assert phases["sleep"]["mean"] == 0.0
+    assert phases["frame"]["max"] == 10.0    # 5 קריאות שעון בכל פריים
+    assert profiler.histogram()["<=12ms"] == 3
+
+
+def test_ring_buffer_keeps_the_last_frames():
+    profiler = FrameProfiler(enabled=True, history=4, clock=FakeClock(1))
+    _run_frames(profiler, 10)
+
+    assert profiler.frames == 10
+    assert len(profiler.recent()) == 4
+    assert sum(profiler.histogram().values()) == 4
+
+
+def test_dump_json_and_csv(tmp_path):
+    profiler = FrameProfiler(enabled=True, history=8, clock=FakeClock(1))
+    _run_frames(profiler, 10)
+
+    profiler.dump(tmp_path / "out" / "profile.json")
+    profiler.dump(tmp_path / "profile.csv")
+
+    with open(tmp_path / "out" / "profile.json") as f:
+        assert json.load(f)["frames"] == 10
+    with open(tmp_path / "profile.csv") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["frame", *PHASES, "frame_ms"]
+    assert [r[0] for r in rows[1:]] == [str(i) for i in range(2, 10)]
+
+
+def test_periodic_dump(tmp_path):
+    path = tmp_path / "profile.json"
+    profiler = FrameProfiler(enabled=True, dump_path=path, dump_every_frames=4, clock=FakeClock(1))
+
+    _run_frames(profiler, 3)
+    assert not path.exists()
+    _run_frames(profiler, 1)
+    assert path.exists()
+
+
+def test_phases_timed_on_another_thread_are_not_lost():
+    local = threading.local()
+
+    def clock():
+        # שעון נפרד לכל thread - כל קריאה מתקדמת ב-1ms
+        local.ns = getattr(local, "ns", 0) + 1000000
+        return local.ns
+
+    profiler = FrameProfiler(enabled=True, history=100000, clock=clock)
+    n = 20000
+
+    def simulate():
+        for _ in range(n):
+            with profiler.phase("update"):
+                pass
+    sim = threading.Thread(target=simulate)
+    sim.start()
+    while sim.is_alive():
+        with profiler.phase("show"):
+            pass
+        profiler.end_frame()
+    sim.join()
+    profiler.end_frame()
+
+    update = list(PHASES).index("update")
+    assert profiler.recent()[:, update].sum() == n
+
+
+def test_summary_sees_whole_count_calls():
+    profiler = FrameProfiler(enabled=True, clock=FakeClock(1))
+    batch = 100
+
+    def simulate():
+        # כמו ב-Game.step - generator על הכלים שעודכנו בטיק
+        for _ in range(2000):
+            profiler.count("update", (t for t in ["PW"] * batch))
+    sim = threading.Thread(target=simulate)
+    sim.start()
+    seen = []
+    while sim.is_alive():
+        seen.append(profiler.summary()["counts"]["update"].get("PW", 0))
+    sim.join()
+
+    assert all(n % batch == 0 for n in seen)
+    assert profiler.summary()["counts"]["update"]["PW"] == 2000 * batch
+
+
+def test_game_counts_updates_per_piece_type():
+    board = Board(cell_H_pix=8, cell_W_pix=8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+    factory = PieceFactory(board, PIECES_ROOT)
+    pieces = [factory.create_piece("PW", (6, c)) for c in range(3)] + [factory.create_piece("KB", (0, 4))]
+    profiler = FrameProfiler(enabled=True)
+    game = Game(pieces=pieces, board=board, clock=ManualClock(0), headless=True, profiler=profiler)
+
+    game.step(0)
+    game.issue_command(Command("PW_6_0", "move", {"target": [5, 0]}))
+    game.advance(3000)
+
+    counts = profiler.summary()["counts"]["update"]
+    assert counts["KB"] == 1
+    assert counts["PW"] > 3
+
+
+class FakeKey(enum.Enum):
+    left = 1
+    up = 2
+    right = 3
+    down = 4
+    enter = 5
+    space = 6
+    esc = 7
+
+
+class FakeKeyCode:
+    def __init__(self, char):
+        self.char = char
+
+
+def test_overlay_key_turns_profiling_on(monkeypatch):
+    monkeypatch.setattr(game_module, "KeyCode", FakeKeyCode)
+    monkeypatch.setattr(game_module, "Key", FakeKey)
+    board = Board(cell_H_pix=8, cell_W_pix=8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+    game = Game(pieces=[], board=board, headless=True)
+
+    game._handle_input(FakeKeyCode("p"))
+
+    assert game.profiler.overlay and game.profiler.enabled
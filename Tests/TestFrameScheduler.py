@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import pytest
+from Clock import ManualClock
+from FrameScheduler import FrameScheduler
+
+
+def _scheduler(**kwargs):
+    clock = ManualClock(0)
+    sched = FrameScheduler(clock, sleep=lambda s: clock.advance(round(s * 1000)), **kwargs)
+    sched.start()
+    return clock, sched
+
+
+def test_ticks_are_evenly_spaced_regardless_of_frame_time():
+    clock, sched = _scheduler(tick_hz=50)
+
+    assert sched.due_ticks() == [0]
+    clock.advance(45)   # פריים איטי
+    assert sched.due_ticks() == [20, 40]
+    clock.advance(5)
+    assert sched.due_ticks() == []
+    clock.advance(10)
+    assert sched.due_ticks() == [60]
+
+
+def test_falling_far_behind_drops_and_counts_ticks():
+    clock, sched = _scheduler(tick_hz=100, max_ticks_per_frame=3)
+    sched.due_ticks()
+
+    clock.advance(100)
+    due = sched.due_ticks()
+
+    assert due == [10, 20, 30]
+    assert sched.missed_ticks == 7
+    clock.advance(10)
+    assert sched.due_ticks() == [110]
+
+
+def test_render_cadence_is_independent_and_counts_missed_frames():
+    clock, sched = _scheduler(tick_hz=100, render_hz=25)
+
+    assert sched.render_due()
+    clock.advance(20)
+    assert not sched.render_due()
+    clock.advance(20)
+    assert sched.render_due()
+    clock.advance(100)
+    assert sched.render_due()
+    assert sched.missed_frames == 1   # 80 ו-120 הוצגו כפריים אחד
+
+
+def test_wait_sleeps_until_next_deadline():
+    clock, sched = _scheduler(tick_hz=50, render_hz=10)
+    sched.due_ticks()
+    sched.render_due()
+    clock.advance(3)
+
+    sched.wait()
+
+    assert clock() == 20
+
+
+def test_invalid_rate_raises():
+    with pytest.raises(ValueError):
+        FrameScheduler(ManualClock(), tick_hz=0)
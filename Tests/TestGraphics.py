@@ -28,122 +28,98 @@ class TestGraphics(unittest.TestCase):
         }
 
     @patch("Graphics.Img")  # תיקון נוסף: patch על המקום הנכון
-    @patch("pathlib.Path.is_dir", return_value=True)
-    def test_init_loads_frames(self, mock_is_dir, mock_img_class):
-        # יצירת mock directories
-        mock_idle_dir = MagicMock(spec=Path)
-        mock_idle_dir.name = "idle"
-        mock_idle_dir.is_dir.return_value = True
-        mock_idle_dir.glob.return_value = [Path("1.png"), Path("2.png")]
-        
-        mock_move_dir = MagicMock(spec=Path)
-        mock_move_dir.name = "move"
-        mock_move_dir.is_dir.return_value = True
-        mock_move_dir.glob.return_value = [Path("1.png"), Path("2.png")]
-        
-        # mock instance של Img
-        mock_img_instance = MagicMock(spec=Img)
-        mock_img_class.return_value = mock_img_instance
-        
-        with patch.object(Path, 'iterdir', return_value=[mock_idle_dir, mock_move_dir]):
-            g = Graphics(sprites_folder=self.test_dir, board=self.mock_board)
-            
-            self.assertIn("idle", g.frames_by_state)
-            self.assertIn("move", g.frames_by_state)
-            self.assertEqual(len(g.frames_by_state["idle"]), 2)
-            self.assertEqual(len(g.frames_by_state["move"]), 2)
-            self.assertEqual(g.current_state, "idle")
-            self.assertEqual(g.current_frame, 0)
-
-    def test_copy_creates_shallow_copy(self):
-        g = Graphics.__new__(Graphics)
-        g.frame_time_ms = 100
-        g.loop = True
-        g.board = self.mock_board
-        g.frames_by_state = self.mock_frames
-        g.current_state = "idle"
-        g.current_frame = 1
-        g.last_update_ms = 1234
-        g.finished = False
-        
+    def test_init_loads_frames(self, mock_img_class):
+        self.mock_board.cell_W_pix = 8
+        self.mock_board.cell_H_pix = 8
+        sprites_dir = MagicMock(spec=Path)
+        sprites_dir.glob.return_value = [Path("2.png"), Path("1.png")]
+
+        g = Graphics(sprites_folder=sprites_dir, board=self.mock_board)
+
+        self.assertEqual(len(g.frames), 2)
+        self.assertEqual([c.args for c in mock_img_class.return_value.read.call_args_list],
+                         [("1.png",), ("2.png",)])    # לפי סדר השמות
+        self.assertIsNone(g.start_ms)
+        self.assertIs(g.get_img(), g.frames[0])
+
+    def test_copy_shares_frames_and_restarts(self):
+        g = Graphics(None, self.mock_board, loop=False, fps=10, frames=self.mock_frames["idle"])
+        g.update(1234)
+
         g_copy = g.copy()
-        
+
         self.assertEqual(g_copy.frame_time_ms, g.frame_time_ms)
         self.assertEqual(g_copy.loop, g.loop)
         self.assertEqual(g_copy.board, g.board)
-        self.assertIs(g_copy.frames_by_state, g.frames_by_state)  # shallow copy - אותו אובייקט
-        self.assertEqual(g_copy.current_state, g.current_state)
-        self.assertEqual(g_copy.current_frame, g.current_frame)
-        self.assertEqual(g_copy.last_update_ms, g.last_update_ms)
-        self.assertEqual(g_copy.finished, g.finished)
-
-    def test_reset_sets_state_and_resets_frame(self):
-        g = Graphics.__new__(Graphics)
-        g.frames_by_state = self.mock_frames
-        g.current_state = "move"
-        g.current_frame = 3
-        g.last_update_ms = 1000
-        g.finished = True
-        
-        class Cmd:
-            def __init__(self, type):
-                self.type = type
-        
-        cmd = Cmd("idle")
-        g.reset(cmd)
-        
-        self.assertEqual(g.current_state, "idle")
-        self.assertEqual(g.current_frame, 0)
-        self.assertIsNone(g.last_update_ms)
-        self.assertFalse(g.finished)
-        
-        # בדיקה עבור סוג שלא קיים
-        cmd2 = Cmd("jump")
-        g.reset(cmd2)
-        self.assertEqual(g.current_state, "idle")  # כי "jump" לא קיים ב frames_by_state
-
-    def test_update_advances_frame_correctly(self):
-        g = Graphics.__new__(Graphics)
-        g.frame_time_ms = 100
-        g.loop = True
-        g.frames_by_state = self.mock_frames
-        g.current_state = "idle"
-        g.current_frame = 0
-        g.last_update_ms = None
-        g.finished = False
-        
-        # קריאה ראשונה - רק מגדירה last_update_ms
+        self.assertIs(g_copy.frames, g.frames)    # shallow copy - אותם פריימים
+        self.assertIsNone(g_copy.start_ms)
+        self.assertEqual(g.start_ms, 1234)
+
+    def test_reset_starts_at_the_command_time(self):
+        g = Graphics(None, self.mock_board, fps=10, frames=self.mock_frames["move"])
+        g.update(500)
+
+        g.reset(Command("p", "move", {}, 1000))
+        self.assertEqual(g.start_ms, 1000)
+        self.assertIs(g.get_img(1050), self.mock_frames["move"][0])
+        self.assertIs(g.get_img(1100), self.mock_frames["move"][1])
+
+        # בלי זמן - השעון מתחיל בעדכון הבא
+        g.reset(None)
+        self.assertIsNone(g.start_ms)
+        self.assertIs(g.get_img(5000), self.mock_frames["move"][0])
+
+    def test_update_only_starts_the_clock(self):
+        g = Graphics(None, self.mock_board, fps=10, frames=self.mock_frames["idle"])
+
         g.update(1000)
-        self.assertEqual(g.last_update_ms, 1000)
-        self.assertEqual(g.current_frame, 0)
-        
-        # זמן עבר מספיק כדי להתקדם פריים אחד
         g.update(1110)
-        self.assertEqual(g.current_frame, 1)
-        self.assertEqual(g.last_update_ms, 1100)
-        
-        # עוד פריים אחד (עוברים בלולאה)
         g.update(1220)
-        self.assertEqual(g.current_frame, 0)  # מחזור ב-loop=True
-        self.assertEqual(g.last_update_ms, 1200)
-        
-        # אם לא בלולאה, לא חוזר לפריים 0
-        g.loop = False
-        g.current_frame = 1
-        g.last_update_ms = 1200
-        g.finished = False
-        g.update(1330)
-        self.assertEqual(g.current_frame, 1)  # נשאר באחרון
-        self.assertTrue(g.finished)
-
-    def test_get_img_returns_correct_frame(self):
-        g = Graphics.__new__(Graphics)
-        g.frames_by_state = self.mock_frames
-        g.current_state = "idle"
-        g.current_frame = 1
-        
-        img = g.get_img()
-        self.assertEqual(img, self.mock_frames["idle"][1])
+
+        self.assertEqual(g.start_ms, 1000)
+        self.assertEqual(g.current_frame(1110), 1)
+        self.assertEqual(g.current_frame(1220), 0)    # מחזור ב-loop=True
+
+    def test_get_img_without_frames(self):
+        g = Graphics(None, self.mock_board, frames=[])
+        g.update(0)
+
+        self.assertIsNone(g.get_img(100))
+        self.assertTrue(g.is_finished(100))
+
+    def _animation(self, loop):
+        frames = [MagicMock(spec=Img) for _ in range(3)]
+        g = Graphics(None, self.mock_board, loop=loop, fps=10, frames=frames)
+        g.reset()
+        g.update(1000)    # מצב בלי זמן - השעון מתחיל בעדכון הראשון
+        return g, frames
+
+    def test_frame_is_computed_from_the_start_time(self):
+        g, frames = self._animation(loop=True)
+
+        self.assertIs(g.get_img(1000), frames[0])
+        self.assertIs(g.get_img(1250), frames[2])
+        self.assertIs(g.get_img(1300), frames[0])    # מחזור
+        self.assertIs(g.get_img(1150), frames[1])    # גם אחורה בזמן - אין מצב שמתקדם
+        g.update(5000)
+        self.assertEqual(g.start_ms, 1000)
+        self.assertFalse(g.is_finished(9000))
+
+    def test_non_looping_animation_stays_on_its_last_frame(self):
+        g, frames = self._animation(loop=False)
+
+        self.assertIs(g.get_img(5000), frames[2])
+        self.assertFalse(g.is_finished(1299))
+        self.assertTrue(g.is_finished(1300))
+
+    def test_next_change(self):
+        g, _ = self._animation(loop=True)
+        self.assertEqual(g.next_change_ms(1000), 1100)
+        self.assertEqual(g.next_change_ms(1250), 1300)
+
+        g, _ = self._animation(loop=False)
+        self.assertEqual(g.next_change_ms(1150), 1200)
+        self.assertIsNone(g.next_change_ms(1200))
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
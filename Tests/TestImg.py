@@ -0,0 +1,80 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import numpy as np
+import pytest
+from img import Img
+
+
+def _img(arr):
+    i = Img()
+    i.img = arr
+    return i
+
+
+def test_opaque_sprite_is_copied_onto_bgra_canvas():
+    canvas = _img(np.zeros((10, 10, 4), np.uint8))
+    sprite = _img(np.full((4, 4, 3), 200, np.uint8))
+
+    sprite.draw_on(canvas, 2, 3)
+
+    assert (canvas.img[3:7, 2:6, :3] == 200).all()
+    assert (canvas.img[3:7, 2:6, 3] == 255).all()
+    assert (canvas.img[0, 0] == 0).all()
+    # הספרייט עצמו לא משתנה (אין המרת צבע על המקור)
+    assert sprite.img.shape[2] == 3
+
+
+def test_alpha_sprite_matches_float_blend():
+    rng = np.random.default_rng(0)
+    bg = rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)
+    sprite_px = rng.integers(0, 256, (8, 8, 4), dtype=np.uint8)
+    canvas = _img(bg.copy())
+    sprite = _img(sprite_px)
+
+    sprite.draw_on(canvas, 0, 0)
+
+    a = sprite_px[..., 3:4] / 255.0
+    expected = (1 - a) * bg + a * sprite_px[..., :3]
+    assert np.abs(canvas.img.astype(int) - expected).max() <= 1
+
+
+def test_blend_buffers_are_cached_per_canvas_layout():
+    sprite = _img(np.full((2, 2, 4), 128, np.uint8))
+    sprite.draw_on(_img(np.zeros((4, 4, 3), np.uint8)), 0, 0)
+    cached = sprite._blend_cache[3]
+
+    sprite.draw_on(_img(np.zeros((4, 4, 3), np.uint8)), 1, 1)
+
+    assert sprite._blend_cache[3] is cached
+
+
+def test_draw_outside_canvas_raises():
+    canvas = _img(np.zeros((4, 4, 3), np.uint8))
+    sprite = _img(np.zeros((3, 3, 3), np.uint8))
+    with pytest.raises(ValueError):
+        sprite.draw_on(canvas, 2, 2)
+
+
+def test_clipped_draws_add_up_to_one_draw():
+    rng = np.random.default_rng(3)
+    sprite = _img(rng.integers(0, 256, (12, 12, 4), dtype=np.uint8))
+    whole = _img(rng.integers(0, 256, (32, 32, 3), dtype=np.uint8))
+    pieces = whole.copy()
+
+    sprite.draw_on(whole, 5, 9)
+    for clip in [(0, 0, 16, 16), (16, 0, 32, 16), (0, 16, 16, 32), (16, 16, 32, 32), (40, 40, 50, 50)]:
+        sprite.draw_on(pieces, 5, 9, clip)
+
+    assert np.array_equal(whole.img, pieces.img)
+
+
+def test_sprite_above_the_canvas_is_clipped():
+    canvas = _img(np.zeros((8, 8, 3), np.uint8))
+    sprite = _img(np.full((4, 4, 3), 9, np.uint8))
+
+    sprite.draw_on(canvas, 2, -3)
+
+    assert (canvas.img[0, 2:6] == 9).all()
+    assert canvas.img[1:].sum() == 0 and canvas.img[0, :2].sum() == 0
@@ -38,4 +38,74 @@ def test_invalid_rule_file():
         path = pathlib.Path(f.name)
     with pytest.raises(ValueError):
         Moves(path, dims=(8, 8))
-    path.unlink()
\ No newline at end of file
+    path.unlink()
+
+@pytest.fixture
+def pawn_rules_file():
+    with tempfile.NamedTemporaryFile("w+", delete=False, suffix=".txt") as f:
+        f.write("-1,0:non_capture\n")
+        f.write("-2,0:1st\n")
+        f.write("-1,-1:capture\n")
+        f.write("-1,1:capture\n")
+        path = pathlib.Path(f.name)
+    yield path
+    path.unlink()
+
+def test_capture_tags_are_enforced(pawn_rules_file):
+    moves = Moves(pawn_rules_file, dims=(8, 8))
+    assert moves.is_valid_move((6, 3), (5, 3))
+    assert not moves.is_valid_move((6, 3), (5, 3), is_capture=True)
+    assert moves.is_valid_move((6, 3), (5, 4), is_capture=True)
+    assert not moves.is_valid_move((6, 3), (5, 4))
+
+def test_first_move_tag_is_enforced(pawn_rules_file):
+    moves = Moves(pawn_rules_file, dims=(8, 8))
+    assert moves.is_valid_move((6, 3), (4, 3), is_first_move=True)
+    assert not moves.is_valid_move((6, 3), (4, 3))
+
+def test_untagged_rule_allows_both(tmp_rules_file):
+    moves = Moves(tmp_rules_file, dims=(8, 8))
+    assert moves.is_valid_move((3, 3), (5, 4))
+    assert moves.is_valid_move((3, 3), (5, 4), is_capture=True)
+    assert not moves.is_valid_move((3, 3), (3, 4))
+    assert not moves.is_valid_move((7, 7), (9, 8))
+
+def test_origin_off_the_board_is_not_a_move(tmp_rules_file):
+    moves = Moves(tmp_rules_file, dims=(8, 8))
+    assert moves.get_move_flags((-1, 0), (1, 1)) == 0      # אותו היסט כמו 2,1
+    assert moves.get_move_flags((-20, 0), (1, 1)) == 0
+    assert not moves.is_valid_move((8, 8), (7, 6))
+
+def test_get_moves_is_cached(tmp_rules_file):
+    moves = Moves(tmp_rules_file, dims=(8, 8))
+    assert moves.get_moves(3, 3) is moves.get_moves(3, 3)
+
+def test_unknown_tag_raises():
+    with tempfile.NamedTemporaryFile("w+", delete=False, suffix=".txt") as f:
+        f.write("1,0:teleport\n")
+        path = pathlib.Path(f.name)
+    with pytest.raises(ValueError):
+        Moves(path, dims=(8, 8))
+    path.unlink()
+
+def test_capture_and_first_move_rules_for_one_offset():
+    with tempfile.NamedTemporaryFile("w+", delete=False, suffix=".txt") as f:
+        f.write("-2,0:capture\n")
+        f.write("-2,0:1st\n")
+        path = pathlib.Path(f.name)
+    moves = Moves(path, dims=(8, 8))
+    path.unlink()
+    # התפיסה מותרת תמיד, הצעד השקט רק במהלך הראשון
+    assert moves.is_valid_move((6, 3), (4, 3), is_capture=True)
+    assert moves.is_valid_move((6, 3), (4, 3), is_first_move=True)
+    assert not moves.is_valid_move((6, 3), (4, 3))
+
+def test_plain_rule_lifts_the_first_move_restriction():
+    with tempfile.NamedTemporaryFile("w+", delete=False, suffix=".txt") as f:
+        f.write("-2,0:1st\n")
+        f.write("-2,0:non_capture\n")
+        path = pathlib.Path(f.name)
+    moves = Moves(path, dims=(8, 8))
+    path.unlink()
+    assert moves.is_valid_move((6, 3), (4, 3))
+    assert not moves.is_valid_move((6, 3), (4, 3), is_capture=True)
@@ -0,0 +1,96 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from OccupancyGrid import OccupancyGrid
+from Piece import Piece
+
+
+def _piece(pid, cell, player_one=True, state="idle"):
+    return SimpleNamespace(piece_id=pid, piece_type=pid, cell=cell, player_one=player_one,
+                           state_name=state, moves=None, occupancy=None)
+
+
+def test_get_returns_piece_on_cell():
+    grid = OccupancyGrid(8, 8)
+    p = _piece("PW_6_0", (6, 0))
+    grid.add(p)
+
+    assert grid.get(6, 0) is p
+    assert grid.get(5, 0) is None
+    assert grid.get(-1, 99) is None
+    assert p.occupancy is grid
+
+
+def test_move_updates_cells():
+    grid = OccupancyGrid(8, 8)
+    p = _piece("PW_6_0", (6, 0))
+    grid.add(p)
+
+    grid.move(p, (6, 0), (4, 0))
+
+    assert grid.get(6, 0) is None
+    assert grid.get(4, 0) is p
+
+
+def test_move_does_not_clear_cell_taken_by_other_piece():
+    grid = OccupancyGrid(8, 8)
+    a = _piece("a", (1, 1))
+    b = _piece("b", (2, 2))
+    grid.add(a)
+    grid.add(b)
+    grid.move(b, (2, 2), (1, 1))   # b נוחת על a
+
+    grid.move(a, (1, 1), (0, 0))
+
+    assert grid.get(1, 1) is b
+    assert grid.get(0, 0) is a
+
+
+def test_player_and_state_queries():
+    grid = OccupancyGrid(8, 8)
+    w = _piece("w", (7, 0), player_one=True)
+    b = _piece("b", (0, 0), player_one=False)
+    grid.add(w)
+    grid.add(b)
+
+    grid.set_state(w, "idle", "move")
+
+    assert grid.pieces_of_player(True) == [w]
+    assert grid.pieces_of_player(False) == [b]
+    assert grid.pieces_in_state("move") == [w]
+    assert grid.pieces_in_state("idle") == [b]
+
+
+def test_remove_frees_slot_for_reuse():
+    grid = OccupancyGrid(8, 8)
+    a = _piece("a", (1, 1))
+    grid.add(a)
+    grid.remove(a)
+    b = _piece("b", (2, 2))
+    grid.add(b)
+
+    assert grid.get(1, 1) is None
+    assert grid.get(2, 2) is b
+    assert len(grid) == 1
+    assert a.occupancy is None
+
+
+def test_piece_update_reports_cell_and_state_changes():
+    sm = MagicMock()
+    sm.state_name = "idle"
+    sm.get_position.return_value = (6, 0)
+    piece = Piece("PW", True, sm, moves=None)
+    grid = OccupancyGrid(8, 8)
+    grid.add(piece)
+
+    sm.state_name = "long_rest"
+    sm.get_position.return_value = [4, 0]
+    piece.update(1000)
+
+    assert piece.cell == (4, 0)
+    assert grid.get(4, 0) is piece
+    assert grid.get(6, 0) is None
+    assert grid.pieces_in_state("long_rest") == [piece]
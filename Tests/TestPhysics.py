@@ -2,7 +2,7 @@ import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
 
-from Physics import IdlePhysics, MovePhysics
+from Physics import IdlePhysics, MovePhysics, LongRestPhysics
 from Board import Board
 from Command import Command
 from unittest.mock import MagicMock
@@ -24,4 +24,18 @@ def test_move_physics_updates_position():
     physics.update(1000)
     pos_after = physics.get_pos()
 
-    assert physics.finished is True
\ No newline at end of file
+    assert physics.finished is True
+
+def test_finished_physics_returns_one_command_stamped_with_game_time():
+    board = MagicMock(spec=Board)
+    physics = LongRestPhysics((0, 0), board)
+    physics.reset(Command(1, "long_rest", {}, 0))
+    physics.update(100)
+    assert physics.get_command() is None
+
+    physics.update(2150)
+    cmd = physics.get_command()
+
+    assert cmd.type == "idle"
+    assert cmd.timestamp_ms == 2000    # זמן הסיום המדויק, לא זמן הבדיקה
+    assert physics.get_command() is cmd    # בלי הקצאה חדשה בכל בדיקה
@@ -1,5 +1,6 @@
 import sys
 import os
+import pathlib
 from unittest.mock import MagicMock
 
 # הוסף את הנתיב לתיקיית המודולים
@@ -8,6 +9,8 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 from Piece import Piece
 from Command import Command
 from State import State
+from Board import Board
+from PieceFactory import PieceFactory
 
 def test_piece_on_command_updates_state():
     # Mock של מצב ש-Piece ישתמש בו
@@ -44,4 +47,21 @@ def test_piece_update():
     piece.update(2000)
     
     # בדיקה שהמתודה הנכונה נקראה
-    mock_state.update.assert_called_once_with(2000)
\ No newline at end of file
+    mock_state.update.assert_called_once_with(2000)
+
+def test_refused_move_keeps_the_first_move():
+    board = Board(cell_H_pix=8, cell_W_pix=8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+    factory = PieceFactory(board, pathlib.Path(__file__).resolve().parent.parent / "pieces")
+    pawn = factory.create_piece("PW", (6, 0))
+
+    pawn.on_command(Command(pawn.piece_id, "jump", {}, 0))
+    pawn.on_command(Command(pawn.piece_id, "move", {"target": [5, 0]}, 100))    # באמצע קפיצה - נדחית
+    pawn.update(5000)
+    assert pawn.state_name == "idle" and pawn.cell == (6, 0)
+    assert pawn.move_count == 0
+    assert pawn.moves.is_valid_move(pawn.cell, (4, 0), is_first_move=pawn.move_count == 0)
+
+    pawn.on_command(Command(pawn.piece_id, "move", {"target": [4, 0]}, 5000))
+    pawn.update(10000)
+    assert pawn.cell == (4, 0)
+    assert pawn.move_count == 1
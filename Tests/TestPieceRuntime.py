@@ -0,0 +1,131 @@
+import sys
+import os
+import pathlib
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+from Board import Board
+from Command import Command
+from GraphicsFactory import GraphicsFactory
+from PhysicsFactory import PhysicsFactory
+from PieceFactory import PieceFactory
+from PieceRuntime import PieceRuntime
+from PieceType import load_piece_type
+from State import StateManager
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+def _board(cells=8):
+    return Board(cell_H_pix=16, cell_W_pix=16, cell_H_m=1, cell_W_m=1, W_cells=cells, H_cells=cells, img=None)
+
+
+def test_state_manager_from_type_builds_a_runtime():
+    board = _board()
+    graphics_factory = GraphicsFactory(board)
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, graphics_factory)
+    sm = StateManager.from_type(piece_type, graphics_factory, PhysicsFactory(board))
+    sm.set_position((6, 0))
+
+    assert isinstance(sm, PieceRuntime) and sm.piece_type is piece_type
+    sm.process_command(Command("p", "move", {"target": [4, 0]}, 100))
+    timeline = []
+    for now in (700, 1500, 3500):
+        sm.update(now)
+        timeline.append((sm.state_name, sm.state_start_ms, sm.get_position(), sm.get_draw_info(now)[2]))
+
+    assert timeline == [("move", 100, (6, 0), 82),
+                        ("long_rest", 1433, (4, 0), 64),
+                        ("idle", 3433, (4, 0), 64)]
+
+
+def test_unknown_command_is_ignored():
+    board = _board()
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, GraphicsFactory(board))
+    runtime = PieceRuntime(piece_type, board, (6, 0))
+
+    runtime.process_command(Command("p", "long_rest", {}))
+
+    assert runtime.state_name == "idle"
+
+
+def test_large_board_pieces_share_the_type():
+    board = _board(100)
+    factory = PieceFactory(board, PIECES_ROOT)
+    pieces = [factory.create_piece("PW", (r, c)) for r in range(100) for c in range(100)]
+
+    assert len(pieces) == 10000
+    assert pieces[-1].cell == (99, 99)
+    runtimes = [p.state_manager for p in pieces]
+    assert all(rt.piece_type is factory.piece_types["PW"] for rt in runtimes)
+    assert not hasattr(runtimes[0], "__dict__")
+    assert not hasattr(pieces[0], "__dict__")
+
+
+def _transitions(update, get_state, tick_ms, until_ms=4000):
+    """(state, start_ms) of every state the piece passes through."""
+    seen = []
+    for now in range(0, until_ms, tick_ms):
+        update(now)
+        entry = get_state()
+        if not seen or seen[-1] != entry:
+            seen.append(entry)
+    return seen
+
+
+def test_timing_does_not_depend_on_update_rate():
+    board = _board()
+    graphics_factory = GraphicsFactory(board)
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, graphics_factory)
+
+    runs = []
+    for tick_ms in (33, 4):    # ~30Hz, 240Hz
+        runtime = PieceRuntime(piece_type, board, (6, 0))
+        runtime.process_command(Command("p", "move", {"target": [4, 0]}, 10))
+        runs.append(_transitions(runtime.update, lambda: (runtime.state_name, runtime.state_start_ms), tick_ms))
+
+    # 2 משבצות של מטר ב-1.5 מטר לשנייה
+    assert runs[0] == [("move", 10), ("long_rest", 1343), ("idle", 3343)]
+    assert all(run == runs[0] for run in runs)
+
+
+def test_stalled_update_catches_up_whole_chain():
+    board = _board()
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, GraphicsFactory(board))
+    runtime = PieceRuntime(piece_type, board, (6, 0))
+    runtime.process_command(Command("p", "jump", {}, 0))
+
+    runtime.update(5000)    # jump -> short_rest -> idle in one call
+
+    assert runtime.state_name == "idle"
+    assert runtime.state_start_ms == 1500
+
+
+def test_move_is_drawn_along_the_way():
+    board = _board()
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, GraphicsFactory(board))
+    runtime = PieceRuntime(piece_type, board, (6, 0))
+    runtime.process_command(Command("p", "move", {"target": [4, 0]}, 0))
+
+    ys = [runtime.get_draw_info(now)[2] for now in range(0, 1400, 100)]
+
+    assert ys[0] == 6 * 16 and ys[-1] == 4 * 16
+    assert all(a >= b for a, b in zip(ys, ys[1:]))
+    assert len(set(ys)) > 5    # לא קופץ ישר ליעד
+    assert runtime.get_position() == (6, 0)    # המשבצת הלוגית מתעדכנת רק בנחיתה
+
+
+def test_next_change_is_the_next_frame_or_now_while_moving():
+    board = _board()
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, GraphicsFactory(board))
+    runtime = PieceRuntime(piece_type, board, (6, 0))
+    assert runtime.next_change_ms(0) is None    # השעון עוד לא התחיל
+
+    runtime.update(0)
+    frame_ms = runtime.state.frame_ms
+    assert runtime.next_change_ms(10) == frame_ms
+    assert runtime.next_change_ms(frame_ms) == 2 * frame_ms
+    assert runtime.get_draw_info(frame_ms - 1)[0] is not runtime.get_draw_info(frame_ms)[0]
+
+    runtime.process_command(Command("p", "move", {"target": [4, 0]}, 100))
+    runtime.update(200)
+    assert runtime.next_change_ms(200) == 200
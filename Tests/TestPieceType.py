@@ -0,0 +1,103 @@
+import sys
+import os
+import json
+import pathlib
+import dataclasses
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import pytest
+import PieceType
+from PieceType import load_piece_type
+from Board import Board
+from GraphicsFactory import GraphicsFactory
+from Moves import Moves
+from PhysicsFactory import PhysicsFactory
+from State import StateManager
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+def _board():
+    return Board(cell_H_pix=16, cell_W_pix=16, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+
+
+def _write_piece(root, piece_config, states):
+    folder = root / "XX"
+    for name, cfg in states.items():
+        (folder / "states" / name / "sprites").mkdir(parents=True)
+        with open(folder / "states" / name / "config.json", "w") as f:
+            json.dump(cfg, f)
+    if piece_config is not None:
+        with open(folder / "config.json", "w") as f:
+            json.dump(piece_config, f)
+    return folder
+
+
+def _state_cfg(next_state):
+    return {"physics": {"speed_m_per_sec": 0.0, "next_state_when_finished": next_state},
+            "graphics": {"frames_per_sec": 6, "is_loop": True}}
+
+
+def test_each_config_read_once(monkeypatch):
+    reads = []
+    real_read = PieceType._read_json
+    monkeypatch.setattr(PieceType, "_read_json", lambda p: reads.append(p) or real_read(p))
+
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, GraphicsFactory(_board()))
+
+    assert len(reads) == len(set(reads)) == 5
+    assert piece_type.initial_state == "idle"
+    assert piece_type.states["move"].transitions == {"long_rest": "long_rest"}
+    assert piece_type.states["idle"].transitions["move"] == "move"
+
+
+def test_definition_is_immutable():
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, GraphicsFactory(_board()))
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        piece_type.initial_state = "move"
+    with pytest.raises(TypeError):
+        piece_type.states["idle"].transitions["move"] = "jump"
+
+
+def test_state_machines_share_frames():
+    board = _board()
+    graphics_factory = GraphicsFactory(board)
+    piece_type = load_piece_type(PIECES_ROOT / "PW", None, graphics_factory)
+    template = StateManager.from_type(piece_type, graphics_factory, PhysicsFactory(board))
+
+    copy = template.copy()
+    frames = copy.piece_type.states["move"].frames
+    assert copy.piece_type is piece_type
+    assert len(frames) > 0
+    assert copy.get_draw_info(0)[0] is piece_type.states["idle"].frames[0]
+
+
+def test_dangling_transition_is_rejected(tmp_path):
+    folder = _write_piece(tmp_path,
+                          {"initial_state": "idle", "states": {"idle": {"transitions": {"move": "move"}}}},
+                          {"idle": _state_cfg("idle")})
+
+    with pytest.raises(ValueError, match="unknown state 'move'"):
+        load_piece_type(folder, None, GraphicsFactory(_board()))
+
+
+def test_missing_state_folder_and_initial_state_are_rejected(tmp_path):
+    folder = _write_piece(tmp_path,
+                          {"initial_state": "rest", "states": {"idle": {}, "jump": {}}},
+                          {"idle": _state_cfg("idle")})
+
+    with pytest.raises(ValueError) as err:
+        load_piece_type(folder, None, GraphicsFactory(_board()))
+    assert "initial state 'rest'" in str(err.value)
+    assert "state 'jump' has no folder" in str(err.value)
+
+
+def test_move_trajectories_built_up_front():
+    board = _board()
+    moves = Moves(PIECES_ROOT / "NW" / "moves.txt", (8, 8))
+    piece_type = load_piece_type(PIECES_ROOT / "NW", moves, GraphicsFactory(board))
+
+    trajectories = piece_type.states["move"].trajectories
+    assert {(dr, dc) for dr, dc, _ in moves.offsets()} <= set(trajectories._moves)
+    assert piece_type.states["idle"].trajectories is None
@@ -0,0 +1,173 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import numpy as np
+from Board import Board
+from img import Img
+from PlayerInputState import PlayerInputState
+from Renderer import Renderer
+from TiledCompositor import TiledCompositor
+
+
+class FakePiece:
+    def __init__(self, piece_id, sprite, x, y):
+        self.piece_id = piece_id
+        self.sprite = sprite
+        self.x, self.y = x, y
+
+    def get_draw_info(self, now_ms=None):
+        return self.sprite, self.x, self.y
+
+
+def _img(arr):
+    i = Img()
+    i.img = arr
+    return i
+
+
+def _board(cells=4, cell=8):
+    rng = np.random.default_rng(1)
+    bg = rng.integers(0, 256, (cells * cell, cells * cell, 3), dtype=np.uint8)
+    return Board(cell_H_pix=cell, cell_W_pix=cell, cell_H_m=1, cell_W_m=1,
+                 W_cells=cells, H_cells=cells, img=_img(bg))
+
+
+def _full_redraw(board, pieces, cursors):
+    r = Renderer(board)
+    return r.render(pieces, cursors).img.copy()
+
+
+def test_first_render_draws_everything():
+    board = _board()
+    sprite = _img(np.full((8, 8, 3), 7, np.uint8))
+    r = Renderer(board)
+
+    frame = r.render([FakePiece("a", sprite, 8, 16)], [])
+
+    assert len(r.dirty_cells) == 16
+    assert (frame.img[16:24, 8:16] == 7).all()
+
+
+def test_idle_board_has_no_dirty_cells():
+    board = _board()
+    sprite = _img(np.full((8, 8, 3), 7, np.uint8))
+    pieces = [FakePiece("a", sprite, 0, 0)]
+    player = PlayerInputState(is_player_one=True)
+    r = Renderer(board)
+    r.render(pieces, [(player, (0, 255, 0))])
+
+    r.render(pieces, [(player, (0, 255, 0))])
+
+    assert r.dirty_cells == set()
+
+
+def test_moving_piece_matches_full_redraw():
+    board = _board(cells=6)
+    sprite_a = _img(np.full((8, 8, 4), 200, np.uint8))
+    sprite_b = _img(np.full((8, 8, 3), 50, np.uint8))
+    a = FakePiece("a", sprite_a, 0, 0)
+    b = FakePiece("b", sprite_b, 16, 16)
+    player = PlayerInputState(is_player_one=True)
+    cursors = [(player, (0, 255, 0))]
+    r = Renderer(board)
+    r.render([a, b], cursors)
+
+    # אמצע תנועה - הכלי חוצה ארבע משבצות, והסמן זז
+    a.x, a.y = 12, 4
+    player.cursor = [2, 2]
+    frame = r.render([a, b], cursors)
+
+    assert (frame.img == _full_redraw(board, [a, b], cursors)).all()
+    assert (0, 0) in r.dirty_cells
+    assert (5, 5) not in r.dirty_cells
+
+
+def test_removed_piece_is_erased():
+    board = _board()
+    sprite = _img(np.full((8, 8, 3), 7, np.uint8))
+    r = Renderer(board)
+    r.render([FakePiece("a", sprite, 8, 8)], [])
+
+    frame = r.render([], [])
+
+    assert (frame.img == board.img.img).all()
+
+
+def test_streamed_sprite_is_drawn_when_it_arrives():
+    board = _board()
+    sprite = Img()    # הפיקסלים עוד לא נטענו
+    pieces = [FakePiece("a", sprite, 8, 8)]
+    r = Renderer(board)
+    r.render(pieces, [])
+
+    sprite.img = np.full((8, 8, 3), 7, np.uint8)
+    frame = r.render(pieces, [])
+
+    assert r.dirty_cells == {(1, 1)}
+    assert (frame.img[8:16, 8:16] == 7).all()
+
+
+def test_tiled_composition_is_byte_identical_to_serial():
+    board = _board(cells=12, cell=8)
+    rng = np.random.default_rng(5)
+    sprites = [_img(rng.integers(0, 256, (8, 8, 4), dtype=np.uint8)) for _ in range(4)]
+    sprites.append(_img(rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)))
+    pieces = [FakePiece(str(i), sprites[i % len(sprites)], int(x), int(y))
+              for i, (x, y) in enumerate(rng.integers(0, 88, (60, 2)))]
+    player = PlayerInputState(is_player_one=True)
+    serial = Renderer(board, tiled=False)
+    tiled = Renderer(board, tiled=True)
+    tiled.compositor = TiledCompositor(board, max_workers=4, tile_cells=5)    # אריחים חלקיים בשוליים
+
+    for frame in range(5):
+        for p in pieces[frame::3]:
+            p.x, p.y = (int(v) for v in rng.integers(0, 88, 2))
+        cursors = [(player, (0, 255, 0))]
+        assert np.array_equal(serial.render(pieces, cursors).img, tiled.render(pieces, cursors).img), frame
+        assert serial.dirty_cells == tiled.dirty_cells
+    tiled.compositor.shutdown()
+
+
+def test_large_boards_are_tiled_when_there_are_cores_for_it(monkeypatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    assert Renderer(_board(cells=4)).compositor is None
+    assert Renderer(_board(cells=16)).compositor is not None
+
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    assert Renderer(_board(cells=16)).compositor is None
+
+
+def test_close_stops_the_compositor_threads():
+    renderer = Renderer(_board(cells=16), tiled=True)
+    renderer.compositor = TiledCompositor(renderer.board, max_workers=2, tile_cells=4)
+    renderer.render([FakePiece("a", _img(np.full((8, 8, 3), 7, np.uint8)), 0, 0)], [])
+    threads = list(renderer.compositor._executor._threads)
+
+    renderer.close()
+
+    assert threads and not any(t.is_alive() for t in threads)
+    Renderer(_board()).close()    # בלי compositor - לא עושה כלום
+
+
+def test_jump_from_the_first_row_is_drawn():
+    import pathlib
+    from Clock import ManualClock
+    from Command import Command
+    from Game import Game
+    from PieceFactory import PieceFactory
+    board = _board(cells=8, cell=16)
+    factory = PieceFactory(board, pathlib.Path(__file__).resolve().parent.parent / "pieces")
+    game = Game(pieces=[factory.create_piece("KB", (0, 4))], board=board, clock=ManualClock(0), headless=True)
+    renderer = Renderer(board)
+    game.issue_command(Command("KB_0_4", "jump", {}))
+
+    ys = []
+    for _ in range(20):
+        game.advance(16)
+        now = game.game_time_ms()
+        ys.append(game.pieces["KB_0_4"].get_draw_info(now)[2])
+        renderer.render(game.pieces.values(), [], now_ms=now)
+
+    assert min(ys) < 0    # הקשת יוצאת מעל הלוח
+    assert game.pieces["KB_0_4"].state_name == "jump"
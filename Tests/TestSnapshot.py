@@ -0,0 +1,221 @@
+import sys
+import os
+import pathlib
+import threading
+import time
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import numpy as np
+import pytest
+
+import Game as game_module
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from Game import Game
+from img import Img
+from PieceFactory import PieceFactory
+from Renderer import Renderer
+from Snapshot import GameSnapshot, SnapshotBuffer
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+def _board():
+    img = Img()
+    img.img = np.full((64, 64, 3), 128, np.uint8)
+    return Board(cell_H_pix=8, cell_W_pix=8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=img)
+
+
+def _pieces(board):
+    factory = PieceFactory(board, PIECES_ROOT)
+    return [factory.create_piece("RW", (7, 0)), factory.create_piece("PB", (1, 3))]
+
+
+def test_buffer_hands_over_the_newest_snapshot_once():
+    buffer = SnapshotBuffer()
+    assert buffer.take() is None
+
+    buffer.publish(GameSnapshot(1, (), ()))
+    buffer.publish(GameSnapshot(2, (), ()))
+
+    assert buffer.take().time_ms == 2
+    assert buffer.take() is None
+    assert buffer.dropped == 1
+
+
+def test_take_waits_for_a_publish():
+    buffer = SnapshotBuffer()
+    threading.Timer(0.01, buffer.publish, (GameSnapshot(7, (), ()),)).start()
+
+    assert buffer.take(timeout=2.0).time_ms == 7
+
+
+def test_snapshot_matches_the_pieces_and_does_not_follow_them():
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board, clock=ManualClock(0), headless=True)
+    game.issue_command(Command("RW_7_0", "move", {"target": [4, 0]}))
+    game.advance(200)
+
+    snapshot = game.snapshot(200)
+    rook = game.pieces["RW_7_0"]
+    assert [s.piece_id for s in snapshot.pieces] == list(game.pieces)
+    assert snapshot.pieces[0].get_draw_info() == rook.get_draw_info(200)
+    assert snapshot.cursors[0][0].is_player_one
+
+    game.advance(3000)
+    assert snapshot.pieces[0].state_name == "move"
+    assert snapshot.pieces[0][4:6] != rook.get_draw_info(3200)[1:]
+
+
+def test_pieces_are_interpolated_between_two_snapshots():
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board, clock=ManualClock(0), headless=True)
+    game.issue_command(Command("RW_7_0", "move", {"target": [4, 0]}))
+    game.advance(200)
+    first = game.snapshot(200)
+    game.advance(500)
+    second = game.snapshot(700, first)
+
+    rook, pawn = second.pieces
+    assert (rook.prev_x, rook.prev_y) == first.pieces[0][4:6]
+    assert rook.prev_y - rook.y > 4
+    assert rook.at(0.0)[4:6] == first.pieces[0][4:6]
+    assert rook.at(1.0) is rook
+    assert rook.at(0.5).y == round((rook.prev_y + rook.y) / 2)
+    assert pawn.at(0.5) is pawn
+
+    assert second.alpha(700) == 0.0
+    assert second.alpha(950) == 0.5
+    assert second.alpha(1500) == 1.0
+    assert first.alpha(1500) == 1.0    # אין קודם - מציירים את המצב האחרון
+
+
+def test_render_snapshot_draws_the_interpolated_position():
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board, clock=ManualClock(0), headless=True)
+    game.renderer = Renderer(board)
+    game.issue_command(Command("RW_7_0", "move", {"target": [4, 0]}))
+    game.advance(200)
+    first = game.snapshot(200)
+    game.advance(500)
+    second = game.snapshot(700, first)
+    halfway = second.pieces[0].at(0.5)
+
+    frame = game.render_snapshot(second, 0.5).img.copy()
+    expected = Renderer(board).render([halfway, second.pieces[1]], second.cursors).img
+
+    assert np.array_equal(frame, expected)
+
+
+def test_rendering_a_snapshot_equals_rendering_the_pieces():
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board, clock=ManualClock(0), headless=True)
+    game.issue_command(Command("RW_7_0", "move", {"target": [4, 0]}))
+    game.advance(300)
+    cursors = [(game.player1, (0, 255, 0)), (game.player2, (0, 0, 255))]
+
+    live = Renderer(board).render(game.pieces.values(), cursors, now_ms=300).img.copy()
+    snapshot = game.snapshot(300)
+    copied = Renderer(board).render(snapshot.pieces, snapshot.cursors, now_ms=snapshot.time_ms).img
+
+    assert np.array_equal(live, copied)
+
+
+def _fake_cv2(frames_until_esc):
+    shown = []
+    calls = {"waitKey": 0}
+
+    def wait_key(_):
+        calls["waitKey"] += 1
+        return 27 if len(shown) >= frames_until_esc or calls["waitKey"] > 2000 else -1
+    return SimpleNamespace(imshow=lambda name, img: shown.append(img.copy()), waitKey=wait_key,
+                           destroyAllWindows=lambda: None), shown
+
+
+def _no_keyboard(monkeypatch):
+    # pynput צריך מסך - run() רק בודק שהוא קיים, וה-listener לא מופעל
+    monkeypatch.setattr(game_module, "keyboard", SimpleNamespace())
+    monkeypatch.setattr(Game, "start_user_input_thread", lambda self: None)
+
+
+def test_run_shows_frames_published_by_the_simulation_thread(monkeypatch):
+    fake_cv2, shown = _fake_cv2(frames_until_esc=3)
+    monkeypatch.setattr(game_module, "cv2", fake_cv2)
+    _no_keyboard(monkeypatch)
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board)
+    ticks = []
+    step = game.step
+    monkeypatch.setattr(game, "step", lambda now: (ticks.append(threading.current_thread()), step(now)))
+    closed = []
+    monkeypatch.setattr(game.renderer, "close", lambda: closed.append(True))
+
+    game.run()
+
+    assert len(shown) == 3
+    assert ticks and all(t is not threading.main_thread() for t in ticks)
+    assert game._stop.is_set()
+    assert closed
+
+
+def test_run_reraises_a_simulation_error(monkeypatch):
+    fake_cv2, _ = _fake_cv2(frames_until_esc=10 ** 6)
+    monkeypatch.setattr(game_module, "cv2", fake_cv2)
+    _no_keyboard(monkeypatch)
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board)
+
+    def broken(now):
+        raise ValueError("boom")
+    monkeypatch.setattr(game, "step", broken)
+
+    with pytest.raises(ValueError):
+        game.run()
+
+
+def test_snapshots_of_a_still_board_look_alike():
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board, clock=ManualClock(0), headless=True)
+    game.step(0)
+
+    before = game.snapshot(10)
+    assert game.snapshot(20).looks_like(before)
+    game.player1.cursor = [0, 0]
+    assert not game.snapshot(30).looks_like(before)
+    frame_ms = game.pieces["RW_7_0"].state_manager.state.frame_ms
+    assert not game.snapshot(frame_ms).looks_like(game.snapshot(10))
+
+
+def test_idle_until_the_next_sprite_frame_but_not_while_moving():
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board, clock=ManualClock(0), headless=True)
+    game.step(0)
+    frame_ms = game.pieces["RW_7_0"].state_manager.state.frame_ms
+
+    assert game._idle_until_ms(10) == frame_ms
+
+    game.issue_command(Command("RW_7_0", "move", {"target": [4, 0]}))
+    game.advance(100)
+    assert game._idle_until_ms(game.game_time_ms()) is None
+
+    batched = Game(pieces=_pieces(board), board=board, clock=ManualClock(0), headless=True, batch_physics=True)
+    assert batched._idle_until_ms(10) is None
+
+
+def test_idle_game_neither_ticks_nor_shows_every_frame(monkeypatch):
+    shown = []
+    start = time.perf_counter()
+    fake_cv2 = SimpleNamespace(imshow=lambda name, img: shown.append(img), destroyAllWindows=lambda: None,
+                               waitKey=lambda _: 27 if time.perf_counter() - start > 1.0 else -1)
+    monkeypatch.setattr(game_module, "cv2", fake_cv2)
+    _no_keyboard(monkeypatch)
+    board = _board()
+    game = Game(pieces=_pieces(board), board=board)
+
+    game.run()
+
+    # אנימציית idle של 6 פריימים בשנייה - לא 60 ציורים
+    assert 2 <= len(shown) <= 20
+    assert game.scheduler.ticks <= 20
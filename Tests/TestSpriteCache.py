@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import cv2
+import numpy as np
+import pytest
+from SpriteCache import SpriteCache
+
+
+@pytest.fixture
+def png(tmp_path):
+    path = tmp_path / "1.png"
+    rng = np.random.default_rng(0)
+    cv2.imwrite(str(path), rng.integers(0, 256, (40, 30, 3), dtype=np.uint8))
+    return path
+
+
+def test_second_launch_skips_decode(tmp_path, png, monkeypatch):
+    cache_path = tmp_path / "sprites.bin"
+    first = SpriteCache(cache_path)
+    expected = first.read(png, size=(8, 8)).img.copy()
+    first.save()
+    assert first.misses == 1
+
+    # אין פענוח PNG בהפעלה השנייה
+    monkeypatch.setattr(cv2, "imread", lambda *a, **k: pytest.fail("PNG decoded despite cache hit"))
+    second = SpriteCache(cache_path)
+    img = second.read(png, size=(8, 8))
+
+    assert second.hits == 1
+    assert img.img.shape == (8, 8, 3)
+    assert (img.img == expected).all()
+
+
+def test_different_size_or_edited_file_misses(tmp_path, png):
+    cache_path = tmp_path / "sprites.bin"
+    cache = SpriteCache(cache_path)
+    cache.read(png, size=(8, 8))
+    cache.save()
+
+    cache = SpriteCache(cache_path)
+    cache.read(png, size=(16, 16))
+    assert cache.misses == 1
+
+    cv2.imwrite(str(png), np.zeros((40, 30, 3), np.uint8))
+    os.utime(png, ns=(1, 1))
+    assert (cache.read(png, size=(8, 8)).img == 0).all()
+    assert cache.misses == 2
+
+
+def test_save_keeps_old_entries(tmp_path, png):
+    other = tmp_path / "2.png"
+    cv2.imwrite(str(other), np.full((10, 10, 3), 9, np.uint8))
+    cache_path = tmp_path / "sprites.bin"
+    cache = SpriteCache(cache_path)
+    cache.read(png, size=(8, 8))
+    cache.save()
+    cache = SpriteCache(cache_path)
+    cache.read(other, size=(4, 4))
+    cache.save()
+
+    cache = SpriteCache(cache_path)
+    cache.read(png, size=(8, 8))
+    assert (cache.read(other, size=(4, 4)).img == 9).all()
+    assert cache.hits == 2
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path, png):
+    cache_path = tmp_path / "sprites.bin"
+    cache_path.write_bytes(b"garbage")
+
+    cache = SpriteCache(cache_path)
+
+    assert cache.read(png, size=(8, 8)).img.shape == (8, 8, 3)
+    assert cache.misses == 1
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SpriteCache(tmp_path / "sprites.bin").read(tmp_path / "nope.png")
+
+
+def test_truncated_cache_file_is_ignored(tmp_path, png):
+    cache_path = tmp_path / "sprites.bin"
+    cache = SpriteCache(cache_path)
+    expected = cache.read(png, size=(64, 64)).img.copy()
+    cache.save()
+    del cache
+    data = cache_path.read_bytes()
+    cache_path.write_bytes(data[:-100])
+
+    cache = SpriteCache(cache_path)
+    img = cache.read(png, size=(64, 64))
+
+    assert cache.misses == 1
+    assert (img.img == expected).all()
@@ -0,0 +1,124 @@
+import sys
+import os
+import pathlib
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+import cv2
+import numpy as np
+import pytest
+from img import Img
+from SpriteLoader import SpriteLoader
+from Board import Board
+from PieceFactory import PieceFactory
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+@pytest.fixture
+def pngs(tmp_path):
+    rng = np.random.default_rng(1)
+    paths = []
+    for i in range(6):
+        path = tmp_path / f"{i}.png"
+        cv2.imwrite(str(path), rng.integers(0, 256, (40, 30, 3), dtype=np.uint8))
+        paths.append(path)
+    return paths
+
+
+def test_read_matches_serial_decode(pngs):
+    loader = SpriteLoader(max_workers=3)
+    for p in pngs:
+        loader.submit(p, size=(8, 8))
+    for p in pngs:
+        expected = Img().read(p, size=(8, 8)).img
+        assert (loader.read(p, size=(8, 8)).img == expected).all()
+    # אותו מפתח - אותו אובייקט, בלי פענוח נוסף
+    assert loader.read(pngs[0], size=(8, 8)) is loader.submit(pngs[0], size=(8, 8))
+    loader.shutdown()
+
+
+class GatedSource:
+    """Stands in for a SpriteCache whose reads are held until release."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def read(self, path, size=None, keep_aspect=False, interpolation=cv2.INTER_AREA):
+        self.release.wait(5)
+        return Img().read(path, size=size, keep_aspect=keep_aspect, interpolation=interpolation)
+
+
+def test_streaming_returns_placeholder_then_fills(pngs):
+    source = GatedSource()
+    loader = SpriteLoader(max_workers=2, sprite_cache=source, streaming=True)
+    img = loader.read(pngs[0], size=(8, 8))
+
+    assert img.img is None
+    assert loader.pending() == 1
+
+    source.release.set()
+    loader.wait()
+    assert img.img.shape == (8, 8, 3)
+    assert loader.pending() == 0
+    loader.shutdown()
+
+
+def test_wait_reraises_load_errors(tmp_path):
+    loader = SpriteLoader(max_workers=1)
+    loader.submit(tmp_path / "missing.png")
+    with pytest.raises(FileNotFoundError):
+        loader.wait()
+    loader.shutdown()
+
+
+def test_streaming_reports_load_errors(tmp_path, capsys):
+    loader = SpriteLoader(max_workers=1, streaming=True)
+    loader.read(tmp_path / "missing.png")
+    loader.shutdown()
+
+    assert "could not load sprite" in capsys.readouterr().out
+
+
+def _board():
+    return Board(cell_H_pix=16, cell_W_pix=16, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+
+
+def test_preload_builds_templates_with_loaded_frames():
+    factory = PieceFactory(_board(), PIECES_ROOT)
+    loader = factory.preload(["PW", "KB", "PW"], max_workers=4)
+
+    assert set(factory.piece_types) == {"PW", "KB"}
+    assert loader.pending() == 0
+    pawn = factory.create_piece("PW", (6, 0))
+    frame = pawn.get_draw_info()[0]
+    assert frame.img.shape[:2] == (16, 16)
+    loader.shutdown()
+
+
+def test_preload_in_background_does_not_wait_for_frames():
+    source = GatedSource()
+    factory = PieceFactory(_board(), PIECES_ROOT, sprite_cache=source)
+    loader = factory.preload(["PW"], max_workers=2, background=True)
+
+    pawn = factory.create_piece("PW", (6, 0))
+    assert pawn.get_draw_info()[0].img is None    # עדיין נטען
+
+    source.release.set()
+    loader.wait()
+    assert pawn.get_draw_info()[0].img.shape[:2] == (16, 16)
+    loader.shutdown()
+
+
+def test_preload_gives_back_the_cache_and_stops_its_threads():
+    source = GatedSource()
+    factory = PieceFactory(_board(), PIECES_ROOT, sprite_cache=source)
+    loader = factory.preload(["PW"], max_workers=2, background=True)
+
+    assert factory.graphics_factory.sprite_cache is source
+    source.release.set()
+    loader.wait()
+    for t in threading.enumerate():
+        if t.name.startswith("sprite-loader"):
+            t.join(5)
+    assert not any(t.name.startswith("sprite-loader") for t in threading.enumerate())
@@ -5,7 +5,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..',
 
 import pytest
 from unittest.mock import Mock
-from State import State
+from State import State, StateManager
 from Command import Command
 
 
@@ -94,4 +94,37 @@ def test_can_transition_false_if_not_finished(mock_dependencies):
     phys.is_finished.return_value = False
     state = State(moves, gfx, phys)
 
-    assert state.can_transition(now_ms=1000) is False
\ No newline at end of file
+    assert state.can_transition(now_ms=1000) is False
+
+def test_transition_carries_position_to_next_state(mock_dependencies, sample_command):
+    moves, gfx, _ = mock_dependencies
+    phys1, phys2 = Mock(), Mock()
+    phys1.get_pos.return_value = (6, 0)
+    state1 = State(moves, gfx, phys1, "idle")
+    state2 = State(moves, gfx, phys2, "move")
+    state1.set_transition("move", state2)
+
+    state1.process_command(sample_command)
+
+    phys2.set_pos.assert_called_once_with((6, 0))
+
+
+def test_state_manager_copy_remaps_transitions(mock_dependencies, sample_command):
+    moves, gfx, phys = mock_dependencies
+    idle = State(moves, gfx, phys, "idle")
+    move = State(moves, gfx, phys, "move")
+    idle.set_transition("move", move)
+    sm = StateManager({"idle": idle, "move": move}, "idle")
+
+    sm_copy = sm.copy()
+    sm_copy.process_command(sample_command)
+
+    assert sm_copy.current_state is sm_copy.states["move"]
+    assert sm_copy.current_state is not move
+    assert sm.current_state is idle
+
+
+def test_state_manager_rejects_unknown_initial_state(mock_dependencies):
+    moves, gfx, phys = mock_dependencies
+    with pytest.raises(ValueError):
+        StateManager({"idle": State(moves, gfx, phys, "idle")}, "jump")
@@ -0,0 +1,48 @@
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+from Board import Board
+from Trajectory import SAMPLE_MS, move_duration_ms, trajectories_for
+
+
+def _board(cell_m=1):
+    return Board(cell_H_pix=10, cell_W_pix=10, cell_H_m=cell_m, cell_W_m=cell_m, W_cells=8, H_cells=8, img=None)
+
+
+def test_duration_follows_distance_and_speed():
+    board = _board()
+    assert move_duration_ms(2, 0, board, 1.0, 1000) == 2000
+    assert move_duration_ms(3, 4, board, 2.5, 1000) == 2000    # 5 מטר באלכסון
+    assert move_duration_ms(1, 0, _board(cell_m=2), 1.0, 1000) == 2000
+    assert move_duration_ms(5, 0, board, 0.0, 1000) == 1000    # בלי מהירות - ברירת המחדל
+
+
+def test_move_table_eases_from_start_to_target():
+    move = trajectories_for(_board(), 1.0, 1000).move(-2, 1)
+
+    assert move.duration_ms == 2236
+    assert move.offset_at(0) == (0, 0)
+    assert move.offset_at(move.duration_ms) == (10, -20)
+    assert move.offset_at(10 ** 6) == (10, -20)
+    assert move.offset_at(move.duration_ms // 2) == (5, -10)
+    # מאיץ בהתחלה - הצעד הראשון קטן מהצעד שבאמצע
+    first = abs(move.offset_at(SAMPLE_MS * 10)[1])
+    middle = abs(move.offset_at(move.duration_ms // 2 + SAMPLE_MS * 10)[1]) - 10
+    assert first < middle
+
+
+def test_tables_are_shared():
+    a = trajectories_for(_board(), 1.5, 1000)
+    b = trajectories_for(_board(), 1.5, 1000)
+
+    assert a is b
+    assert a.move(1, 0) is b.move(1, 0)
+
+
+def test_jump_arc_lands_where_it_started():
+    jump = trajectories_for(_board(), 3.0, 500).jump(500)
+
+    assert jump.offset_at(0) == (0, 0)
+    assert jump.offset_at(250) == (0, -5)    # חצי משבצת בשיא
+    assert jump.offset_at(500) == (0, 0)
@@ -0,0 +1,93 @@
+import sys
+import os
+import pathlib
+from types import SimpleNamespace
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'It1_interfaces')))
+
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from Game import Game
+from PieceFactory import PieceFactory
+from TransitionTimers import TransitionTimers
+
+PIECES_ROOT = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+class FixedDeadline:
+    def __init__(self, deadline):
+        self.deadline = deadline
+
+    def next_deadline_ms(self):
+        return self.deadline
+
+
+def _piece(pid, deadline):
+    return SimpleNamespace(piece_id=pid, state_manager=FixedDeadline(deadline))
+
+
+def test_pops_due_pieces_in_deadline_order():
+    timers = TransitionTimers()
+    a, b, c = _piece("a", 300), _piece("b", 100), _piece("c", 200)
+    for p in (a, b, c):
+        timers.schedule(p)
+
+    assert timers.pop_due(250) == [b, c]
+    assert timers.next_deadline_ms() == 300
+    assert len(timers) == 1
+
+
+def test_rescheduled_and_idle_pieces_are_skipped():
+    timers = TransitionTimers()
+    a, b = _piece("a", 100), _piece("b", 100)
+    timers.schedule(a)
+    timers.schedule(b)
+
+    a.state_manager.deadline = 500
+    timers.schedule(a)
+    b.state_manager.deadline = None    # idle - nothing to wait for
+    timers.schedule(b)
+
+    assert timers.pop_due(400) == []
+    assert timers.pop_due(500) == [a]
+    assert len(timers) == 0
+
+
+def _board():
+    return Board(cell_H_pix=8, cell_W_pix=8, cell_H_m=1, cell_W_m=1, W_cells=8, H_cells=8, img=None)
+
+
+def test_idle_pieces_leave_the_heap():
+    board = _board()
+    factory = PieceFactory(board, PIECES_ROOT)
+    pieces = [factory.create_piece("PW", (6, c)) for c in range(8)]
+    game = Game(pieces=pieces, board=board, clock=ManualClock(0), headless=True)
+
+    game.step(0)
+    assert len(game.timers) == 0
+
+    game.issue_command(Command("PW_6_3", "move", {"target": [4, 3]}))
+    assert len(game.timers) == 1
+
+
+def test_timed_game_matches_updating_every_tick():
+    board = _board()
+    factory = PieceFactory(board, PIECES_ROOT)
+    game = Game(pieces=[factory.create_piece("PW", (6, c)) for c in range(3)],
+                board=board, clock=ManualClock(0), headless=True)
+    # אותם כלים, מעודכנים בכל טיק בלי טיימרים
+    polled = {p.piece_id: p for p in (factory.create_piece("PW", (6, c)) for c in range(3))}
+
+    script = {32: Command("PW_6_0", "move", {"target": [4, 0]}),
+              48: Command("PW_6_1", "jump", {}),
+              2100: Command("PW_6_2", "move", {"target": [5, 2]})}
+    for now in range(0, 6000, 16):
+        if now in script:
+            c = script[now]
+            game.issue_command(Command(c.piece_id, c.type, dict(c.params), now))
+            polled[c.piece_id].on_command(Command(c.piece_id, c.type, dict(c.params), now))
+        game.step(now)
+        for p in polled.values():
+            p.update(now)
+        a, b = (sorted((p.piece_id, p.cell, p.state_name) for p in ps.values()) for ps in (game.pieces, polled))
+        assert a == b, now